@@ -1,19 +1,134 @@
+import json
+import socket
+import threading
+
 import requests
 from requests import HTTPError
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.connection import HTTPConnection
+from urllib3.util.request import ACCEPT_ENCODING
 from PyMultiHelper.Validation import isValidEmail
 
+from .Cache import CacheObjetos
+from .Perfil import fase, perfilAtivo
+from .Transportes import Resposta, Transporte, TransporteRequests
+
 API_URL = "https://api.organizze.com.br/rest/v2"
 
+# Tamanho dos blocos lidos das respostas em streaming
+TAMANHO_BLOCO = 64 * 1024
+
+# Segundos de inatividade antes das sondas de keep-alive do TCP, e intervalo entre elas
+KEEPALIVE_OCIOSO = 60
+KEEPALIVE_INTERVALO = 15
+
+
+def _iteraArrayJSON(pedacos):
+    """
+    Decodifica incrementalmente um array JSON, devolvendo cada elemento assim que ele estiver completo.
+
+    Args:
+        pedacos (iterable[str]): Trechos de texto do corpo da resposta, na ordem em que chegam.
+
+    Yields:
+        Cada elemento do array (normalmente um dict).
+
+    Raises:
+        ValueError: Se o corpo não for um array JSON ou terminar incompleto.
+    """
+
+    decodificador = json.JSONDecoder()
+    buffer, posicao = "", 0
+    abriu = False
+
+    for pedaco in pedacos:
+        buffer = buffer[posicao:] + pedaco
+        posicao = 0
+
+        while True:
+            while posicao < len(buffer) and buffer[posicao] in " \t\r\n,":
+                posicao += 1
+            if posicao >= len(buffer):
+                break
+
+            if not abriu:
+                if buffer[posicao] != "[":
+                    raise ValueError("A resposta não é um array JSON")
+                abriu = True
+                posicao += 1
+                continue
+
+            if buffer[posicao] == "]":
+                return
+
+            try:
+                item, posicao = decodificador.raw_decode(buffer, posicao)
+            except json.JSONDecodeError:
+                break  # Elemento ainda incompleto: aguarda o próximo trecho
+            yield item
+
+    raise ValueError("A resposta JSON terminou incompleta")
+
+
+def _opcoesKeepAlive() -> list[tuple]:
+    """ Opções de socket que mantêm as conexões ociosas do pool vivas (sondas TCP), onde o sistema suportar """
+
+    opcoes = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        opcoes.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, KEEPALIVE_OCIOSO))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        opcoes.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, KEEPALIVE_INTERVALO))
+    return opcoes
+
+
+class _AdaptadorPool(HTTPAdapter):
+    """ HTTPAdapter com o pool dimensionado para a quantidade de threads e keep-alive do TCP ligado """
+
+    def __init__(self, conexoes: int, keepAlive: bool):
+        self._opcoesSocket = _opcoesKeepAlive() if keepAlive else None
+        super().__init__(pool_connections=1, pool_maxsize=conexoes)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self._opcoesSocket is not None:
+            kwargs["socket_options"] = self._opcoesSocket
+        super().init_poolmanager(*args, **kwargs)
+
 
 class API:
+    """
+    Sessão autenticada com a API do Organizze.
 
-    def __init__(self, email: str, token: str, autor: str = "SemNome"):
+    Uma mesma instância pode ser usada por várias threads: o pool de conexões (urllib3) é compartilhado e
+    dimensionado por `conexoes`. Com `porThread=True`, cada thread usa também seu próprio `requests.Session`
+    (cabeçalhos, cookies e estado da sessão isolados), sobre o mesmo pool.
+
+    As requisições passam por um `Transporte` (ver `Transportes`): o padrão usa o `requests.Session` acima, mas
+    é possível usar HTTP/2 (`TransporteHTTP2`) ou respostas em memória para testes (`TransporteMemoria`).
+    Cassetes, hooks do requests, `conexoes`, `porThread` e `keepAlive` valem apenas para o transporte padrão.
+
+    Examples:
+        >>> conn = API(email="...", token="...", conexoes=16, porThread=True)
+        >>> with ThreadPoolExecutor(max_workers=16) as executor:
+        ...     list(executor.map(lambda j: getLancamentos(conn, *j), janelas))
+    """
+
+    def __init__(self, email: str, token: str, autor: str = "SemNome", conexoes: int = 10,
+                 porThread: bool = False, keepAlive: bool = True, cache: int = 0, transporte: Transporte = None):
         """
         Args:
             email (str): Seu email da conta do Organizze, utilizado para gerar o user-agent e autenticação.
             token (str): Seu token gerado em https://app.organizze.com.br/configuracoes/api-keys
             autor (str): Seu primeiro nome, utilizado para gerar o user-agent da consulta
+            conexoes (int, optional): Máximo de conexões mantidas abertas com a API. Use ao menos a quantidade
+                                      de threads que farão chamadas simultâneas. Padrão é 10.
+            porThread (bool, optional): Se `True`, cada thread recebe seu próprio `requests.Session`. Padrão é `False`.
+            keepAlive (bool, optional): Se `True`, liga as sondas de keep-alive do TCP nas conexões do pool,
+                                        evitando que conexões ociosas sejam derrubadas no meio do caminho. Padrão é `True`.
+            cache (int, optional): Quantidade máxima de objetos no cache de entidades (ver `CacheObjetos`),
+                                   consultado pelos getters individuais. 0 desliga o cache. Padrão é 0.
+            transporte (Transporte, optional): Transporte das requisições. Padrão é `None` (`TransporteRequests`
+                                               sobre `API.sessao`).
 
         Returns:
             API: Objeto API com a conexão estabelecida e utilizável.
@@ -36,67 +151,119 @@ class API:
         self.email = email
         self.token = token
         self.autor = autor
-        self.sessao = requests.Session()
+        self.porThread = porThread
+        self.cache = CacheObjetos(cache)
+        self._local = threading.local()
+        self._perfil = None
 
-        self.sessao.auth = HTTPBasicAuth(self.email, self.token)
-        self.sessao.headers.update({'User-Agent': f'{self.autor} ({self.email})',
-                                    'Content-Type': 'application/json; charset=utf-8'})
+        # Sessão modelo: é a sessão usada por todas as threads, ou a origem das sessões por thread
+        cabecalhos = {'User-Agent': f'{self.autor} ({self.email})',
+                      'Content-Type': 'application/json; charset=utf-8',
+                      'Accept-Encoding': ACCEPT_ENCODING}
+        self._modelo = requests.Session()
+        self._modelo.auth = HTTPBasicAuth(self.email, self.token)
+        self._modelo.headers.update(cabecalhos)
+        self._modelo.mount("https://", _AdaptadorPool(conexoes, keepAlive))
+        self._modelo.mount("http://", _AdaptadorPool(conexoes, keepAlive))
 
-    def _get(self, comando: str, params: dict = None):
-        try:
-            response = self.sessao.get(f'{API_URL}{comando}', params=params)
-            response.raise_for_status()
-            return response.json()
+        self.transporte = transporte or TransporteRequests(lambda: self.sessao)
+        self.transporte.configura(self.email, self.token, cabecalhos)
 
-        except requests.exceptions.HTTPError as erroHTTP:
-            if response.status_code == 401:
-                raise HTTPError("Erro HTTP 401: Não autorizado. Verifique as credenciais fornecidas do Organizze")
-            else:
-                raise HTTPError(f"Erro HTTP: {erroHTTP}")
+    @property
+    def sessao(self) -> requests.Session:
+        """ O `requests.Session` da thread atual (o mesmo para todas as threads se `porThread=False`) """
 
-        except requests.exceptions.RequestException as requestERROR:
-            raise HTTPError(f"Ocorreu um erro durante a requisição: {requestERROR}")
+        if not self.porThread:
+            return self._modelo
 
-    def _post(self, comando: str, params: dict = None):
-        try:
-            response = self.sessao.post(f'{API_URL}{comando}', params=params)
-            response.raise_for_status()
+        sessao = getattr(self._local, "sessao", None)
+        if sessao is None:
+            sessao = requests.Session()
+            sessao.auth = self._modelo.auth
+            sessao.headers = self._modelo.headers.copy()
+            # Adaptadores (pools de conexão) e hooks são os mesmos objetos do modelo: montagens e hooks
+            # adicionados depois (ex: cassetes) valem para todas as threads
+            sessao.adapters = self._modelo.adapters
+            sessao.hooks = self._modelo.hooks
+            self._local.sessao = sessao
+        return sessao
 
-        except requests.exceptions.HTTPError as erroHTTP:
-            if response.status_code == 401:
-                raise HTTPError("Erro HTTP 401: Não autorizado. Verifique as credenciais fornecidas do Organizze")
-            else:
-                raise HTTPError(f"Erro HTTP: {erroHTTP}")
+    def profile(self, memoria: bool = True):
+        """
+        Mede o tempo de relógio, o tempo de CPU e as alocações de cada fase (fetch → decode → build → filter),
+        por endpoint, enquanto o contexto estiver aberto. Só são registradas as chamadas desta sessão
+        (em qualquer thread) e os filtros executados no mesmo contexto.
 
-        except requests.exceptions.RequestException as requestERROR:
-            raise HTTPError(f"Ocorreu um erro durante a requisição: {requestERROR}")
+        Args:
+            memoria (bool, optional): Se `True`, mede alocações com tracemalloc (mais lento). Padrão é `True`.
 
+        Returns:
+            Gerenciador de contexto que fornece um `PerfilExecucao`.
 
-    def _put(self, comando: str, params: dict = None):
-        try:
-            response = self.sessao.put(f'{API_URL}{comando}', params=params)
-            response.raise_for_status()
+        Examples:
+            >>> with conn.profile() as perfil:
+            ...     filtraLancamentos(getLancamentos(conn, "2024-01-01", "2024-06-30"), tituloBuscado="mercado")
+            >>> print(perfil.relatorio())
+            >>> perfil.exportaFlamegraph("sync.folded")
+        """
 
-        except requests.exceptions.HTTPError as erroHTTP:
-            if response.status_code == 401:
-                raise HTTPError("Erro HTTP 401: Não autorizado. Verifique as credenciais fornecidas do Organizze")
-            else:
-                raise HTTPError(f"Erro HTTP: {erroHTTP}")
+        return perfilAtivo(memoria=memoria, sessao=self)
 
-        except requests.exceptions.RequestException as requestERROR:
-            raise HTTPError(f"Ocorreu um erro durante a requisição: {requestERROR}")
+    def fecha(self):
+        """ Libera as conexões abertas pelo transporte """
 
+        self.transporte.fecha()
+
+    def _requisita(self, metodo: str, comando: str, params: dict = None, stream: bool = False) -> Resposta:
+        """ Envia a requisição pelo transporte e converte status de erro e falhas de rede em `HTTPError` """
 
-    def _delete(self, comando: str, params: dict = None):
         try:
-            response = self.sessao.delete(f'{API_URL}{comando}', params=params)
-            response.raise_for_status()
+            with fase("fetch", comando, self):
+                response = self.transporte.requisita(metodo, f'{API_URL}{comando}', params=params, stream=stream)
 
-        except requests.exceptions.HTTPError as erroHTTP:
+        except requests.exceptions.RequestException as requestERROR:
+            raise HTTPError(f"Ocorreu um erro durante a requisição: {requestERROR}")
+
+        if response.status_code >= 400:
+            response.fecha()
             if response.status_code == 401:
-                raise HTTPError("Erro HTTP 401: Não autorizado. Verifique as credenciais fornecidas do Organizze")
+                raise HTTPError("Erro HTTP 401: Não autorizado. Verifique as credenciais fornecidas do Organizze", response=response)
             else:
-                raise HTTPError(f"Erro HTTP: {erroHTTP}")
+                tipo = "Client Error" if response.status_code < 500 else "Server Error"
+                raise HTTPError(f"Erro HTTP: {response.status_code} {tipo}: {response.reason} for url: {response.url}",
+                                response=response)
+        return response
+
+    def _get(self, comando: str, params: dict = None):
+        response = self._requisita("GET", comando, params)
+        with fase("decode", comando, self):
+            return response.json()
+
+    def _getBruto(self, comando: str, params: dict = None) -> bytes:
+        """ Igual a `_get`, mas devolve o corpo da resposta sem decodificar (ex: para decodificação em outro processo) """
+
+        return self._requisita("GET", comando, params).content
+
+    def _getStream(self, comando: str, params: dict = None):
+        """
+        Igual a `_get` para endpoints que retornam listas, mas devolve cada item enquanto o corpo ainda está chegando,
+        sem manter a resposta inteira (nem sua cópia decodificada) em memória.
+        """
+
+        # Apenas o tempo até os cabeçalhos é medido: o restante se mistura ao consumo dos itens
+        response = self._requisita("GET", comando, params, stream=True)
+        try:
+            with response:
+                yield from _iteraArrayJSON(response.iteraTexto(TAMANHO_BLOCO))
 
         except requests.exceptions.RequestException as requestERROR:
             raise HTTPError(f"Ocorreu um erro durante a requisição: {requestERROR}")
+
+    def _post(self, comando: str, params: dict = None):
+        self._requisita("POST", comando, params)
+
+    def _put(self, comando: str, params: dict = None):
+        self._requisita("PUT", comando, params)
+
+    def _delete(self, comando: str, params: dict = None):
+        self._requisita("DELETE", comando, params)
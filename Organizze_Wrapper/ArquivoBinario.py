@@ -0,0 +1,238 @@
+"""
+Formato do arquivo (versão 1), em colunas de largura fixa e alinhadas em 8 bytes:
+
+    cabeçalho    'OZLA', versão (uint16), ordem de bytes (uint16: 1 little, 2 big), linhas (uint64)
+    inteiros     uma coluna int64 por campo de COLUNAS_INTEIRAS (NULO representa None)
+    date         int32 com o ordinal da data (date.toordinal)
+    flags        uint8 por linha (bit 0: paid, bit 1: recurring)
+    textos       para cada campo de COLUNAS_TEXTO: início (int64) e tamanho (int32, -1 representa None)
+    tabela       bytes UTF-8 de todos os textos, concatenados
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from datetime import date
+
+from .Lancamentos import Lancamento
+
+MAGICO = b'OZLA'
+VERSAO = 1
+NULO = -2 ** 63
+_CABECALHO = struct.Struct('=4sHHQ')
+_ORDEM = {'little': 1, 'big': 2}
+
+COLUNAS_INTEIRAS = ["id", "amount_cents", "account_id", "category_id", "total_installments", "installment",
+                    "attachments_count", "credit_card_id", "credit_card_invoice_id", "paid_credit_card_id",
+                    "paid_credit_card_invoice_id", "oposite_transaction_id", "oposite_account_id"]
+COLUNAS_TEXTO = ["description", "notes", "tags", "created_at", "updated_at"]
+
+
+def _alinha(tamanho: int) -> int:
+    return (tamanho + 7) & ~7
+
+
+def _layout(linhas: int) -> dict:
+    """ Calcula a posição (byte inicial, typecode) de cada bloco do arquivo a partir do nº de linhas """
+
+    blocos, posicao = {}, _CABECALHO.size
+    for nome in COLUNAS_INTEIRAS:
+        blocos[nome] = (posicao, 'q')
+        posicao += _alinha(linhas * 8)
+    blocos["date_ordinal"] = (posicao, 'i')
+    posicao += _alinha(linhas * 4)
+    blocos["flags"] = (posicao, 'B')
+    posicao += _alinha(linhas)
+    for nome in COLUNAS_TEXTO:
+        blocos[f'{nome}_inicio'] = (posicao, 'q')
+        posicao += _alinha(linhas * 8)
+        blocos[f'{nome}_tamanho'] = (posicao, 'i')
+        posicao += _alinha(linhas * 4)
+    blocos["tabela"] = (posicao, 'B')
+    return blocos
+
+
+def gravaArquivo(lancamentos: list[Lancamento], caminho: str) -> int:
+    """
+    Grava os lançamentos em um arquivo binário colunar, próprio para abertura instantânea via `ArquivoLancamentos`.
+
+    Args:
+        lancamentos (list[Lancamento]): Lançamentos a gravar (ex: via `getLancamentos`).
+        caminho (str): Caminho do arquivo a ser criado (será sobrescrito se existir).
+
+    Returns:
+        int: Quantidade de lançamentos gravados.
+    """
+
+    inteiros = {nome: array('q') for nome in COLUNAS_INTEIRAS}
+    datas, flags = array('i'), array('B')
+    inicios = {nome: array('q') for nome in COLUNAS_TEXTO}
+    tamanhos = {nome: array('i') for nome in COLUNAS_TEXTO}
+    tabela = bytearray()
+
+    for l in lancamentos:
+        for nome in COLUNAS_INTEIRAS:
+            valor = getattr(l, nome)
+            inteiros[nome].append(NULO if valor is None else valor)
+        datas.append(date.fromisoformat(l.date).toordinal())
+        flags.append((1 if l.paid else 0) | (2 if l.recurring else 0))
+
+        for nome in COLUNAS_TEXTO:
+            valor = getattr(l, nome)
+            if nome == "tags":
+                valor = json.dumps(valor, ensure_ascii=False) if valor is not None else None
+            inicios[nome].append(len(tabela))
+            if valor is None:
+                tamanhos[nome].append(-1)
+            else:
+                codificado = valor.encode('utf-8')
+                tamanhos[nome].append(len(codificado))
+                tabela += codificado
+
+    linhas = len(datas)
+    blocos = [*inteiros.values(), datas, flags]
+    for nome in COLUNAS_TEXTO:
+        blocos += [inicios[nome], tamanhos[nome]]
+
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(_CABECALHO.pack(MAGICO, VERSAO, _ORDEM[sys.byteorder], linhas))
+        for bloco in blocos:
+            dados = bloco.tobytes()
+            arquivo.write(dados + bytes(_alinha(len(dados)) - len(dados)))
+        arquivo.write(tabela)
+
+    return linhas
+
+
+class ArquivoLancamentos:
+    """
+    Leitura de um arquivo gerado por `gravaArquivo`, mapeado em memória.
+
+    A abertura apenas lê o cabeçalho: as colunas numéricas são expostas sem cópia via `coluna`/`colunaNumpy`
+    e cada `Lancamento` só é construído quando acessado (`arquivo[i]` ou iteração).
+
+    Examples:
+        >>> with ArquivoLancamentos("historico.ozla") as historico:
+        ...     valores = historico.colunaNumpy("amount_cents")
+        ...     print(len(historico), valores.sum())
+    """
+
+    def __init__(self, caminho: str):
+        """
+        Args:
+            caminho (str): Caminho do arquivo gerado por `gravaArquivo`.
+
+        Raises:
+            ValueError: Se o arquivo não estiver no formato esperado ou tiver sido gravado com outra ordem de bytes.
+        """
+
+        self._arquivo = open(caminho, 'rb')
+        self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: dict[str, memoryview] = {}
+
+        magico, versao, ordem, self._linhas = _CABECALHO.unpack_from(self._mapa, 0)
+        if magico != MAGICO or versao != VERSAO:
+            self.fecha()
+            raise ValueError(f"'{caminho}' não é um arquivo de lançamentos válido (versão {VERSAO})")
+        if ordem != _ORDEM[sys.byteorder]:
+            self.fecha()
+            raise ValueError(f"'{caminho}' foi gravado em uma plataforma com outra ordem de bytes")
+
+        self._blocos = _layout(self._linhas)
+
+    def __len__(self):
+        return self._linhas
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fecha()
+
+    def __iter__(self):
+        for i in range(self._linhas):
+            yield self[i]
+
+    def coluna(self, nome: str) -> memoryview:
+        """
+        Retorna uma visão sem cópia de uma coluna numérica.
+
+        Args:
+            nome (str): Um dos campos de `COLUNAS_INTEIRAS`, `"date_ordinal"` ou `"flags"`.
+
+        Returns:
+            memoryview: Visão tipada (int64, int32 ou uint8) sobre o arquivo mapeado. Valores `NULO` representam None.
+
+        Raises:
+            KeyError: Se a coluna não existir.
+        """
+
+        if nome not in self._views:
+            inicio, tipo = self._blocos[nome]
+            tamanho = self._linhas * array(tipo).itemsize
+            self._views[nome] = memoryview(self._mapa)[inicio:inicio + tamanho].cast(tipo)
+        return self._views[nome]
+
+    def colunaNumpy(self, nome: str):
+        """ Igual a `coluna`, mas como `numpy.ndarray` somente leitura (também sem cópia) """
+
+        import numpy as np
+        return np.frombuffer(self.coluna(nome), dtype=self.coluna(nome).format)
+
+    def _texto(self, nome: str, i: int):
+        tamanho = self.coluna(f'{nome}_tamanho')[i]
+        if tamanho < 0:
+            return None
+        inicio = self._blocos["tabela"][0] + self.coluna(f'{nome}_inicio')[i]
+        return self._mapa[inicio:inicio + tamanho].decode('utf-8')
+
+    def _inteiro(self, nome: str, i: int):
+        valor = self.coluna(nome)[i]
+        return None if valor == NULO else valor
+
+    def __getitem__(self, i: int) -> Lancamento:
+        if i < 0:
+            i += self._linhas
+        if not 0 <= i < self._linhas:
+            raise IndexError("Índice fora do arquivo")
+
+        flags = self.coluna("flags")[i]
+        tags = self._texto("tags", i)
+        return Lancamento(id=self._inteiro("id", i),
+                          description=self._texto("description", i),
+                          date=date.fromordinal(self.coluna("date_ordinal")[i]).isoformat(),
+                          paid=bool(flags & 1),
+                          amount_cents=self._inteiro("amount_cents", i),
+                          total_installments=self._inteiro("total_installments", i),
+                          installment=self._inteiro("installment", i),
+                          recurring=bool(flags & 2),
+                          account_id=self._inteiro("account_id", i),
+                          category_id=self._inteiro("category_id", i),
+                          tags=json.loads(tags) if tags is not None else None,
+                          notes=self._texto("notes", i),
+                          attachments_count=self._inteiro("attachments_count", i),
+                          credit_card_id=self._inteiro("credit_card_id", i),
+                          credit_card_invoice_id=self._inteiro("credit_card_invoice_id", i),
+                          paid_credit_card_id=self._inteiro("paid_credit_card_id", i),
+                          paid_credit_card_invoice_id=self._inteiro("paid_credit_card_invoice_id", i),
+                          oposite_transaction_id=self._inteiro("oposite_transaction_id", i),
+                          oposite_account_id=self._inteiro("oposite_account_id", i),
+                          created_at=self._texto("created_at", i),
+                          updated_at=self._texto("updated_at", i))
+
+    def fecha(self):
+        """
+        Libera o mapeamento e o arquivo.
+
+        Warnings:
+            Enquanto existirem arrays numpy obtidos via `colunaNumpy`, o fechamento lança `BufferError`.
+        """
+
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        if not self._mapa.closed:
+            self._mapa.close()
+        self._arquivo.close()
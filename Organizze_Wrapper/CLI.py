@@ -0,0 +1,303 @@
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import fields
+from datetime import date
+
+from PyMultiHelper.Dates import dateRanges
+from PyMultiHelper.Logging import logFail, logSuccess
+
+from .API import API
+from .CartoesCredito import CartaoCredito, getCartoesCredito
+from .Categorias import Categoria, getCategorias
+from .Contas import Conta, getContas
+from .FaturasCartao import FaturaCartao, getFaturasCartao
+from .Lancamentos import Lancamento, getLancamentos
+from .Metas import Meta, getMetas
+from .Usuarios import Usuario, getUsuarios
+
+RECURSOS = {"lancamentos": Lancamento, "faturas": FaturaCartao, "contas": Conta, "cartoes": CartaoCredito,
+            "categorias": Categoria, "metas": Meta, "usuarios": Usuario}
+FORMATOS = ["jsonl", "parquet", "sqlite"]
+
+
+class Checkpoint:
+    """
+    Arquivo JSON com as tarefas já concluídas, regravado de forma atômica a cada conclusão.
+    Uma execução interrompida retoma exatamente das tarefas que faltaram.
+
+    Também guarda os parâmetros que definem as janelas de lançamentos (`inicio`, `fim` e `janelaDias`), para que a
+    retomada planeje as mesmas janelas (e, portanto, as mesmas chaves) mesmo que `--fim` tenha sido omitido e o dia
+    tenha mudado.
+    """
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self._trava = threading.Lock()
+        self.concluidas: set[str] = set()
+        self.inicio: str = None
+        self.fim: str = None
+        self.janelaDias: int = None
+
+        if os.path.exists(caminho):
+            with open(caminho, encoding='utf-8') as arquivo:
+                conteudo = json.load(arquivo)
+            self.concluidas = set(conteudo.get("concluidas", []))
+            self.inicio = conteudo.get("inicio")
+            self.fim = conteudo.get("fim")
+            self.janelaDias = conteudo.get("janela_dias")
+
+    def fixaParametros(self, inicio: str = None, fim: str = None, janelaDias: int = None):
+        """
+        Define os parâmetros da execução, completando os não informados com os do checkpoint.
+
+        Args:
+            inicio (str, optional): Data inicial (`--inicio`).
+            fim (str, optional): Data final (`--fim`). Se não informada nem gravada, vale a data de hoje.
+            janelaDias (int, optional): Dias por janela (`--janela-dias`). Se não informado nem gravado, vale 30.
+
+        Raises:
+            ValueError: Se um parâmetro informado divergir do gravado (a retomada geraria chaves diferentes e
+                        duplicaria os registros já exportados), ou se não houver data inicial.
+        """
+
+        for opcao, informado, gravado in (("--inicio", inicio, self.inicio), ("--fim", fim, self.fim),
+                                          ("--janela-dias", janelaDias, self.janelaDias)):
+            if informado is not None and gravado is not None and informado != gravado:
+                raise ValueError(f"{opcao} {informado} difere do checkpoint '{self.caminho}' ({gravado}): "
+                                 f"repita os parâmetros da execução original ou use outro --checkpoint")
+
+        self.inicio = inicio or self.inicio
+        if self.inicio is None:
+            raise ValueError("Informe --inicio (não há checkpoint de onde retomá-lo)")
+        self.fim = fim or self.fim or date.today().isoformat()
+        self.janelaDias = janelaDias or self.janelaDias or 30
+
+    def conclui(self, chave: str):
+        with self._trava:
+            self.concluidas.add(chave)
+            temporario = f'{self.caminho}.tmp'
+            with open(temporario, 'w', encoding='utf-8') as arquivo:
+                json.dump({"inicio": self.inicio, "fim": self.fim, "janela_dias": self.janelaDias,
+                           "concluidas": sorted(self.concluidas)}, arquivo)
+            os.replace(temporario, self.caminho)
+
+
+class Gravador:
+    """ Grava o resultado de cada tarefa no formato escolhido, de forma idempotente (reexecutar sobrescreve) """
+
+    def __init__(self, formato: str, destino: str):
+        self.formato = formato
+        self.destino = destino
+        os.makedirs(destino, exist_ok=True)
+
+        if formato == "sqlite":
+            self._trava = threading.Lock()
+            self._banco = sqlite3.connect(os.path.join(destino, "organizze.sqlite"), check_same_thread=False)
+            for recurso, classe in RECURSOS.items():
+                colunas = ", ".join(f'"{f.name}"' for f in fields(classe))
+                chave = ', PRIMARY KEY ("credencial", "id")' if "id" in classe.__dataclass_fields__ else ""
+                self._banco.execute(f'CREATE TABLE IF NOT EXISTS "{recurso}" ("credencial", {colunas}{chave})')
+            self._banco.commit()
+
+    def grava(self, email: str, recurso: str, chave: str, objetos: list):
+        if self.formato == "jsonl":
+            self._gravaJSONL(email, recurso, chave, objetos)
+        elif self.formato == "parquet":
+            self._gravaParquet(email, recurso, chave, objetos)
+        else:
+            self._gravaSQLite(email, recurso, chave, objetos)
+
+    def _gravaJSONL(self, email: str, recurso: str, chave: str, objetos: list):
+        pasta = os.path.join(self.destino, email, recurso)
+        os.makedirs(pasta, exist_ok=True)
+        caminho = os.path.join(pasta, f'{chave}.jsonl')
+
+        with open(f'{caminho}.tmp', 'w', encoding='utf-8') as arquivo:
+            for o in objetos:
+                arquivo.write(json.dumps(o.to_dict(), ensure_ascii=False) + "\n")
+        os.replace(f'{caminho}.tmp', caminho)
+
+    def _gravaParquet(self, email: str, recurso: str, chave: str, objetos: list):
+        from .Exportacao import _gravaParticionado, _pyarrow, faturasParaTabela, lancamentosParaTabela
+
+        base = os.path.join(self.destino, recurso, f'credencial={email}')
+        if recurso == "lancamentos":
+            _gravaParticionado(lancamentosParaTabela(objetos), base, ["ano", "mes", "account_id"],
+                               "parquet", "anexar", prefixo=chave)
+        elif recurso == "faturas":
+            _gravaParticionado(faturasParaTabela(objetos), base, ["ano", "mes", "credit_card_id"],
+                               "parquet", "anexar", prefixo=chave)
+        else:
+            import pyarrow.parquet
+            os.makedirs(base, exist_ok=True)
+            linhas = [{k: json.dumps(v) if isinstance(v, (list, dict)) else v for k, v in o.to_dict().items()}
+                      for o in objetos]
+            pyarrow.parquet.write_table(_pyarrow().Table.from_pylist(linhas), os.path.join(base, f'{chave}.parquet'))
+
+    def _gravaSQLite(self, email: str, recurso: str, chave: str, objetos: list):
+        nomes = [f.name for f in fields(RECURSOS[recurso])]
+        colunas = ", ".join(f'"{n}"' for n in ["credencial"] + nomes)
+        marcadores = ", ".join("?" * (len(nomes) + 1))
+        linhas = [[email] + [json.dumps(v) if isinstance(v, (list, dict)) else v for v in o.to_dict().values()]
+                  for o in objetos]
+
+        with self._trava, self._banco:
+            if "id" not in nomes:
+                # Sem chave primária (ex: metas): a tarefa substitui tudo o que ela mesma gravou antes
+                self._banco.execute(f'DELETE FROM "{recurso}" WHERE "credencial" = ? AND substr("date", 1, 4) = ?',
+                                    (email, chave))
+            self._banco.executemany(f'INSERT OR REPLACE INTO "{recurso}" ({colunas}) VALUES ({marcadores})', linhas)
+
+    def fecha(self):
+        if self.formato == "sqlite":
+            self._banco.close()
+
+
+def _carregaCredenciais(args) -> list[dict]:
+    if args.credenciais:
+        with open(args.credenciais, encoding='utf-8') as arquivo:
+            credenciais = json.load(arquivo)
+        return credenciais if isinstance(credenciais, list) else [credenciais]
+
+    token = args.token or os.environ.get("ORGANIZZE_TOKEN")
+    if not (args.email and token):
+        raise SystemExit("Informe --credenciais ou --email e --token (ou a variável ORGANIZZE_TOKEN)")
+    return [{"email": args.email, "token": token, "autor": args.autor}]
+
+
+def planejaTarefas(sessao: API, recursos: list[str], dataInicio: str, dataFim: str, diasJanela: int = 30) -> list[tuple]:
+    """
+    Divide a exportação de uma credencial em tarefas independentes.
+
+    Args:
+        sessao (API): Sessão autenticada da credencial.
+        recursos (list[str]): Recursos a exportar (chaves de `RECURSOS`).
+        dataInicio (str): Data de início para lançamentos e metas, no formato `YYYY-MM-DD`.
+        dataFim (str): Data de fim para lançamentos e metas, no formato `YYYY-MM-DD`.
+        diasJanela (int, optional): Tamanho, em dias, de cada janela de lançamentos. Padrão é 30.
+
+    Returns:
+        list[tuple]: Tarefas no formato (recurso, chave, função sem argumentos que busca os objetos).
+    """
+
+    chaves = []
+    for recurso in recursos:
+        if recurso == "lancamentos":
+            for inicio, fim in dateRanges(startDate=dataInicio, endDate=dataFim, rangeSize=diasJanela):
+                chaves.append((recurso, f'{inicio}_{fim}'))
+        elif recurso == "faturas":
+            for cartao in getCartoesCredito(sessao):
+                chaves.append((recurso, str(cartao.id)))
+        elif recurso == "metas":
+            for ano in range(int(dataInicio[:4]), min(int(dataFim[:4]), date.today().year) + 1):
+                chaves.append((recurso, str(ano)))
+        else:
+            chaves.append((recurso, "todos"))
+
+    return [(recurso, chave, lambda r=recurso, c=chave: buscaTarefa(sessao, r, c)) for recurso, chave in chaves]
+
+
+def buscaTarefa(sessao: API, recurso: str, chave: str) -> list:
+    """
+    Busca os objetos de uma tarefa a partir da sua chave (ver `planejaTarefas`), para que tarefas possam ser
+    descritas só por (recurso, chave) e executadas em outro processo.
+
+    Args:
+        sessao (API): Sessão autenticada da credencial.
+        recurso (str): Recurso da tarefa (chave de `RECURSOS`).
+        chave (str): "inicio_fim" para lançamentos, id do cartão para faturas, ano para metas, "todos" para os demais.
+
+    Returns:
+        list: Os objetos de modelo da tarefa.
+    """
+
+    if recurso == "lancamentos":
+        inicio, fim = chave.split("_")
+        return getLancamentos(sessao, inicio, fim)
+    if recurso == "faturas":
+        return getFaturasCartao(sessao, int(chave))
+    if recurso == "metas":
+        return getMetas(sessao, int(chave))
+
+    busca = {"contas": getContas, "cartoes": getCartoesCredito,
+             "categorias": getCategorias, "usuarios": getUsuarios}[recurso]
+    return busca(sessao)
+
+
+def main(argv: list[str] = None) -> int:
+    """ Ponto de entrada do comando `organizze-export` """
+
+    parser = argparse.ArgumentParser(prog="organizze-export",
+                                     description="Exporta (backfill) dados do Organizze, com retomada via checkpoint.")
+    parser.add_argument("--credenciais", help="Arquivo JSON com uma lista de {email, token, autor}")
+    parser.add_argument("--email", help="Email da conta (alternativa a --credenciais)")
+    parser.add_argument("--token", help="Token da API (ou variável de ambiente ORGANIZZE_TOKEN)")
+    parser.add_argument("--autor", default="organizze-export", help="Nome usado no user-agent")
+    parser.add_argument("--recursos", default="lancamentos,faturas,contas,cartoes,categorias",
+                        help=f"Lista separada por vírgulas entre: {','.join(RECURSOS)}")
+    parser.add_argument("--inicio", help="Data inicial (YYYY-MM-DD). Obrigatória, exceto ao retomar um checkpoint")
+    parser.add_argument("--fim", help="Data final (YYYY-MM-DD). Padrão: a do checkpoint, se houver; senão, hoje")
+    parser.add_argument("--formato", choices=FORMATOS, default="jsonl")
+    parser.add_argument("--destino", default="organizze-export", help="Diretório de saída")
+    parser.add_argument("--paralelismo", type=int, default=4, help="Tarefas simultâneas. Padrão: 4")
+    parser.add_argument("--janela-dias", type=int,
+                        help="Dias por janela de lançamentos. Padrão: o do checkpoint, se houver; senão, 30")
+    parser.add_argument("--checkpoint", help="Arquivo de checkpoint. Padrão: <destino>/checkpoint.json")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+
+    recursos = [r.strip() for r in args.recursos.split(",") if r.strip()]
+    desconhecidos = set(recursos) - set(RECURSOS)
+    if desconhecidos:
+        parser.error(f"Recursos desconhecidos: {', '.join(sorted(desconhecidos))}")
+
+    checkpoint = Checkpoint(args.checkpoint or os.path.join(args.destino, "checkpoint.json"))
+    try:
+        checkpoint.fixaParametros(args.inicio, args.fim, args.janela_dias)
+    except ValueError as erro:
+        parser.error(str(erro))
+    gravador = Gravador(args.formato, args.destino)
+
+    tarefas = []
+    for credencial in _carregaCredenciais(args):
+        sessao = API(email=credencial["email"], token=credencial["token"],
+                     autor=credencial.get("autor", args.autor), conexoes=args.paralelismo, porThread=True)
+        for recurso, chave, busca in planejaTarefas(sessao, recursos, checkpoint.inicio, checkpoint.fim,
+                                                      checkpoint.janelaDias):
+            identificador = f'{sessao.email}|{recurso}|{chave}'
+            if identificador not in checkpoint.concluidas:
+                tarefas.append((identificador, sessao.email, recurso, chave, busca))
+
+    logging.info(f"{len(tarefas)} tarefas pendentes ({len(checkpoint.concluidas)} já concluídas)")
+
+    def executa(identificador, email, recurso, chave, busca):
+        objetos = busca()
+        gravador.grava(email, recurso, chave, objetos)
+        checkpoint.conclui(identificador)
+        return len(objetos)
+
+    falhas = 0
+    with ThreadPoolExecutor(max_workers=args.paralelismo) as executor:
+        futuros = {executor.submit(executa, *tarefa): tarefa[0] for tarefa in tarefas}
+        for n, futuro in enumerate(as_completed(futuros), start=1):
+            try:
+                logSuccess(f"[{n}/{len(tarefas)}] {futuros[futuro]} ({futuro.result()} registros)")
+            except Exception as erro:
+                falhas += 1
+                logFail(f"[{n}/{len(tarefas)}] {futuros[futuro]}: {erro}")
+
+    gravador.fecha()
+    if falhas:
+        logging.info(f"{falhas} tarefas falharam; execute o mesmo comando novamente para retomá-las")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import threading
+from collections import OrderedDict
+
+
+class CacheObjetos:
+    """
+    Mapa de identidade dos objetos já obtidos da API (chave: tipo do modelo e `id`), com descarte LRU.
+
+    Os getters de listas alimentam o cache, os getters individuais consultam-no antes de ir à rede e as
+    operações de escrita (`upd*`, `del*`, `arquiva*`) invalidam as entradas afetadas. Use via `API(cache=...)`.
+
+    Warnings:
+        O mesmo objeto é devolvido a cada consulta: alterá-lo localmente altera também o que está em cache.
+    """
+
+    def __init__(self, maximo: int = 0):
+        """
+        Args:
+            maximo (int, optional): Quantidade máxima de objetos mantidos. 0 desliga o cache. Padrão é 0.
+        """
+
+        self.maximo = maximo
+        self.acertos = 0
+        self.falhas = 0
+        self._objetos: OrderedDict = OrderedDict()
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._objetos)
+
+    def __bool__(self):
+        return self.maximo > 0
+
+    def obtem(self, tipo: type, idObjeto: int):
+        """
+        Args:
+            tipo (type): Classe do modelo (ex: `Conta`).
+            idObjeto (int): Identificador do objeto.
+
+        Returns:
+            O objeto em cache, ou `None` se não estiver (ou o cache estiver desligado).
+        """
+
+        if not self.maximo:
+            return None
+        with self._trava:
+            objeto = self._objetos.get((tipo, idObjeto))
+            if objeto is None:
+                self.falhas += 1
+                return None
+            self._objetos.move_to_end((tipo, idObjeto))
+            self.acertos += 1
+            return objeto
+
+    def guarda(self, objeto):
+        """ Guarda (ou substitui) um objeto de modelo, pelo seu tipo e `id` """
+
+        self.guardaVarios([objeto])
+
+    def guardaVarios(self, objetos: list):
+        """ Guarda vários objetos de uma vez (ex: o retorno de um getter de lista) """
+
+        if not self.maximo:
+            return
+        with self._trava:
+            for objeto in objetos:
+                chave = (type(objeto), objeto.id)
+                self._objetos[chave] = objeto
+                self._objetos.move_to_end(chave)
+            while len(self._objetos) > self.maximo:
+                self._objetos.popitem(last=False)
+
+    def invalida(self, tipo: type, idObjeto: int = None):
+        """
+        Remove um objeto do cache, ou todos os objetos do tipo se `idObjeto` não for informado.
+
+        Args:
+            tipo (type): Classe do modelo (ex: `Lancamento`).
+            idObjeto (int, optional): Identificador do objeto. Padrão é `None` (todo o tipo).
+        """
+
+        if not self.maximo:
+            return
+        with self._trava:
+            if idObjeto is not None:
+                self._objetos.pop((tipo, idObjeto), None)
+            else:
+                for chave in [c for c in self._objetos if c[0] is tipo]:
+                    del self._objetos[chave]
+
+    def limpa(self):
+        """ Esvazia o cache """
+
+        with self._trava:
+            self._objetos.clear()
@@ -0,0 +1,172 @@
+from dataclasses import dataclass, fields
+
+import numpy as np
+import pandas as pd
+
+from .CartoesCredito import CartaoCredito
+from .Lancamentos import Lancamento
+
+
+@dataclass
+class ConfiguracaoAnterior:
+    """
+    Dias de fechamento/vencimento que um cartão usava antes de uma alteração via `updCartaoCredito`.
+
+    Attributes:
+        ate (str): Data em que a configuração deixou de valer (o `update_invoices_since` da alteração), no formato `YYYY-MM-DD`.
+        closing_day (int): Dia de fechamento usado até essa data.
+        due_day (int): Dia de vencimento usado até essa data.
+    """
+
+    ate: str  # DATE YYYY-MM-DD
+    closing_day: int
+    due_day: int
+
+    def to_dict(self):
+        """ Retorna uma representação em JSON de uma Configuração Anterior """
+        return {"ate": self.ate,
+                "closing_day": self.closing_day,
+                "due_day": self.due_day}
+
+
+@dataclass
+class PeriodoFatura:
+    """
+    Fatura em que uma compra será lançada, calculada localmente.
+
+    Attributes:
+        credit_card_id (int): Identificador do cartão de crédito.
+        starting_date (str): Primeiro dia do período da fatura no formato `YYYY-MM-DD`.
+        closing_date (str): Último dia do período da fatura no formato `YYYY-MM-DD`.
+        date (str): Data de vencimento da fatura no formato `YYYY-MM-DD` (equivale a `FaturaCartao.date`).
+    """
+
+    credit_card_id: int
+    starting_date: str  # DATE YYYY-MM-DD
+    closing_date: str  # DATE YYYY-MM-DD
+    date: str  # DATE YYYY-MM-DD
+
+    def to_dict(self):
+        """ Retorna uma representação em JSON de um Período de Fatura """
+        return {"credit_card_id": self.credit_card_id,
+                "starting_date": self.starting_date,
+                "closing_date": self.closing_date,
+                "date": self.date}
+
+
+def _diaDoMes(meses: np.ndarray, dias: np.ndarray) -> np.ndarray:
+    """ Data do dia informado em cada mês, limitada ao último dia do mês (ex: dia 31 em fevereiro -> 28/29) """
+
+    diasNoMes = ((meses + 1).astype('datetime64[D]') - meses.astype('datetime64[D]')).astype(int)
+    return meses.astype('datetime64[D]') + (np.minimum(dias, diasNoMes) - 1)
+
+
+def _periodos(datas: np.ndarray, fechamento: np.ndarray, vencimento: np.ndarray):
+    """
+    Núcleo vetorizado: compras a partir do dia de fechamento entram na fatura do mês seguinte.
+    O vencimento cai no mesmo mês do fechamento se o dia de vencimento for posterior a ele; senão, no mês seguinte.
+    """
+
+    meses = datas.astype('datetime64[M]')
+    mesFatura = meses + (datas >= _diaDoMes(meses, fechamento)).astype(int)
+
+    inicio = _diaDoMes(mesFatura - 1, fechamento)
+    fim = _diaDoMes(mesFatura, fechamento) - 1
+    vencimento = _diaDoMes(mesFatura + (vencimento <= fechamento).astype(int), vencimento)
+    return inicio, fim, vencimento
+
+
+def _configuracoes(cartao: CartaoCredito, anteriores: list[ConfiguracaoAnterior]):
+    anteriores = sorted(anteriores or [], key=lambda c: c.ate)
+    ates = np.array([c.ate for c in anteriores], dtype='datetime64[D]')
+    fechamentos = np.array([c.closing_day for c in anteriores] + [cartao.closing_day])
+    vencimentos = np.array([c.due_day for c in anteriores] + [cartao.due_day])
+    return ates, fechamentos, vencimentos
+
+
+def calculaFatura(cartao: CartaoCredito, dataCompra: str, anteriores: list[ConfiguracaoAnterior] = None) -> PeriodoFatura:
+    """
+    Calcula localmente em qual fatura do cartão uma compra será lançada, sem consultar `getFaturasCartao`.
+
+    Args:
+        cartao (CartaoCredito): Cartão da compra (usa `closing_day` e `due_day`).
+        dataCompra (str): Data da compra no formato `YYYY-MM-DD`.
+        anteriores (list[ConfiguracaoAnterior], optional): Configurações antigas do cartão, para compras anteriores
+                                                          a alterações feitas com `atualizarFaturasDesde`.
+
+    Returns:
+        PeriodoFatura: O período e o vencimento da fatura.
+    """
+
+    ates, fechamentos, vencimentos = _configuracoes(cartao, anteriores)
+    datas = np.array([dataCompra], dtype='datetime64[D]')
+    vigente = np.searchsorted(ates, datas, side='right')
+
+    inicio, fim, vencimento = _periodos(datas, fechamentos[vigente], vencimentos[vigente])
+    return PeriodoFatura(credit_card_id=cartao.id,
+                         starting_date=str(inicio[0]),
+                         closing_date=str(fim[0]),
+                         date=str(vencimento[0]))
+
+
+def atribuiFaturas(lancamentos, cartoes: list[CartaoCredito],
+                   anteriores: dict[int, list[ConfiguracaoAnterior]] = None) -> pd.DataFrame:
+    """
+    Atribui, de forma vetorizada, a fatura de cada lançamento de cartão de um lote inteiro.
+
+    Args:
+        lancamentos (list[Lancamento] | pd.DataFrame): Lançamentos (ou DataFrame com `date` e `credit_card_id`).
+        cartoes (list[CartaoCredito]): Cartões da conta (ex: via `getCartoesCredito`).
+        anteriores (dict[int, list[ConfiguracaoAnterior]], optional): Configurações antigas, por id do cartão.
+
+    Returns:
+        pd.DataFrame: Os lançamentos de cartão (com o índice original), acrescidos das colunas `invoice_starting_date`,
+                      `invoice_closing_date` e `invoice_date`. Lançamentos sem cartão ou de cartões desconhecidos são descartados.
+    """
+
+    if isinstance(lancamentos, pd.DataFrame):
+        tabela = lancamentos.copy()
+    else:
+        tabela = pd.DataFrame([l.to_dict() for l in lancamentos], columns=[f.name for f in fields(Lancamento)])
+
+    anteriores = anteriores or {}
+    partes = []
+
+    for cartao in cartoes:
+        parte = tabela[tabela["credit_card_id"] == cartao.id]
+        if parte.empty:
+            continue
+
+        ates, fechamentos, vencimentos = _configuracoes(cartao, anteriores.get(cartao.id))
+        datas = pd.to_datetime(parte["date"]).to_numpy().astype('datetime64[D]')
+        vigente = np.searchsorted(ates, datas, side='right')
+
+        inicio, fim, vencimento = _periodos(datas, fechamentos[vigente], vencimentos[vigente])
+        partes.append(parte.assign(invoice_starting_date=inicio, invoice_closing_date=fim, invoice_date=vencimento))
+
+    colunas = list(tabela.columns) + ["invoice_starting_date", "invoice_closing_date", "invoice_date"]
+    if not partes:
+        return pd.DataFrame(columns=colunas)
+    results = pd.concat(partes).sort_index()[colunas]
+    results["credit_card_id"] = results["credit_card_id"].astype("int64")
+    return results
+
+
+def totaisPorFatura(lancamentos, cartoes: list[CartaoCredito],
+                    anteriores: dict[int, list[ConfiguracaoAnterior]] = None) -> pd.DataFrame:
+    """
+    Soma os lançamentos de cartão por fatura, sem chamadas à API.
+
+    Args:
+        lancamentos (list[Lancamento] | pd.DataFrame): Lançamentos (ex: reais e projetados via `projetaLancamentos`).
+        cartoes (list[CartaoCredito]): Cartões da conta (ex: via `getCartoesCredito`).
+        anteriores (dict[int, list[ConfiguracaoAnterior]], optional): Configurações antigas, por id do cartão.
+
+    Returns:
+        pd.DataFrame: Uma linha por (`credit_card_id`, `invoice_date`), com `amount_cents` e `quantidade`.
+    """
+
+    atribuidos = atribuiFaturas(lancamentos, cartoes, anteriores)
+    return (atribuidos.groupby(["credit_card_id", "invoice_date"])
+            .agg(amount_cents=("amount_cents", "sum"), quantidade=("amount_cents", "size"))
+            .reset_index())
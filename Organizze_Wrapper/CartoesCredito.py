@@ -1,6 +1,10 @@
 from dataclasses import dataclass
 
 from .API import API
+from .FaturasCartao import FaturaCartao
+from .Perfil import fase
+from .Validacao import validaPayload
+from .Visoes import visaoDe
 
 @dataclass
 class CartaoCredito:
@@ -64,33 +68,44 @@ class CartaoCredito:
         return obj.to_dict()
 
 
-def getCartoesCredito(sessao: API) -> list[CartaoCredito]:
+CartaoCreditoVisao = visaoDe(CartaoCredito)
+
+
+def getCartoesCredito(sessao: API, visoes: bool = False) -> list[CartaoCredito] | list[CartaoCreditoVisao]:
     """
     Obtém a lista de cartões de crédito da plataforma Organizze.
 
     Args:
         sessao (API): Sessão autenticada para realizar chamadas à API.
+        visoes (bool, optional): Se `True`, retorna visões leves (`CartaoCreditoVisao`) sobre a resposta, sem construir
+                                 os objetos nem alimentar o cache (ver `Visoes`). Padrão é `False`.
 
     Returns:
-        list[CartaoCredito]: Uma lista de objetos `CartaoCredito` contendo os cartões de crédito obtidos.
+        list[CartaoCredito] | list[CartaoCreditoVisao]: Uma lista de objetos `CartaoCredito` contendo os cartões de crédito
+                                                        obtidos (ou de `CartaoCreditoVisao`, se `visoes=True`).
     """
 
     results = []
     response = sessao._get("/credit_cards")
-    for i in response:
-        results.append(CartaoCredito(id=i['id'],
-                                     name=i['name'],
-                                     description=i['description'],
-                                     card_network=i['card_network'],
-                                     closing_day=i['closing_day'],
-                                     due_day=i['due_day'],
-                                     limit_cents=i['limit_cents'],
-                                     type=i['type'],
-                                     archived=i['archived'],
-                                     default=i['default'],
-                                     created_at=i['created_at'],
-                                     updated_at=i['updated_at']
-                                     ))
+    if visoes:
+        with fase("build", "/credit_cards", sessao):
+            return list(map(CartaoCreditoVisao, response))
+    with fase("build", "/credit_cards", sessao):
+        for i in response:
+            results.append(CartaoCredito(id=i['id'],
+                                         name=i['name'],
+                                         description=i['description'],
+                                         card_network=i['card_network'],
+                                         closing_day=i['closing_day'],
+                                         due_day=i['due_day'],
+                                         limit_cents=i['limit_cents'],
+                                         type=i['type'],
+                                         archived=i['archived'],
+                                         default=i['default'],
+                                         created_at=i['created_at'],
+                                         updated_at=i['updated_at']
+                                         ))
+    sessao.cache.guardaVarios(results)
     return results
 
 def getCartaoCredito(sessao: API, idCartao: int) -> CartaoCredito:
@@ -105,19 +120,26 @@ def getCartaoCredito(sessao: API, idCartao: int) -> CartaoCredito:
         CartaoCredito: Um objeto `CartaoCredito` contendo os dados do cartão de crédito obtido.
     """
 
+    cartao = sessao.cache.obtem(CartaoCredito, idCartao)
+    if cartao is not None:
+        return cartao
+
     response = sessao._get(f'/credit_cards/{idCartao}')
-    return CartaoCredito(id=response['id'],
-                         name=response['name'],
-                         description=response['description'],
-                         card_network=response['card_network'],
-                         closing_day=response['closing_day'],
-                         due_day=response['due_day'],
-                         limit_cents=response['limit_cents'],
-                         type=response['type'],
-                         archived=response['archived'],
-                         default=response['default'],
-                         created_at=response['created_at'],
-                         updated_at=response['updated_at'])
+    with fase("build", "/credit_cards/{id}", sessao):
+        cartao = CartaoCredito(id=response['id'],
+                               name=response['name'],
+                               description=response['description'],
+                               card_network=response['card_network'],
+                               closing_day=response['closing_day'],
+                               due_day=response['due_day'],
+                               limit_cents=response['limit_cents'],
+                               type=response['type'],
+                               archived=response['archived'],
+                               default=response['default'],
+                               created_at=response['created_at'],
+                               updated_at=response['updated_at'])
+    sessao.cache.guarda(cartao)
+    return cartao
 
 def delCartaoCredito(sessao: API, idCartao: int):
     """
@@ -129,6 +151,7 @@ def delCartaoCredito(sessao: API, idCartao: int):
     """
 
     sessao._delete(f'/credit_cards/{idCartao}')
+    sessao.cache.invalida(CartaoCredito, idCartao)
 
 def addCartaoCredito(sessao: API, nome: str, bandeira: str, diaVencimento: int, diaFechamento: int, limite: int):
     """
@@ -150,6 +173,7 @@ def addCartaoCredito(sessao: API, nome: str, bandeira: str, diaVencimento: int,
         "closing_day": diaFechamento,
         "limit_cents": limite
     }
+    validaPayload("cartao", JSON_Params)
     sessao._post("/credit_cards", params=JSON_Params)
 
 def updCartaoCredito(sessao: API, idCartao: int, nome: str = None, diaVencimento: int = None, diaFechamento: int = None,
@@ -166,12 +190,14 @@ def updCartaoCredito(sessao: API, idCartao: int, nome: str = None, diaVencimento
         diaVencimento (int): Novo dia de vencimento da fatura do cartão.
         diaFechamento (int): Novo dia de fechamento da fatura do cartão.
         atualizarFaturasDesde (str): Data a partir da qual as faturas do cartão devem ser atualizadas (formato: `YYYY-MM-DD`).
+
+    Raises:
+        ValueError: Se algum parâmetro for inválido (ex: dia de vencimento fora de 1 a 31).
+
     Warnings:
         (Alguns campos foram retirados porque atualizações em campo 'Descrição' e 'Default' não funcionam)
     """
 
-    # TODO: Validação de parâmetros JSON
-
     JSON_Params: dict = {}
     if nome is not None: JSON_Params['name'] = nome
     if diaVencimento is not None: JSON_Params['due_day'] = diaVencimento
@@ -181,7 +207,11 @@ def updCartaoCredito(sessao: API, idCartao: int, nome: str = None, diaVencimento
 
     if JSON_Params != {}:
         if atualizarFaturasDesde is not None: JSON_Params['update_invoices_since'] = atualizarFaturasDesde
+        validaPayload("cartao_atualizacao", JSON_Params)
         sessao._put(f'/credit_cards/{idCartao}', params=JSON_Params)
+        sessao.cache.invalida(CartaoCredito, idCartao)
+        if diaVencimento is not None or diaFechamento is not None:
+            sessao.cache.invalida(FaturaCartao)
 
 def arquivaCartaoCredito(sessao: API, idCartao: int):
     """
@@ -194,3 +224,4 @@ def arquivaCartaoCredito(sessao: API, idCartao: int):
         (Desarquivamentos devem ocorrer atualmente apenas na interface web ou app)
     """
     sessao._put(f'/credit_cards/{idCartao}', params={'archived': True})
+    sessao.cache.invalida(CartaoCredito, idCartao)
@@ -0,0 +1,203 @@
+import base64
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import timedelta
+from io import BytesIO
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .API import API, API_URL
+
+VERSAO_CASSETE = 1
+
+# O corpo é gravado já descompactado, então estes cabeçalhos deixam de valer na reprodução
+_CABECALHOS_IGNORADOS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+def _chave(metodo: str, url: str, corpo) -> tuple:
+    if isinstance(corpo, bytes):
+        corpo = corpo.decode('utf-8', 'replace')
+    return metodo.upper(), url, corpo or None
+
+
+class GravadorCassete:
+    """
+    Grava cada requisição/resposta de uma sessão em um arquivo de cassete (JSON lines compactado com gzip).
+
+    Cada entrada registra método, URL, corpo enviado, status, cabeçalhos, tempo de resposta e corpo recebido.
+    Prefira o gerenciador de contexto `gravaCassete`.
+    """
+
+    def __init__(self, caminho: str):
+        """
+        Args:
+            caminho (str): Caminho do arquivo de cassete a ser criado (será sobrescrito se existir).
+        """
+
+        self._arquivo = gzip.open(caminho, 'wt', encoding='utf-8')
+        self._trava = threading.Lock()
+        self._arquivo.write(json.dumps({"versao": VERSAO_CASSETE}) + "\n")
+
+    def registra(self, response: requests.Response, *args, **kwargs):
+        """ Gancho de resposta do `requests` (hooks['response']) """
+
+        conteudo = response.content
+        try:
+            corpo, codificacao = conteudo.decode('utf-8'), 'texto'
+        except UnicodeDecodeError:
+            corpo, codificacao = base64.b64encode(conteudo).decode('ascii'), 'base64'
+
+        metodo, url, corpoRequisicao = _chave(response.request.method, response.request.url, response.request.body)
+        entrada = {"metodo": metodo,
+                   "url": url,
+                   "corpo_requisicao": corpoRequisicao,
+                   "status": response.status_code,
+                   "motivo": response.reason,
+                   "headers": {k: v for k, v in response.headers.items() if k.lower() not in _CABECALHOS_IGNORADOS},
+                   "duracao": response.elapsed.total_seconds(),
+                   "codificacao": codificacao,
+                   "corpo": corpo}
+
+        with self._trava:
+            self._arquivo.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+
+    def fecha(self):
+        with self._trava:
+            self._arquivo.close()
+
+
+def carregaCassete(caminho: str) -> list[dict]:
+    """
+    Lê as entradas de um arquivo de cassete.
+
+    Args:
+        caminho (str): Caminho do arquivo gerado por `gravaCassete`.
+
+    Returns:
+        list[dict]: Entradas gravadas, na ordem em que as respostas foram recebidas.
+
+    Raises:
+        ValueError: Se o arquivo não for um cassete reconhecido.
+    """
+
+    with gzip.open(caminho, 'rt', encoding='utf-8') as arquivo:
+        cabecalho = json.loads(arquivo.readline() or "{}")
+        if cabecalho.get("versao") != VERSAO_CASSETE:
+            raise ValueError(f"'{caminho}' não é um cassete válido (versão {VERSAO_CASSETE})")
+        return [json.loads(linha) for linha in arquivo if linha.strip()]
+
+
+class AdaptadorCassete(BaseAdapter):
+    """
+    Transporte do `requests` que responde a partir de um cassete, sem acesso à rede.
+
+    Requisições idênticas (mesmo método, URL e corpo) são respondidas na ordem em que foram gravadas;
+    esgotadas as gravações, a última resposta é repetida.
+    """
+
+    def __init__(self, entradas: list[dict], latencia=None):
+        """
+        Args:
+            entradas (list[dict]): Entradas obtidas via `carregaCassete`.
+            latencia (None | str | float, optional): `None` responde imediatamente; "gravada" reproduz o tempo gravado;
+                                                     um número multiplica o tempo gravado (ex: 0.5 = metade). Padrão é `None`.
+        """
+
+        super().__init__()
+        self.escala = 1.0 if latencia == "gravada" else latencia
+        self._respostas: dict[tuple, deque] = defaultdict(deque)
+        self._ultimas: dict[tuple, dict] = {}
+        self._trava = threading.Lock()
+
+        for entrada in entradas:
+            self._respostas[_chave(entrada["metodo"], entrada["url"], entrada["corpo_requisicao"])].append(entrada)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        chave = _chave(request.method, request.url, request.body)
+
+        with self._trava:
+            fila = self._respostas.get(chave)
+            if fila:
+                self._ultimas[chave] = fila.popleft()
+            entrada = self._ultimas.get(chave)
+
+        if entrada is None:
+            raise requests.exceptions.ConnectionError(f"Requisição não encontrada no cassete: {chave[0]} {chave[1]}",
+                                                      request=request)
+        if self.escala:
+            time.sleep(entrada["duracao"] * self.escala)
+
+        if entrada["codificacao"] == "base64":
+            conteudo = base64.b64decode(entrada["corpo"])
+        else:
+            conteudo = entrada["corpo"].encode('utf-8')
+
+        response = requests.Response()
+        response.status_code = entrada["status"]
+        response.reason = entrada["motivo"]
+        response.headers = CaseInsensitiveDict(entrada["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = BytesIO(conteudo)
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=entrada["duracao"])
+        return response
+
+    def close(self):
+        pass
+
+
+@contextmanager
+def gravaCassete(sessao: API, caminho: str):
+    """
+    Grava todo o tráfego da sessão enquanto o contexto estiver aberto.
+
+    Args:
+        sessao (API): Sessão autenticada cujas chamadas serão gravadas.
+        caminho (str): Caminho do arquivo de cassete a ser criado.
+
+    Examples:
+        >>> with gravaCassete(conn, "backfill.cassete"):
+        ...     getLancamentos(conn, "2020-01-01", "2024-12-31")
+    """
+
+    gravador = GravadorCassete(caminho)
+    sessao.sessao.hooks['response'].append(gravador.registra)
+    try:
+        yield gravador
+    finally:
+        sessao.sessao.hooks['response'].remove(gravador.registra)
+        gravador.fecha()
+
+
+@contextmanager
+def reproduzCassete(sessao: API, caminho: str, latencia=None):
+    """
+    Responde às chamadas da sessão a partir de um cassete enquanto o contexto estiver aberto, sem acesso à rede.
+
+    Args:
+        sessao (API): Sessão cujas chamadas serão respondidas pelo cassete (as credenciais não são usadas).
+        caminho (str): Caminho do arquivo gerado por `gravaCassete`.
+        latencia (None | str | float, optional): Ver `AdaptadorCassete`. Padrão é `None` (sem espera).
+
+    Examples:
+        >>> conn = API(email="perf@exemplo.com", token="offline")
+        >>> with reproduzCassete(conn, "backfill.cassete", latencia="gravada"):
+        ...     getLancamentos(conn, "2020-01-01", "2024-12-31")
+    """
+
+    adaptadores = sessao.sessao.adapters.copy()
+    sessao.sessao.mount(API_URL, AdaptadorCassete(carregaCassete(caminho), latencia=latencia))
+    try:
+        yield
+    finally:
+        # Restaura no mesmo objeto, que é compartilhado pelas sessões por thread
+        sessao.sessao.adapters.clear()
+        sessao.sessao.adapters.update(adaptadores)
@@ -1,6 +1,9 @@
 from dataclasses import dataclass
 
 from .API import API
+from .Lancamentos import Lancamento
+from .Perfil import fase
+from .Validacao import validaPayload
 from PyMultiHelper.Validation import matchesRegex
 
 @dataclass
@@ -55,11 +58,13 @@ def getCategorias(sessao: API) -> list[Categoria]:
 
     results = []
     response = sessao._get("/categories")
-    for i in response:
-        results.append(Categoria(id=i['id'],
-                                 name=i['name'],
-                                 color=i['color'],
-                                 parent_id=i['parent_id']))
+    with fase("build", "/categories", sessao):
+        for i in response:
+            results.append(Categoria(id=i['id'],
+                                     name=i['name'],
+                                     color=i['color'],
+                                     parent_id=i['parent_id']))
+    sessao.cache.guardaVarios(results)
     return results
 
 def getCategoria(sessao: API, idCategoria: int) -> Categoria:
@@ -74,11 +79,18 @@ def getCategoria(sessao: API, idCategoria: int) -> Categoria:
         Categoria: Um objeto Categoria representando a categoria encontrada.
     """
 
+    categoria = sessao.cache.obtem(Categoria, idCategoria)
+    if categoria is not None:
+        return categoria
+
     response = sessao._get(f'/categories/{idCategoria}')
-    return Categoria(id=response['id'],
-                     name=response['name'],
-                     color=response['color'],
-                     parent_id=response['parent_id'])
+    with fase("build", "/categories/{id}", sessao):
+        categoria = Categoria(id=response['id'],
+                              name=response['name'],
+                              color=response['color'],
+                              parent_id=response['parent_id'])
+    sessao.cache.guarda(categoria)
+    return categoria
 
 def addCategoria(sessao: API, nome: str, categoriaPai: int = None) -> None:
     """
@@ -94,6 +106,7 @@ def addCategoria(sessao: API, nome: str, categoriaPai: int = None) -> None:
         "name": nome,
         "parent_id": categoriaPai
     }
+    validaPayload("categoria", JSON_Params)
     sessao._post("/categories", params=JSON_Params)
 
 def updCategoria(sessao: API, idCategoria: int, nome: str = None, categoriaPai: int = None) -> None:
@@ -113,6 +126,7 @@ def updCategoria(sessao: API, idCategoria: int, nome: str = None, categoriaPai:
     }
 
     sessao._put(f'/categories/{idCategoria}', params=JSON_Params)
+    sessao.cache.invalida(Categoria, idCategoria)
 
 def delCategoria(sessao: API, idCategoria: int, idNovaCategoria: int = None) -> None:
     """
@@ -136,6 +150,10 @@ def delCategoria(sessao: API, idCategoria: int, idNovaCategoria: int = None) ->
     else:
         sessao._delete(f'/categories/{idCategoria}')
 
+    # Os lançamentos da categoria excluída passam para outra categoria
+    sessao.cache.invalida(Categoria, idCategoria)
+    sessao.cache.invalida(Lancamento)
+
 # OPERAÇÕES CUSTOMIZADAS
 
 def filtraCategorias(categorias: list[Categoria], nomeBuscado: str, usaRegex: bool = False) -> list[Categoria]:
@@ -154,16 +172,17 @@ def filtraCategorias(categorias: list[Categoria], nomeBuscado: str, usaRegex: bo
 
     results: list[Categoria] = []
 
-    for c in categorias:
-        considera = False
-        if usaRegex:
-            if matchesRegex(c.name, nomeBuscado):
-                considera = True
-        else:
-            if nomeBuscado.upper() in c.name.upper():
-                considera = True
-
-        if considera:
-            results.append(c)
+    with fase("filter", "filtraCategorias"):
+        for c in categorias:
+            considera = False
+            if usaRegex:
+                if matchesRegex(c.name, nomeBuscado):
+                    considera = True
+            else:
+                if nomeBuscado.upper() in c.name.upper():
+                    considera = True
+
+            if considera:
+                results.append(c)
 
     return results
\ No newline at end of file
@@ -0,0 +1,231 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from functools import lru_cache
+
+from .API import API
+from .Duplicatas import normalizaDescricao
+from .Lancamentos import getLancamentos
+
+
+@lru_cache(maxsize=65536)
+def _trigramas(descricao: str) -> frozenset:
+    normalizada = f' {normalizaDescricao(descricao)} '
+    return frozenset(normalizada[i:i + 3] for i in range(len(normalizada) - 2))
+
+
+def similaridade(descricaoA: str, descricaoB: str) -> float:
+    """
+    Semelhança entre duas descrições, pela sobreposição (Jaccard) dos trigramas das descrições normalizadas.
+
+    Args:
+        descricaoA (str): Primeira descrição (ex: a do extrato).
+        descricaoB (str): Segunda descrição (ex: a do lançamento no Organizze).
+
+    Returns:
+        float: De 0 (nenhum trigrama em comum) a 1 (descrições normalizadas iguais).
+    """
+
+    a, b = _trigramas(descricaoA or ""), _trigramas(descricaoB or "")
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _campos(item) -> tuple:
+    """ Extrai (ordinal da data, valor, descrição, conta, cartão) de um `Lancamento` ou de um JSON_params """
+
+    if isinstance(item, dict):
+        return (date.fromisoformat(item["date"]).toordinal(), item["amount_cents"], item.get("description"),
+                item.get("account_id"), item.get("credit_card_id"))
+    return (date.fromisoformat(item.date).toordinal(), item.amount_cents, item.description,
+            item.account_id, item.credit_card_id)
+
+
+def _registro(item) -> dict:
+    return item if isinstance(item, dict) else item.to_dict()
+
+
+@dataclass
+class ParConciliado:
+    """
+    Uma linha do extrato e o lançamento do Organizze que corresponde a ela.
+
+    Attributes:
+        externo (dict | Lancamento): Item do extrato.
+        lancamento (Lancamento | dict): Lançamento correspondente no Organizze.
+        diasDiferenca (int): Diferença de datas, em dias (data do lançamento - data do extrato).
+        similaridade (float): Semelhança das descrições (ver `similaridade`); `None` se não precisou ser calculada.
+    """
+
+    externo: object
+    lancamento: object
+    diasDiferenca: int
+    similaridade: float = None
+
+    def to_dict(self):
+        """ Retorna uma representação em JSON de um Par Conciliado """
+        return {"externo": _registro(self.externo),
+                "lancamento": _registro(self.lancamento),
+                "diasDiferenca": self.diasDiferenca,
+                "similaridade": self.similaridade}
+
+
+@dataclass
+class Conciliacao:
+    """
+    Resultado da conciliação de um extrato com os lançamentos do Organizze.
+
+    Attributes:
+        conciliados (list[ParConciliado]): Itens do extrato com lançamento correspondente.
+        ausentes (list): Itens do extrato sem lançamento correspondente (faltam no Organizze).
+        sobrando (list): Lançamentos do Organizze sem item correspondente no extrato.
+    """
+
+    conciliados: list[ParConciliado] = field(default_factory=list)
+    ausentes: list = field(default_factory=list)
+    sobrando: list = field(default_factory=list)
+
+    @property
+    def completa(self) -> bool:
+        """ `True` se todos os itens dos dois lados foram conciliados """
+        return not self.ausentes and not self.sobrando
+
+    def to_dict(self):
+        """ Retorna uma representação em JSON de uma Conciliação """
+        return {"conciliados": [p.to_dict() for p in self.conciliados],
+                "ausentes": [_registro(i) for i in self.ausentes],
+                "sobrando": [_registro(i) for i in self.sobrando]}
+
+
+def concilia(externos, lancamentos, toleranciaDias: int = 3, similaridadeMinima: float = 0.0,
+             conta: int = None, cartao: int = None) -> Conciliacao:
+    """
+    Concilia os itens de um extrato com os lançamentos do Organizze em O((n+m) log(n+m)).
+
+    Os dois lados são ordenados por data e o extrato é percorrido em ordem, com uma janela deslizante de
+    `toleranciaDias` para cada lado sobre os lançamentos; dentro da janela os candidatos ficam agrupados por
+    `amount_cents`, de modo que cada item só é comparado aos lançamentos de mesmo valor e datas próximas.
+    Havendo mais de um candidato, vence a descrição mais parecida e, depois, a data mais próxima.
+
+    Args:
+        externos (list[dict] | list[Lancamento]): Itens do extrato, com `date`, `amount_cents` e `description`
+                                                  (ex: os JSON_params de `ImportadorExtrato.mapeia`).
+        lancamentos (list[Lancamento] | list[dict]): Lançamentos do Organizze (ex: via `getLancamentos`).
+        toleranciaDias (int, optional): Diferença máxima de datas entre um item e seu lançamento. Padrão é 3.
+        similaridadeMinima (float, optional): Semelhança mínima das descrições para aceitar um par (ver `similaridade`).
+                                              Padrão é 0.0 (só valor e data importam).
+        conta (int, optional): Considera apenas os lançamentos dessa conta (`account_id`). Padrão é `None`.
+        cartao (int, optional): Considera apenas os lançamentos desse cartão (`credit_card_id`). Padrão é `None`.
+
+    Returns:
+        Conciliacao: Pares conciliados, itens ausentes no Organizze e lançamentos sobrando.
+
+    Raises:
+        ValueError: Se a tolerância de dias for negativa, ou se `conta` e `cartao` forem informados juntos.
+
+    Warnings:
+        A conciliação é gulosa, em ordem de data do extrato: um item pode ficar com um lançamento que também
+        serviria a um item posterior. Para valores repetidos no mesmo período, use `similaridadeMinima`.
+    """
+
+    if toleranciaDias < 0:
+        raise ValueError("A tolerância de dias não pode ser negativa")
+    if conta is not None and cartao is not None:
+        raise ValueError("Informe apenas 'conta' ou 'cartao', não ambos")
+
+    # Ids de contas e de cartões são independentes: cada filtro olha só o seu campo
+    if conta is not None:
+        lancamentos = [l for l in lancamentos if _campos(l)[3] == conta]
+    elif cartao is not None:
+        lancamentos = [l for l in lancamentos if _campos(l)[4] == cartao]
+    lancamentos = list(lancamentos)
+    externos = list(externos)
+
+    camposLancamentos = [_campos(l) for l in lancamentos]
+    ordemLancamentos = sorted(range(len(lancamentos)), key=lambda j: camposLancamentos[j][0])
+    camposExternos = [_campos(e) for e in externos]
+    ordemExternos = sorted(range(len(externos)), key=lambda i: camposExternos[i][0])
+
+    results = Conciliacao()
+    janela: dict[int, dict[int, None]] = defaultdict(dict)  # valor -> lançamentos livres na janela (em ordem de data)
+    livres = [True] * len(lancamentos)
+    entra = sai = 0
+
+    for i in ordemExternos:
+        ordinal, valor, descricao = camposExternos[i][:3]
+
+        # Avança a janela: entram os lançamentos até `ordinal + tolerância`, saem os anteriores a `ordinal - tolerância`
+        while entra < len(ordemLancamentos) and camposLancamentos[ordemLancamentos[entra]][0] <= ordinal + toleranciaDias:
+            j = ordemLancamentos[entra]
+            janela[camposLancamentos[j][1]][j] = None
+            entra += 1
+        while sai < entra and camposLancamentos[ordemLancamentos[sai]][0] < ordinal - toleranciaDias:
+            j = ordemLancamentos[sai]
+            janela[camposLancamentos[j][1]].pop(j, None)
+            sai += 1
+
+        candidatos = janela.get(valor)
+        if not candidatos:
+            results.ausentes.append(externos[i])
+            continue
+
+        if len(candidatos) == 1 and not similaridadeMinima:
+            escolhido, semelhanca = next(iter(candidatos)), None
+        else:
+            escolhido = max(candidatos, key=lambda j: (similaridade(descricao, camposLancamentos[j][2]),
+                                                       -abs(camposLancamentos[j][0] - ordinal)))
+            semelhanca = similaridade(descricao, camposLancamentos[escolhido][2])
+            if semelhanca < similaridadeMinima:
+                results.ausentes.append(externos[i])
+                continue
+
+        del candidatos[escolhido]
+        livres[escolhido] = False
+        results.conciliados.append(ParConciliado(externo=externos[i], lancamento=lancamentos[escolhido],
+                                                 diasDiferenca=camposLancamentos[escolhido][0] - ordinal,
+                                                 similaridade=semelhanca))
+
+    results.sobrando = [lancamentos[j] for j in ordemLancamentos if livres[j]]
+    return results
+
+
+def conciliaConta(sessao: API, externos, conta: int = None, cartao: int = None, toleranciaDias: int = 3,
+                  similaridadeMinima: float = 0.0) -> Conciliacao:
+    """
+    Concilia um extrato com os lançamentos de uma conta ou de um cartão, buscando no Organizze o período do extrato.
+
+    Args:
+        sessao (API): Sessão autenticada para realizar chamadas à API.
+        externos (list[dict] | list[Lancamento]): Itens do extrato (ver `concilia`).
+        conta (int, optional): Id da conta (extrato bancário).
+        cartao (int, optional): Id do cartão de crédito (extrato do cartão).
+        toleranciaDias (int, optional): Ver `concilia`. Padrão é 3.
+        similaridadeMinima (float, optional): Ver `concilia`. Padrão é 0.0.
+
+    Returns:
+        Conciliacao: Pares conciliados, itens ausentes no Organizze e lançamentos sobrando.
+
+    Raises:
+        ValueError: Se não for informado exatamente um entre `conta` e `cartao`.
+
+    Examples:
+        >>> importador = ImportadorExtrato(conn, MAPEAMENTO_OFX, conta=123)
+        >>> extrato = [importador.mapeia(linha) for linha in leOFX("extrato.ofx")]
+        >>> resultado = conciliaConta(conn, extrato, conta=123)
+        >>> len(resultado.ausentes), len(resultado.sobrando)
+    """
+
+    if (conta is None) == (cartao is None):
+        raise ValueError("Informe 'conta' ou 'cartao' (apenas um)")
+
+    externos = list(externos)
+    if not externos:
+        return Conciliacao()
+
+    ordinais = [_campos(e)[0] for e in externos]
+    inicio = date.fromordinal(min(ordinais)) - timedelta(days=toleranciaDias)
+    fim = date.fromordinal(max(ordinais)) + timedelta(days=toleranciaDias)
+    lancamentos = getLancamentos(sessao, inicio.isoformat(), fim.isoformat())
+    return concilia(externos, lancamentos, toleranciaDias=toleranciaDias, similaridadeMinima=similaridadeMinima,
+                    conta=conta, cartao=cartao)
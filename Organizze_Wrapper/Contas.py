@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 
 from .API import API
+from .Perfil import fase
+from .Validacao import validaPayload
 
 
 @dataclass
@@ -65,18 +67,20 @@ def getContas(sessao: API) -> list[Conta]:
 
     results = []
     response = sessao._get("/accounts")
-    for i in response:
-        # Contas sem 'type' provavelmente são inconsistências e devem ser ignoradas
-        if "type" not in i: continue
-
-        results.append(Conta(id=i['id'],
-                             name=i['name'],
-                             description=i['description'],
-                             type=i['type'],
-                             default=i['default'],
-                             archived=i['archived'],
-                             created_at=i['created_at'],
-                             updated_at=i['updated_at']))
+    with fase("build", "/accounts", sessao):
+        for i in response:
+            # Contas sem 'type' provavelmente são inconsistências e devem ser ignoradas
+            if "type" not in i: continue
+
+            results.append(Conta(id=i['id'],
+                                 name=i['name'],
+                                 description=i['description'],
+                                 type=i['type'],
+                                 default=i['default'],
+                                 archived=i['archived'],
+                                 created_at=i['created_at'],
+                                 updated_at=i['updated_at']))
+    sessao.cache.guardaVarios(results)
     return results
 
 def getConta(sessao: API, idConta: int) -> Conta:
@@ -91,15 +95,22 @@ def getConta(sessao: API, idConta: int) -> Conta:
         Conta: Uma instância da classe `Conta` contendo os detalhes da conta.
     """
 
+    conta = sessao.cache.obtem(Conta, idConta)
+    if conta is not None:
+        return conta
+
     response = sessao._get(f'/accounts/{idConta}')
-    return Conta(id=response['id'],
-                 name=response['name'],
-                 description=response['description'],
-                 type=response['type'],
-                 default=response['default'],
-                 archived=response['archived'],
-                 created_at=response['created_at'],
-                 updated_at=response['updated_at'])
+    with fase("build", "/accounts/{id}", sessao):
+        conta = Conta(id=response['id'],
+                      name=response['name'],
+                      description=response['description'],
+                      type=response['type'],
+                      default=response['default'],
+                      archived=response['archived'],
+                      created_at=response['created_at'],
+                      updated_at=response['updated_at'])
+    sessao.cache.guarda(conta)
+    return conta
 
 def delConta(sessao: API, idConta: int):
     """
@@ -111,6 +122,7 @@ def delConta(sessao: API, idConta: int):
     """
 
     sessao._delete(f'/accounts/{idConta}')
+    sessao.cache.invalida(Conta, idConta)
 
 def addConta(sessao: API, nome: str, descricao: str, default: bool, tipo: str):
     """
@@ -122,9 +134,10 @@ def addConta(sessao: API, nome: str, descricao: str, default: bool, tipo: str):
         descricao (str): A descrição da conta.
         default (bool): Indica se a conta é a conta padrão.
         tipo (str): O tipo da conta, deve ser 'checking', 'savings' ou 'other'.
-    """
 
-    # TODO: "Parâmetro tipo precisa de validação: checking ou outro"
+    Raises:
+        ValueError: Se algum parâmetro for inválido (ex: tipo fora de 'checking', 'savings' ou 'other').
+    """
 
     JSON_Params: dict = {
         "name": nome,
@@ -132,7 +145,11 @@ def addConta(sessao: API, nome: str, descricao: str, default: bool, tipo: str):
         "description": descricao,
         "default": default
     }
+    validaPayload("conta", JSON_Params)
     sessao._post("/accounts", params=JSON_Params)
+    if default:
+        # A conta padrão anterior deixa de ser padrão
+        sessao.cache.invalida(Conta)
 
 def updConta(sessao: API, idConta: int, nome: str):
     """
@@ -149,4 +166,6 @@ def updConta(sessao: API, idConta: int, nome: str):
     JSON_Params: dict = {
         "name": nome
     }
-    sessao._put(f'/accounts/{idConta}', params=JSON_Params)
\ No newline at end of file
+    validaPayload("conta_atualizacao", JSON_Params)
+    sessao._put(f'/accounts/{idConta}', params=JSON_Params)
+    sessao.cache.invalida(Conta, idConta)
\ No newline at end of file
@@ -0,0 +1,394 @@
+"""
+Backfill distribuído: um coordenador divide o histórico em shards (credencial, recurso, chave) e os publica em
+uma fila SQLite; trabalhadores em um ou mais processos/máquinas alugam shards, executam e marcam o resultado.
+
+Cada aluguel (lease) tem validade e é renovado enquanto o shard está em execução; se o trabalhador morrer, o shard
+volta para a fila quando o aluguel expira. Falhas são repetidas com espera até `maxTentativas`.
+
+Warnings:
+    Com trabalhadores em várias máquinas, a fila precisa estar em um sistema de arquivos compartilhado com travas
+    de arquivo confiáveis (SQLite sobre NFS mal configurado pode corromper o banco). O destino também precisa
+    ser compartilhado; use os formatos jsonl ou parquet (o sqlite do `Gravador` é local a cada processo).
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from datetime import date
+
+from PyMultiHelper.Logging import logFail, logSuccess
+
+from .API import API
+from .CLI import FORMATOS, RECURSOS, Gravador, buscaTarefa, planejaTarefas
+
+PENDENTE, ALUGADO, CONCLUIDO, FALHOU = "pendente", "alugado", "concluido", "falhou"
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS shards (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    credencial TEXT NOT NULL,
+    recurso TEXT NOT NULL,
+    chave TEXT NOT NULL,
+    estado TEXT NOT NULL,
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    disponivel REAL NOT NULL DEFAULT 0,
+    dono TEXT,
+    expira REAL,
+    registros INTEGER,
+    erro TEXT,
+    UNIQUE (credencial, recurso, chave)
+)
+"""
+
+
+class FilaShards:
+    """
+    Fila de shards persistida em SQLite, segura para vários processos (as transições usam `BEGIN IMMEDIATE`).
+    Pode ser usada como gerenciador de contexto, que fecha a conexão ao sair.
+    """
+
+    def __init__(self, caminho: str, timeout: float = 30.0):
+        """
+        Args:
+            caminho (str): Arquivo SQLite da fila (criado se não existir).
+            timeout (float, optional): Espera máxima, em segundos, pela trava do banco. Padrão é 30.
+        """
+
+        self.caminho = caminho
+        self._banco = sqlite3.connect(caminho, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._banco.execute("PRAGMA journal_mode=WAL")
+        self._banco.execute(_ESQUEMA)
+        self._trava = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.fecha()
+
+    def _transacao(self, sql: str, parametros: tuple = ()):
+        with self._trava:
+            self._banco.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._banco.execute(sql, parametros)
+                self._banco.execute("COMMIT")
+                return cursor
+            except Exception:
+                self._banco.execute("ROLLBACK")
+                raise
+
+    def enfileira(self, credencial: str, shards: list[tuple[str, str]]) -> int:
+        """
+        Publica shards de uma credencial. Shards já existentes (mesma credencial, recurso e chave) são mantidos
+        como estão, de modo que replanejar é seguro.
+
+        Args:
+            credencial (str): Email da credencial.
+            shards (list[tuple[str, str]]): Pares (recurso, chave).
+
+        Returns:
+            int: Quantidade de shards novos.
+        """
+
+        with self._trava:
+            self._banco.execute("BEGIN IMMEDIATE")
+            antes = self._banco.total_changes
+            self._banco.executemany("INSERT OR IGNORE INTO shards (credencial, recurso, chave, estado) VALUES (?, ?, ?, ?)",
+                                    [(credencial, recurso, chave, PENDENTE) for recurso, chave in shards])
+            self._banco.execute("COMMIT")
+            return self._banco.total_changes - antes
+
+    def aluga(self, dono: str, duracao: float, maxTentativas: int = None) -> tuple:
+        """
+        Aluga o próximo shard disponível: pendente e liberado para nova tentativa, ou com aluguel vencido.
+
+        Assumir um aluguel vencido conta como uma tentativa (o trabalhador anterior morreu ou travou durante
+        o shard); ao atingir `maxTentativas`, o shard é marcado como falho em vez de alugado.
+
+        Args:
+            dono (str): Identificador do trabalhador.
+            duracao (float): Validade do aluguel, em segundos.
+            maxTentativas (int, optional): Tentativas antes de marcar o shard como falho. Padrão é `None` (sem limite).
+
+        Returns:
+            tuple: (id, credencial, recurso, chave, tentativas), ou `None` se não houver shard disponível.
+        """
+
+        agora = time.time()
+        with self._trava:
+            self._banco.execute("BEGIN IMMEDIATE")
+            try:
+                while True:
+                    linha = self._banco.execute("SELECT id, credencial, recurso, chave, tentativas, estado FROM shards "
+                                                "WHERE (estado = ? AND disponivel <= ?) OR (estado = ? AND expira < ?) "
+                                                "ORDER BY id LIMIT 1", (PENDENTE, agora, ALUGADO, agora)).fetchone()
+                    if linha is None:
+                        break
+
+                    idShard, credencial, recurso, chave, tentativas, estado = linha
+                    if estado == ALUGADO:
+                        tentativas += 1
+                        if maxTentativas is not None and tentativas >= maxTentativas:
+                            self._banco.execute("UPDATE shards SET estado = ?, tentativas = ?, erro = ? WHERE id = ?",
+                                                (FALHOU, tentativas, "aluguel expirado sem conclusão", idShard))
+                            continue
+
+                    self._banco.execute("UPDATE shards SET estado = ?, dono = ?, expira = ?, tentativas = ? WHERE id = ?",
+                                        (ALUGADO, dono, agora + duracao, tentativas, idShard))
+                    linha = (idShard, credencial, recurso, chave, tentativas)
+                    break
+                self._banco.execute("COMMIT")
+            except Exception:
+                self._banco.execute("ROLLBACK")
+                raise
+        return linha
+
+    def renova(self, idShard: int, dono: str, duracao: float) -> bool:
+        """ Estende o aluguel de um shard em execução. Retorna `False` se o shard não pertence mais ao dono """
+
+        cursor = self._transacao("UPDATE shards SET expira = ? WHERE id = ? AND dono = ? AND estado = ?",
+                                 (time.time() + duracao, idShard, dono, ALUGADO))
+        return cursor.rowcount == 1
+
+    def conclui(self, idShard: int, dono: str, registros: int):
+        self._transacao("UPDATE shards SET estado = ?, registros = ?, erro = NULL WHERE id = ? AND dono = ?",
+                        (CONCLUIDO, registros, idShard, dono))
+
+    def falha(self, idShard: int, dono: str, erro: str, tentativas: int, maxTentativas: int, esperaBase: float):
+        """ Devolve o shard à fila com espera exponencial, ou o marca como falho após `maxTentativas` """
+
+        if tentativas >= maxTentativas:
+            self._transacao("UPDATE shards SET estado = ?, tentativas = ?, erro = ? WHERE id = ? AND dono = ?",
+                            (FALHOU, tentativas, erro, idShard, dono))
+        else:
+            self._transacao("UPDATE shards SET estado = ?, tentativas = ?, erro = ?, disponivel = ?, dono = NULL "
+                            "WHERE id = ? AND dono = ?",
+                            (PENDENTE, tentativas, erro, time.time() + esperaBase * 2 ** (tentativas - 1), idShard, dono))
+
+    def reabreFalhas(self) -> int:
+        """ Recoloca na fila os shards que esgotaram as tentativas. Retorna a quantidade reaberta """
+
+        return self._transacao("UPDATE shards SET estado = ?, tentativas = 0, disponivel = 0 WHERE estado = ?",
+                               (PENDENTE, FALHOU)).rowcount
+
+    def progresso(self) -> dict:
+        """
+        Returns:
+            dict: Quantidade de shards por estado, o total de registros exportados e os trabalhadores ativos.
+        """
+
+        with self._trava:
+            contagem = dict(self._banco.execute("SELECT estado, COUNT(*) FROM shards GROUP BY estado").fetchall())
+            registros = self._banco.execute("SELECT COALESCE(SUM(registros), 0) FROM shards").fetchone()[0]
+            donos = self._banco.execute("SELECT COUNT(DISTINCT dono) FROM shards WHERE estado = ? AND expira >= ?",
+                                        (ALUGADO, time.time())).fetchone()[0]
+
+        results = {estado: contagem.get(estado, 0) for estado in (PENDENTE, ALUGADO, CONCLUIDO, FALHOU)}
+        results.update(total=sum(contagem.values()), registros=registros, trabalhadores=donos)
+        return results
+
+    def falhas(self) -> list[dict]:
+        """ Shards que esgotaram as tentativas, com o último erro """
+
+        with self._trava:
+            linhas = self._banco.execute("SELECT credencial, recurso, chave, tentativas, erro FROM shards "
+                                         "WHERE estado = ? ORDER BY id", (FALHOU,)).fetchall()
+        return [dict(zip(("credencial", "recurso", "chave", "tentativas", "erro"), l)) for l in linhas]
+
+    def fecha(self):
+        self._banco.close()
+
+
+def planejaBackfill(fila: FilaShards, credenciais: list[dict], recursos: list[str], dataInicio: str, dataFim: str,
+                    diasJanela: int = 30) -> int:
+    """
+    Divide o backfill de todas as credenciais em shards e os publica na fila.
+
+    Args:
+        fila (FilaShards): Fila de destino.
+        credenciais (list[dict]): Credenciais no formato {email, token, autor}.
+        recursos (list[str]): Recursos a exportar (chaves de `RECURSOS`).
+        dataInicio (str): Data de início no formato `YYYY-MM-DD`.
+        dataFim (str): Data de fim no formato `YYYY-MM-DD`.
+        diasJanela (int, optional): Dias por shard de lançamentos (as mesmas janelas de `getLancamentos`). Padrão é 30.
+
+    Returns:
+        int: Quantidade de shards novos publicados.
+
+    Raises:
+        ValueError: Se algum recurso for desconhecido.
+    """
+
+    desconhecidos = set(recursos) - set(RECURSOS)
+    if desconhecidos:
+        raise ValueError(f"Recursos desconhecidos: {', '.join(sorted(desconhecidos))}")
+
+    novos = 0
+    for credencial in credenciais:
+        sessao = API(email=credencial["email"], token=credencial["token"], autor=credencial.get("autor", "SemNome"))
+        tarefas = planejaTarefas(sessao, recursos, dataInicio, dataFim, diasJanela)
+        novos += fila.enfileira(sessao.email, [(recurso, chave) for recurso, chave, _ in tarefas])
+    return novos
+
+
+def executaTrabalhador(caminhoFila: str, credenciais: list[dict], destino: str, formato: str = "jsonl",
+                       duracaoAluguel: float = 120.0, maxTentativas: int = 5, esperaBase: float = 5.0,
+                       dono: str = None) -> int:
+    """
+    Executa shards da fila até ela não ter mais nada pendente ou em execução por outros.
+
+    Args:
+        caminhoFila (str): Arquivo SQLite da fila.
+        credenciais (list[dict]): Credenciais no formato {email, token, autor} (os tokens não ficam na fila).
+        destino (str): Diretório de saída (compartilhado entre as máquinas).
+        formato (str, optional): "jsonl" ou "parquet" (ver Warnings do módulo). Padrão é "jsonl".
+        duracaoAluguel (float, optional): Validade do aluguel, em segundos; renovado a cada 1/3 dela. Padrão é 120.
+        maxTentativas (int, optional): Tentativas por shard antes de marcá-lo como falho. Padrão é 5.
+        esperaBase (float, optional): Espera antes da 2ª tentativa de um shard; dobra a cada falha. Padrão é 5.
+        dono (str, optional): Identificador do trabalhador. Padrão é "<máquina>:<pid>:<aleatório>".
+
+    Returns:
+        int: Quantidade de shards concluídos por este trabalhador.
+    """
+
+    dono = dono or f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}'
+    fila = FilaShards(caminhoFila)
+    gravador = Gravador(formato, destino)
+    sessoes = {c["email"]: API(email=c["email"], token=c["token"], autor=c.get("autor", "SemNome"))
+               for c in credenciais}
+    concluidos = 0
+
+    try:
+        while True:
+            shard = fila.aluga(dono, duracaoAluguel, maxTentativas)
+            if shard is None:
+                progresso = fila.progresso()
+                if progresso[PENDENTE] == 0 and progresso[ALUGADO] == 0:
+                    return concluidos
+                # Há shards em espera de nova tentativa ou alugados por outros (que podem expirar)
+                time.sleep(min(1.0, esperaBase, duracaoAluguel / 3))
+                continue
+
+            idShard, email, recurso, chave, tentativas = shard
+            parar = threading.Event()
+            renovacao = threading.Thread(target=_renovaAluguel, args=(fila, idShard, dono, duracaoAluguel, parar), daemon=True)
+            renovacao.start()
+            try:
+                if email not in sessoes:
+                    raise KeyError(f"Credencial '{email}' não informada a este trabalhador")
+                objetos = buscaTarefa(sessoes[email], recurso, chave)
+                gravador.grava(email, recurso, chave, objetos)
+                fila.conclui(idShard, dono, len(objetos))
+                concluidos += 1
+                logSuccess(f"{dono} {email}|{recurso}|{chave} ({len(objetos)} registros)")
+            except Exception as erro:
+                fila.falha(idShard, dono, str(erro), tentativas + 1, maxTentativas, esperaBase)
+                logFail(f"{dono} {email}|{recurso}|{chave}: {erro}")
+            finally:
+                parar.set()
+                renovacao.join()
+    finally:
+        gravador.fecha()
+        fila.fecha()
+
+
+def _renovaAluguel(fila: FilaShards, idShard: int, dono: str, duracao: float, parar: threading.Event):
+    while not parar.wait(duracao / 3):
+        if not fila.renova(idShard, dono, duracao):
+            return
+
+
+def executaLocal(caminhoFila: str, credenciais: list[dict], destino: str, processos: int = None, **opcoes) -> int:
+    """
+    Executa `processos` trabalhadores nesta máquina, em processos separados.
+
+    Args:
+        caminhoFila (str): Arquivo SQLite da fila.
+        credenciais (list[dict]): Credenciais no formato {email, token, autor}.
+        destino (str): Diretório de saída.
+        processos (int, optional): Quantidade de trabalhadores. Padrão é `None` (um por núcleo).
+        **opcoes: Demais argumentos de `executaTrabalhador`.
+
+    Returns:
+        int: Total de shards concluídos.
+
+    Warnings:
+        Em sistemas que iniciam processos via 'spawn' (Windows, macOS), chame esta função dentro de
+        `if __name__ == "__main__":`.
+    """
+
+    processos = processos or os.cpu_count()
+    with multiprocessing.Pool(processos) as pool:
+        resultados = [pool.apply_async(executaTrabalhador, (caminhoFila, credenciais, destino), opcoes)
+                      for _ in range(processos)]
+        return sum(r.get() for r in resultados)
+
+
+def main(argv: list[str] = None) -> int:
+    """ Ponto de entrada do comando `organizze-backfill` """
+
+    parser = argparse.ArgumentParser(prog="organizze-backfill",
+                                     description="Backfill distribuído do Organizze via fila SQLite de shards.")
+    parser.add_argument("--fila", required=True, help="Arquivo SQLite da fila (compartilhado entre as máquinas)")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    planeja = comandos.add_parser("planeja", help="Divide o backfill em shards e os publica na fila")
+    planeja.add_argument("--credenciais", required=True, help="Arquivo JSON com uma lista de {email, token, autor}")
+    planeja.add_argument("--recursos", default="lancamentos,faturas,contas,cartoes,categorias",
+                         help=f"Lista separada por vírgulas entre: {','.join(RECURSOS)}")
+    planeja.add_argument("--inicio", required=True, help="Data inicial (YYYY-MM-DD)")
+    planeja.add_argument("--fim", default=date.today().isoformat(), help="Data final (YYYY-MM-DD). Padrão: hoje")
+    planeja.add_argument("--janela-dias", type=int, default=30, help="Dias por shard de lançamentos. Padrão: 30")
+
+    trabalha = comandos.add_parser("trabalha", help="Executa shards da fila até ela esvaziar")
+    trabalha.add_argument("--credenciais", required=True, help="Arquivo JSON com uma lista de {email, token, autor}")
+    trabalha.add_argument("--destino", required=True, help="Diretório de saída")
+    trabalha.add_argument("--formato", choices=[f for f in FORMATOS if f != "sqlite"], default="jsonl")
+    trabalha.add_argument("--processos", type=int, default=1, help="Trabalhadores nesta máquina. Padrão: 1")
+
+    comandos.add_parser("progresso", help="Mostra o andamento da fila")
+    comandos.add_parser("reabre", help="Recoloca na fila os shards que falharam")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+
+    if args.comando in ("planeja", "trabalha"):
+        with open(args.credenciais, encoding='utf-8') as arquivo:
+            credenciais = json.load(arquivo)
+        credenciais = credenciais if isinstance(credenciais, list) else [credenciais]
+
+    if args.comando == "planeja":
+        recursos = [r.strip() for r in args.recursos.split(",") if r.strip()]
+        desconhecidos = set(recursos) - set(RECURSOS)
+        if desconhecidos:
+            parser.error(f"Recursos desconhecidos: {', '.join(sorted(desconhecidos))}")
+
+    with FilaShards(args.fila) as fila:
+        if args.comando == "planeja":
+            novos = planejaBackfill(fila, credenciais, recursos, args.inicio, args.fim, args.janela_dias)
+            logging.info(f"{novos} shards novos publicados")
+        elif args.comando == "trabalha":
+            # Os trabalhadores abrem suas próprias conexões com a fila
+            if args.processos > 1:
+                concluidos = executaLocal(args.fila, credenciais, args.destino, args.processos, formato=args.formato)
+            else:
+                concluidos = executaTrabalhador(args.fila, credenciais, args.destino, formato=args.formato)
+            logging.info(f"{concluidos} shards concluídos")
+        elif args.comando == "reabre":
+            logging.info(f"{fila.reabreFalhas()} shards reabertos")
+
+        progresso = fila.progresso()
+
+    print(json.dumps(progresso))
+    return 1 if progresso[FALHOU] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
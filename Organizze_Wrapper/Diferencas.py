@@ -0,0 +1,207 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+
+from .Lancamentos import Lancamento
+
+
+def _abre(caminho: str, modo: str):
+    """ Abre um snapshot JSONL, comprimido com gzip se terminar em `.gz` """
+
+    if caminho.endswith(".gz"):
+        return gzip.open(caminho, modo + "t", encoding='utf-8')
+    return open(caminho, modo, encoding='utf-8')
+
+
+def _canonico(registro: dict) -> str:
+    return json.dumps(registro, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def impressao(registro: dict) -> bytes:
+    """
+    Resumo (hash) de todos os campos de um registro, independente da ordem das chaves.
+
+    Args:
+        registro (dict): Registro (ex: `Lancamento.to_dict()`).
+
+    Returns:
+        bytes: 16 bytes de BLAKE2b; registros com os mesmos valores têm a mesma impressão.
+    """
+
+    return hashlib.blake2b(_canonico(registro).encode(), digest_size=16).digest()
+
+
+def camposAlterados(antes: dict, depois: dict) -> dict[str, tuple]:
+    """ Campos cujo valor mudou entre duas versões do mesmo registro, no formato {campo: (antes, depois)} """
+
+    return {campo: (antes.get(campo), depois.get(campo))
+            for campo in antes.keys() | depois.keys() if antes.get(campo) != depois.get(campo)}
+
+
+@dataclass
+class Alteracao:
+    """
+    Um registro presente nos dois conjuntos, com valores diferentes.
+
+    Attributes:
+        id (int): Identificador do registro.
+        campos (dict[str, tuple]): Campos alterados, no formato {campo: (valor antes, valor depois)}.
+    """
+
+    id: int
+    campos: dict[str, tuple]
+
+    def to_dict(self):
+        """ Retorna uma representação em JSON de uma Alteração """
+        return {"id": self.id,
+                "campos": {campo: list(valores) for campo, valores in self.campos.items()}}
+
+
+@dataclass
+class Diferenca:
+    """
+    Resultado da comparação de dois conjuntos de registros.
+
+    Attributes:
+        adicionados (list[dict]): Registros presentes apenas no conjunto novo.
+        removidos (list[dict]): Registros presentes apenas no conjunto antigo.
+        alterados (list[Alteracao]): Registros presentes em ambos, com algum campo diferente.
+    """
+
+    adicionados: list[dict] = field(default_factory=list)
+    removidos: list[dict] = field(default_factory=list)
+    alterados: list[Alteracao] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.adicionados or self.removidos or self.alterados)
+
+    def to_dict(self):
+        """ Retorna uma representação em JSON de uma Diferença """
+        return {"adicionados": self.adicionados,
+                "removidos": self.removidos,
+                "alterados": [a.to_dict() for a in self.alterados]}
+
+
+def _registro(item) -> dict:
+    return item if isinstance(item, dict) else item.to_dict()
+
+
+def comparaLancamentos(antes: list[Lancamento], depois: list[Lancamento]) -> Diferenca:
+    """
+    Compara dois conjuntos de lançamentos em O(n): o conjunto antigo é indexado pelo `id` uma única vez e cada
+    registro novo é comparado só com o de mesmo `id`; campo a campo só são comparados os registros diferentes.
+
+    Args:
+        antes (list[Lancamento] | list[dict]): Conjunto antigo (ex: o retorno de ontem de `getLancamentos`).
+        depois (list[Lancamento] | list[dict]): Conjunto novo, da mesma janela.
+
+    Returns:
+        Diferenca: Adicionados, removidos e alterados (com os campos que mudaram).
+    """
+
+    indice: dict = {}
+    for item in antes:
+        registro = _registro(item)
+        indice[registro["id"]] = registro
+
+    results = Diferenca()
+    for item in depois:
+        registro = _registro(item)
+        anterior = indice.pop(registro["id"], None)
+        if anterior is None:
+            results.adicionados.append(registro)
+        elif anterior != registro:
+            results.alterados.append(Alteracao(id=registro["id"], campos=camposAlterados(anterior, registro)))
+
+    results.removidos = list(indice.values())
+    return results
+
+
+def gravaSnapshot(lancamentos, caminho: str):
+    """
+    Grava um snapshot em JSONL (um registro por linha, chaves ordenadas), para comparação futura via `comparaSnapshots`.
+
+    Args:
+        lancamentos (Iterable[Lancamento] | Iterable[dict]): Registros (ex: via `iteraLancamentos`, sem acumular em memória).
+        caminho (str): Arquivo a ser criado; comprimido com gzip se terminar em `.gz`.
+    """
+
+    with _abre(caminho, 'w') as arquivo:
+        for item in lancamentos:
+            arquivo.write(_canonico(_registro(item)) + "\n")
+
+
+def _resumoLinha(linha: bytes) -> bytes:
+    return hashlib.blake2b(linha.rstrip(b"\r\n"), digest_size=16).digest()
+
+
+def _particiona(caminho: str, pasta: str, prefixo: str, particoes: int) -> list[str]:
+    """ Distribui as linhas de um snapshot em `particoes` arquivos pelo `id`, sem manter o snapshot em memória """
+
+    caminhos = [os.path.join(pasta, f'{prefixo}-{p}.jsonl') for p in range(particoes)]
+    saidas = [open(c, 'w', encoding='utf-8', newline="\n") for c in caminhos]
+    try:
+        with _abre(caminho, 'r') as arquivo:
+            for linha in arquivo:
+                if linha.strip():
+                    idRegistro = json.loads(linha)["id"]
+                    saidas[hash(idRegistro) % particoes].write(linha if linha.endswith("\n") else linha + "\n")
+    finally:
+        for s in saidas:
+            s.close()
+    return caminhos
+
+
+def comparaSnapshots(caminhoAntes: str, caminhoDepois: str, particoes: int = 64):
+    """
+    Compara dois snapshots JSONL de qualquer tamanho com memória limitada: os dois arquivos são particionados
+    em disco pelo `id` e cada partição é comparada isoladamente, mantendo em memória só o lado antigo dela.
+
+    Args:
+        caminhoAntes (str): Snapshot antigo (ex: gravado por `gravaSnapshot`).
+        caminhoDepois (str): Snapshot novo.
+        particoes (int, optional): Quantidade de partições. A memória usada é ~1/`particoes` do snapshot antigo.
+                                   Padrão é 64.
+
+    Yields:
+        tuple[str, dict | Alteracao]: Eventos ("adicionado", registro), ("removido", registro) ou ("alterado", Alteracao),
+                                      agrupados por partição (sem ordem global).
+
+    Examples:
+        >>> gravaSnapshot(iteraLancamentos(conn, "2020-01-01", "2024-12-31"), "hoje.jsonl.gz")
+        >>> for tipo, item in comparaSnapshots("ontem.jsonl.gz", "hoje.jsonl.gz"):
+        ...     print(tipo, item)
+    """
+
+    with tempfile.TemporaryDirectory(prefix="organizze-diff-") as pasta:
+        antigos = _particiona(caminhoAntes, pasta, "antes", particoes)
+        novos = _particiona(caminhoDepois, pasta, "depois", particoes)
+
+        for caminhoAntigo, caminhoNovo in zip(antigos, novos):
+            # Do lado antigo só ficam em memória o resumo e a posição de cada linha; ela é relida se houver diferença
+            indice: dict = {}
+            with open(caminhoAntigo, 'rb') as antigo:
+                posicao = 0
+                for linha in antigo:
+                    indice[json.loads(linha)["id"]] = (_resumoLinha(linha), posicao)
+                    posicao += len(linha)
+
+                with open(caminhoNovo, 'rb') as arquivo:
+                    for linha in arquivo:
+                        registro = json.loads(linha)
+                        anterior = indice.pop(registro["id"], None)
+                        if anterior is None:
+                            yield "adicionado", registro
+                        elif anterior[0] != _resumoLinha(linha):
+                            antigo.seek(anterior[1])
+                            campos = camposAlterados(json.loads(antigo.readline()), registro)
+                            # Linhas diferentes podem ter os mesmos valores (ex: outra ordem de chaves)
+                            if campos:
+                                yield "alterado", Alteracao(id=registro["id"], campos=campos)
+
+                for _, posicao in indice.values():
+                    antigo.seek(posicao)
+                    yield "removido", json.loads(antigo.readline())
@@ -0,0 +1,153 @@
+import re
+import unicodedata
+from collections import Counter
+from datetime import date
+
+from .Lancamentos import Lancamento
+
+_NAO_ALFANUMERICO = re.compile(r'[^0-9A-Z]+')
+
+
+def normalizaDescricao(descricao: str) -> str:
+    """
+    Normaliza uma descrição para comparação: sem acentos, em maiúsculas e só com letras, dígitos e espaços simples.
+
+    Args:
+        descricao (str): Descrição original (ex: `"Pão  de Açúcar - 123"`).
+
+    Returns:
+        str: Descrição normalizada (ex: `"PAO DE ACUCAR 123"`).
+    """
+
+    if not descricao:
+        return ""
+    semAcento = unicodedata.normalize("NFKD", descricao).encode("ascii", "ignore").decode("ascii")
+    return _NAO_ALFANUMERICO.sub(" ", semAcento.upper()).strip()
+
+
+def _campos(item) -> tuple:
+    """ Extrai (conta, cartão, valor, descrição normalizada, data) de um `Lancamento` ou de um JSON_params """
+
+    if isinstance(item, dict):
+        return (item.get("account_id"), item.get("credit_card_id"), item["amount_cents"],
+                normalizaDescricao(item.get("description")), date.fromisoformat(item["date"]).toordinal())
+    return (item.account_id, item.credit_card_id, item.amount_cents,
+            normalizaDescricao(item.description), date.fromisoformat(item.date).toordinal())
+
+
+class IndiceDuplicatas:
+    """
+    Índice de impressões digitais de lançamentos, para evitar o reenvio de transações já existentes.
+
+    A impressão digital é formada por conta/cartão, valor em centavos, descrição normalizada e data.
+    Cada consulta custa no máximo `2 * toleranciaDias + 1` buscas em um hash, independente do tamanho do histórico.
+    """
+
+    def __init__(self, lancamentos: list[Lancamento] = (), toleranciaDias: int = 0):
+        """
+        Args:
+            lancamentos (list[Lancamento], optional): Lançamentos existentes (ex: via `getLancamentos`).
+            toleranciaDias (int, optional): Diferença máxima de dias para considerar duas datas equivalentes
+                                            (útil quando o banco e o Organizze registram datas de compensação distintas).
+                                            Padrão é 0 (datas iguais).
+
+        Raises:
+            ValueError: Se a tolerância for negativa.
+        """
+
+        if toleranciaDias < 0:
+            raise ValueError("A tolerância de dias não pode ser negativa")
+
+        self.toleranciaDias = toleranciaDias
+        self._impressoes: Counter = Counter()
+
+        for l in lancamentos:
+            self.adiciona(l)
+
+    def __len__(self):
+        return sum(self._impressoes.values())
+
+    def __contains__(self, item):
+        return self._localiza(_campos(item)) is not None
+
+    def _localiza(self, campos: tuple, usadas: Counter = None):
+        *base, ordinal = campos
+        base = tuple(base)
+
+        # A data exata tem prioridade; depois os vizinhos mais próximos
+        for deslocamento in range(self.toleranciaDias + 1):
+            for candidato in {ordinal - deslocamento, ordinal + deslocamento}:
+                chave = base + (candidato,)
+                if self._impressoes[chave] - (usadas[chave] if usadas else 0) > 0:
+                    return chave
+        return None
+
+    def adiciona(self, item):
+        """
+        Registra um lançamento (ou JSON_params já enviado) no índice.
+
+        Args:
+            item (Lancamento | dict): Lançamento existente ou parâmetros com `date`, `amount_cents`, `description`
+                                      e `account_id`/`credit_card_id`.
+        """
+
+        self._impressoes[_campos(item)] += 1
+
+    def contem(self, item) -> bool:
+        """
+        Verifica se já existe um lançamento equivalente ao item, dentro da tolerância de datas.
+
+        Args:
+            item (Lancamento | dict): Lançamento ou JSON_params a ser verificado.
+
+        Returns:
+            bool: `True` se houver um lançamento equivalente no índice.
+        """
+
+        return item in self
+
+    def filtraNovos(self, itens) -> tuple[list, list]:
+        """
+        Separa os itens de uma importação entre novos e já existentes.
+
+        Cada lançamento existente "absorve" no máximo um item, de modo que duas compras idênticas no mesmo dia
+        no extrato contra apenas uma no Organizze resultam em um item novo.
+
+        Args:
+            itens (iterable[dict | Lancamento]): Itens a importar (normalmente os JSON_params de `addLancamento`).
+
+        Returns:
+            tuple[list, list]: (novos, duplicados), preservando a ordem original.
+        """
+
+        novos, duplicados = [], []
+        usadas: Counter = Counter()
+
+        for item in itens:
+            (novos if self.filtraNovo(item, usadas) else duplicados).append(item)
+
+        return novos, duplicados
+
+    def filtraNovo(self, item, usadas: Counter) -> bool:
+        """
+        Versão item a item de `filtraNovos`, para importações em streaming: o mesmo `usadas` deve ser passado
+        a todos os itens da importação.
+
+        Args:
+            item (dict | Lancamento): Item a importar.
+            usadas (Counter): Impressões já "absorvidas" nesta importação (comece com um `Counter()` vazio).
+
+        Returns:
+            bool: `True` se o item é novo (e passa a constar no índice), `False` se é duplicado.
+        """
+
+        campos = _campos(item)
+        chave = self._localiza(campos, usadas)
+        if chave is not None:
+            usadas[chave] += 1
+            return False
+
+        # O novo item passa a constar no índice, mas já "absorvido": outro item idêntico da mesma importação também é novo
+        self._impressoes[campos] += 1
+        usadas[campos] += 1
+        return True
@@ -0,0 +1,111 @@
+from dataclasses import fields
+
+import pandas as pd
+
+from .API import API
+from .CartoesCredito import CartaoCredito, getCartoesCredito
+from .Categorias import Categoria, getCategorias
+from .Contas import Conta, getContas
+from .Lancamentos import Lancamento
+
+COLUNAS_ENRIQUECIDAS = ["account_name", "credit_card_name", "oposite_account_name",
+                        "category_name", "parent_category_id", "parent_category_name"]
+
+
+class TabelasReferencia:
+    """
+    Contas, cartões e categorias carregados uma única vez e indexados por id, para enriquecer lançamentos
+    sem nenhuma chamada à API por linha.
+
+    Examples:
+        >>> referencias = TabelasReferencia.carrega(conn)
+        >>> referencias.enriquece(getLancamentos(conn, "2024-06-01", "2024-06-30"))[0]["category_name"]
+        'Mercado'
+    """
+
+    def __init__(self, contas: list[Conta], cartoes: list[CartaoCredito], categorias: list[Categoria]):
+        """
+        Args:
+            contas (list[Conta]): Contas (ex: via `getContas`).
+            cartoes (list[CartaoCredito]): Cartões de crédito (ex: via `getCartoesCredito`).
+            categorias (list[Categoria]): Categorias (ex: via `getCategorias`).
+        """
+
+        self.contas = {c.id: c.name for c in contas}
+        self.cartoes = {c.id: c.name for c in cartoes}
+        self.categorias = {c.id: c.name for c in categorias}
+
+        # Categoria -> categoria raiz (a própria, se não tiver pai), resolvida aqui para não percorrer a cadeia por linha
+        pais = {c.id: c.parent_id for c in categorias}
+        self.raizes = {}
+        for idCategoria in pais:
+            raiz, visitadas = idCategoria, set()
+            while pais.get(raiz) is not None and raiz not in visitadas:
+                visitadas.add(raiz)
+                raiz = pais[raiz]
+            self.raizes[idCategoria] = raiz
+
+    @classmethod
+    def carrega(cls, sessao: API):
+        """
+        Busca as três tabelas de referência (3 chamadas à API, independentemente da quantidade de lançamentos).
+
+        Args:
+            sessao (API): Sessão autenticada para realizar chamadas à API.
+
+        Returns:
+            TabelasReferencia: As tabelas indexadas.
+        """
+
+        return cls(contas=getContas(sessao), cartoes=getCartoesCredito(sessao), categorias=getCategorias(sessao))
+
+    def enriquece(self, lancamentos: list[Lancamento]) -> list[dict]:
+        """
+        Acrescenta os nomes de conta, cartão e categoria (e a categoria pai) a cada lançamento, em uma única passada.
+
+        Args:
+            lancamentos (list[Lancamento]): Lançamentos (ex: via `getLancamentos` ou `iteraLancamentos`).
+
+        Returns:
+            list[dict]: O `to_dict()` de cada lançamento acrescido das chaves de `COLUNAS_ENRIQUECIDAS`.
+                        Ids desconhecidos (ex: conta excluída) resultam em `None`.
+        """
+
+        contas, cartoes, categorias, raizes = self.contas.get, self.cartoes.get, self.categorias.get, self.raizes.get
+
+        results = []
+        for l in lancamentos:
+            registro = l.to_dict()
+            raiz = raizes(l.category_id)
+            registro.update(account_name=contas(l.account_id),
+                            credit_card_name=cartoes(l.credit_card_id),
+                            oposite_account_name=contas(l.oposite_account_id),
+                            category_name=categorias(l.category_id),
+                            parent_category_id=raiz,
+                            parent_category_name=categorias(raiz))
+            results.append(registro)
+        return results
+
+    def enriqueceTabela(self, lancamentos) -> pd.DataFrame:
+        """
+        Versão vetorizada de `enriquece`, para relatórios em pandas.
+
+        Args:
+            lancamentos (list[Lancamento] | pd.DataFrame): Lançamentos (ou DataFrame com as colunas de `Lancamento`).
+
+        Returns:
+            pd.DataFrame: Os lançamentos acrescidos das colunas de `COLUNAS_ENRIQUECIDAS`.
+        """
+
+        if isinstance(lancamentos, pd.DataFrame):
+            tabela = lancamentos.copy()
+        else:
+            tabela = pd.DataFrame([l.to_dict() for l in lancamentos], columns=[f.name for f in fields(Lancamento)])
+
+        tabela["account_name"] = tabela["account_id"].map(self.contas)
+        tabela["credit_card_name"] = tabela["credit_card_id"].map(self.cartoes)
+        tabela["oposite_account_name"] = tabela["oposite_account_id"].map(self.contas)
+        tabela["category_name"] = tabela["category_id"].map(self.categorias)
+        tabela["parent_category_id"] = tabela["category_id"].map(self.raizes).astype("Int64")
+        tabela["parent_category_name"] = tabela["parent_category_id"].map(self.categorias)
+        return tabela
@@ -0,0 +1,248 @@
+import json
+import os
+
+from .API import API
+from .CartoesCredito import getCartoesCredito
+from .FaturasCartao import FaturaCartao, getFaturasCartao
+from .Lancamentos import Lancamento, iteraJanelasLancamentos
+
+FORMATOS = {'parquet': 'parquet', 'arrow': 'ipc'}
+MODOS = ('anexar', 'substituir')
+
+
+def _pyarrow():
+    """ Importa o pyarrow sob demanda, pois é uma dependência opcional """
+
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.fs
+    except ImportError as erro:
+        raise ImportError("A exportação colunar requer o pacote 'pyarrow' (pip install Organizze_Wrapper[parquet])") from erro
+    return pyarrow
+
+
+def esquemaLancamentos():
+    """ Esquema colunar de `Lancamento`, acrescido das colunas de partição `ano` e `mes` """
+
+    pa = _pyarrow()
+    return pa.schema([("id", pa.int64()),
+                      ("description", pa.string()),
+                      ("date", pa.date32()),
+                      ("paid", pa.bool_()),
+                      ("amount_cents", pa.int64()),
+                      ("total_installments", pa.int32()),
+                      ("installment", pa.int32()),
+                      ("recurring", pa.bool_()),
+                      ("account_id", pa.int64()),
+                      ("category_id", pa.int64()),
+                      ("tags", pa.string()),  # JSON
+                      ("notes", pa.string()),
+                      ("attachments_count", pa.int32()),
+                      ("credit_card_id", pa.int64()),
+                      ("credit_card_invoice_id", pa.int64()),
+                      ("paid_credit_card_id", pa.int64()),
+                      ("paid_credit_card_invoice_id", pa.int64()),
+                      ("oposite_transaction_id", pa.int64()),
+                      ("oposite_account_id", pa.int64()),
+                      ("created_at", pa.string()),
+                      ("updated_at", pa.string()),
+                      ("ano", pa.int16()),
+                      ("mes", pa.int8())])
+
+
+def esquemaFaturas():
+    """ Esquema colunar de `FaturaCartao`, acrescido das colunas de partição `ano` e `mes` """
+
+    pa = _pyarrow()
+    return pa.schema([("id", pa.int64()),
+                      ("date", pa.date32()),
+                      ("starting_date", pa.date32()),
+                      ("closing_date", pa.date32()),
+                      ("amount_cents", pa.int64()),
+                      ("payment_amount_cents", pa.int64()),
+                      ("balance_cents", pa.int64()),
+                      ("previous_balance_cents", pa.int64()),
+                      ("credit_card_id", pa.int64()),
+                      ("ano", pa.int16()),
+                      ("mes", pa.int8())])
+
+
+def _sistemaArquivos(destino: str):
+    """ Retorna (sistema de arquivos, caminho) do pyarrow para o destino, aceitando URIs e caminhos locais relativos """
+
+    pa = _pyarrow()
+    try:
+        return pa.fs.FileSystem.from_uri(destino)
+    except (pa.ArrowInvalid, ValueError):
+        return pa.fs.LocalFileSystem(), os.path.abspath(destino)
+
+
+def _gravaParticionado(tabela, destino: str, particoes: list[str], formato: str, modo: str, prefixo: str,
+                       limpas: set = None):
+    """
+    Grava a tabela no dataset particionado. Os arquivos se chamam `<prefixo>-<i>`: regravar com o mesmo prefixo
+    substitui os arquivos anteriores em vez de duplicá-los.
+
+    No modo "substituir", cada partição tocada é apagada uma única vez, antes da sua primeira gravação; `limpas`
+    guarda as já apagadas, para que as chamadas seguintes da mesma exportação não apaguem o que ela acabou de gravar.
+    """
+
+    pa = _pyarrow()
+
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato '{formato}' inválido (utilize um entre {list(FORMATOS)})")
+    if modo not in MODOS:
+        raise ValueError(f"Modo '{modo}' inválido (utilize um entre {list(MODOS)})")
+
+    if modo == "substituir":
+        limpas = set() if limpas is None else limpas
+        sistema, raiz = _sistemaArquivos(destino)
+        for valores in tabela.group_by(particoes).aggregate([]).to_pylist():
+            pasta = "/".join(f'{p}={valores[p]}' for p in particoes)
+            if pasta not in limpas:
+                limpas.add(pasta)
+                caminho = f'{raiz.rstrip("/")}/{pasta}'
+                if sistema.get_file_info(caminho).type == pa.fs.FileType.Directory:
+                    sistema.delete_dir(caminho)
+
+    extensao = 'parquet' if formato == 'parquet' else 'arrow'
+    pa.dataset.write_dataset(tabela,
+                             base_dir=destino,
+                             format=FORMATOS[formato],
+                             partitioning=pa.dataset.partitioning(pa.schema([tabela.schema.field(p) for p in particoes]), flavor="hive"),
+                             basename_template=f'{prefixo}-{{i}}.{extensao}',
+                             existing_data_behavior='overwrite_or_ignore')
+
+
+def lancamentosParaTabela(lancamentos: list[Lancamento]):
+    """
+    Converte uma lista de lançamentos em uma tabela `pyarrow.Table` com o esquema de `esquemaLancamentos`.
+
+    Args:
+        lancamentos (list[Lancamento]): Lançamentos a converter.
+
+    Returns:
+        pyarrow.Table: Tabela colunar dos lançamentos.
+    """
+
+    pa = _pyarrow()
+    colunas = {nome: [] for nome in esquemaLancamentos().names}
+
+    for l in lancamentos:
+        for nome, valor in l.to_dict().items():
+            colunas[nome].append(valor)
+        colunas["ano"].append(int(l.date[0:4]))
+        colunas["mes"].append(int(l.date[5:7]))
+
+    colunas["date"] = pa.array(colunas["date"], pa.string()).cast(pa.date32())
+    colunas["tags"] = [json.dumps(t, ensure_ascii=False) for t in colunas["tags"]]
+    return pa.Table.from_pydict(colunas, schema=esquemaLancamentos())
+
+
+def faturasParaTabela(faturas: list[FaturaCartao]):
+    """
+    Converte uma lista de faturas em uma tabela `pyarrow.Table` com o esquema de `esquemaFaturas`.
+
+    Args:
+        faturas (list[FaturaCartao]): Faturas a converter.
+
+    Returns:
+        pyarrow.Table: Tabela colunar das faturas.
+    """
+
+    pa = _pyarrow()
+    colunas = {nome: [] for nome in esquemaFaturas().names}
+
+    for f in faturas:
+        for nome, valor in f.to_dict().items():
+            colunas[nome].append(valor)
+        colunas["ano"].append(int(f.date[0:4]))
+        colunas["mes"].append(int(f.date[5:7]))
+
+    for nome in ("date", "starting_date", "closing_date"):
+        colunas[nome] = pa.array(colunas[nome], pa.string()).cast(pa.date32())
+    return pa.Table.from_pydict(colunas, schema=esquemaFaturas())
+
+
+def exportaLancamentos(sessao: API, dataInicio: str, dataFim: str, destino: str,
+                       formato: str = "parquet", modo: str = "anexar") -> int:
+    """
+    Exporta os lançamentos de um intervalo para arquivos colunares particionados por `ano`, `mes` e `account_id`.
+
+    A busca e a gravação ocorrem janela a janela (as mesmas de `getLancamentos`), mantendo a memória limitada.
+
+    Args:
+        sessao (API): Sessão autenticada para realizar chamadas à API.
+        dataInicio (str): Data de início do intervalo no formato `YYYY-MM-DD`.
+        dataFim (str): Data de fim do intervalo no formato `YYYY-MM-DD`.
+        destino (str): Diretório raiz do dataset (local ou qualquer caminho aceito pelo pyarrow).
+        formato (str, optional): "parquet" ou "arrow" (IPC/Feather). Padrão é "parquet".
+        modo (str, optional): "anexar" acrescenta arquivos às partições existentes (execuções incrementais);
+                              "substituir" apaga cada partição tocada por esta exportação antes de gravá-la.
+                              Padrão é "anexar".
+
+    Returns:
+        int: Quantidade de lançamentos exportados.
+
+    Raises:
+        ImportError: Se o pacote 'pyarrow' não estiver instalado.
+        ValueError: Se o formato ou o modo forem inválidos.
+
+    Warnings:
+        No modo "anexar", os arquivos são nomeados pelo início de cada janela: reexportar a partir da mesma
+        `dataInicio` sobrescreve os arquivos anteriores, mas um intervalo sobreposto com outro início duplica
+        os lançamentos em comum. Para reprocessar um período, use "substituir".
+    """
+
+    limpas = set()
+    total = 0
+
+    for inicio, fim, lancamentos in iteraJanelasLancamentos(sessao, dataInicio, dataFim):
+        if not lancamentos:
+            continue
+        _gravaParticionado(lancamentosParaTabela(lancamentos), destino, ["ano", "mes", "account_id"],
+                           formato, modo, prefixo=f'lancamentos-{inicio}', limpas=limpas)
+        total += len(lancamentos)
+
+    return total
+
+
+def exportaFaturasCartao(sessao: API, destino: str, idsCartao: list[int] = None,
+                         formato: str = "parquet", modo: str = "anexar") -> int:
+    """
+    Exporta as faturas dos cartões para arquivos colunares particionados por `ano`, `mes` e `credit_card_id`.
+
+    Cada cartão é buscado e gravado separadamente, mantendo a memória limitada.
+
+    Args:
+        sessao (API): Sessão autenticada para realizar chamadas à API.
+        destino (str): Diretório raiz do dataset.
+        idsCartao (list[int], optional): Cartões a exportar. Se não informado, exporta todos os cartões da conta.
+        formato (str, optional): "parquet" ou "arrow" (IPC/Feather). Padrão é "parquet".
+        modo (str, optional): "anexar" ou "substituir", como em `exportaLancamentos`. Padrão é "anexar".
+                              Os arquivos são nomeados pelo cartão, então reexportar sobrescreve em vez de duplicar.
+
+    Returns:
+        int: Quantidade de faturas exportadas.
+
+    Raises:
+        ImportError: Se o pacote 'pyarrow' não estiver instalado.
+        ValueError: Se o formato ou o modo forem inválidos.
+    """
+
+    if idsCartao is None:
+        idsCartao = [c.id for c in getCartoesCredito(sessao)]
+
+    limpas = set()
+    total = 0
+
+    for idCartao in idsCartao:
+        faturas = getFaturasCartao(sessao, idCartao)
+        if not faturas:
+            continue
+        _gravaParticionado(faturasParaTabela(faturas), destino, ["ano", "mes", "credit_card_id"],
+                           formato, modo, prefixo=f'faturas-{idCartao}', limpas=limpas)
+        total += len(faturas)
+
+    return total
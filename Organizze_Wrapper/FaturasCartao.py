@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 
 from .API import API
+from .Perfil import fase
+from .Visoes import visaoDe
 
 @dataclass
 class FaturaCartao:
@@ -54,32 +56,42 @@ class FaturaCartao:
         """ Útil para chamadas excepcionais. Ex: json.dumps(default=Classe.json)"""
         return obj.to_dict()
 
+FaturaCartaoVisao = visaoDe(FaturaCartao)
 
-def getFaturasCartao(sessao: API, idCartao: int) -> list[FaturaCartao]:
+
+def getFaturasCartao(sessao: API, idCartao: int, visoes: bool = False) -> list[FaturaCartao] | list[FaturaCartaoVisao]:
     """
     Obtém a lista de faturas de um cartão de crédito específico da plataforma Organizze.
 
     Args:
         sessao (API): Sessão autenticada para realizar chamadas à API.
         idCartao (int): Identificador único do cartão de crédito para o qual as faturas serão buscadas.
+        visoes (bool, optional): Se `True`, retorna visões leves (`FaturaCartaoVisao`) sobre a resposta, sem construir
+                                 os objetos nem alimentar o cache (ver `Visoes`). Padrão é `False`.
 
     Returns:
-        list[FaturaCartao]: Uma lista de objetos `FaturaCartao` contendo as faturas obtidas.
+        list[FaturaCartao] | list[FaturaCartaoVisao]: Uma lista de objetos `FaturaCartao` contendo as faturas obtidas
+                                                      (ou de `FaturaCartaoVisao`, se `visoes=True`).
     """
 
     results = []
     response = sessao._get(f'/credit_cards/{idCartao}/invoices')
-    for i in response:
-        results.append(FaturaCartao(amount_cents=i['amount_cents'],
-                                    balance_cents=i['balance_cents'],
-                                    closing_date=i['closing_date'],
-                                    credit_card_id=i['credit_card_id'],
-                                    date=i['date'],
-                                    id=i['id'],
-                                    payment_amount_cents=i['payment_amount_cents'],
-                                    previous_balance_cents=i['previous_balance_cents'],
-                                    starting_date=i['starting_date']
-                                    ))
+    if visoes:
+        with fase("build", "/credit_cards/{id}/invoices", sessao):
+            return list(map(FaturaCartaoVisao, response))
+    with fase("build", "/credit_cards/{id}/invoices", sessao):
+        for i in response:
+            results.append(FaturaCartao(amount_cents=i['amount_cents'],
+                                        balance_cents=i['balance_cents'],
+                                        closing_date=i['closing_date'],
+                                        credit_card_id=i['credit_card_id'],
+                                        date=i['date'],
+                                        id=i['id'],
+                                        payment_amount_cents=i['payment_amount_cents'],
+                                        previous_balance_cents=i['previous_balance_cents'],
+                                        starting_date=i['starting_date']
+                                        ))
+    sessao.cache.guardaVarios(results)
     return results
 
 def getFaturaCartao(sessao: API, idCartao: int, idFatura: int) -> FaturaCartao:
@@ -95,16 +107,23 @@ def getFaturaCartao(sessao: API, idCartao: int, idFatura: int) -> FaturaCartao:
         FaturaCartao: Um objeto `FaturaCartao` contendo os dados da fatura.
     """
 
+    fatura = sessao.cache.obtem(FaturaCartao, idFatura)
+    if fatura is not None:
+        return fatura
+
     response = sessao._get(f'/credit_cards/{idCartao}/invoices/{idFatura}')
-    return FaturaCartao(amount_cents=response['amount_cents'],
-                        balance_cents=response['balance_cents'],
-                        closing_date=response['closing_date'],
-                        credit_card_id=response['credit_card_id'],
-                        date=response['date'],
-                        id=response['id'],
-                        payment_amount_cents=response['payment_amount_cents'],
-                        previous_balance_cents=response['previous_balance_cents'],
-                        starting_date=response['starting_date'])
+    with fase("build", "/credit_cards/{id}/invoices/{id}", sessao):
+        fatura = FaturaCartao(amount_cents=response['amount_cents'],
+                              balance_cents=response['balance_cents'],
+                              closing_date=response['closing_date'],
+                              credit_card_id=response['credit_card_id'],
+                              date=response['date'],
+                              id=response['id'],
+                              payment_amount_cents=response['payment_amount_cents'],
+                              previous_balance_cents=response['previous_balance_cents'],
+                              starting_date=response['starting_date'])
+    sessao.cache.guarda(fatura)
+    return fatura
 
 def getPagamentosFatura(sessao: API, idCartao: int, idFatura: int):
     """
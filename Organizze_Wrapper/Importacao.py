@@ -0,0 +1,572 @@
+"""
+Importação de extratos bancários (CSV ou OFX) em streaming.
+
+O arquivo é lido linha a linha, cada linha vira um JSON_params validado localmente e os lançamentos são
+enviados com concorrência limitada: quando há `pendentesMaximos` envios em andamento, a leitura espera.
+A memória usada não depende do tamanho do extrato (exceto pelo índice de duplicatas, com uma impressão por
+lançamento); ao final, um `RelatorioImportacao` resume o que aconteceu.
+"""
+
+import codecs
+import csv
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from calendar import monthrange
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from .API import API
+from .CartoesCredito import getCartoesCredito
+from .Categorias import getCategorias
+from .Contas import getContas
+from .Duplicatas import IndiceDuplicatas, normalizaDescricao
+from .Lancamentos import addLancamento, getLancamentos
+from .Outbox import OutboxLancamentos
+from .Sugestoes import SugestorCategorias
+from .Validacao import errosPayload
+
+# LEITURA
+
+_TAG_OFX = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<]*)')
+
+
+def leCSV(caminho: str, encoding: str = 'utf-8-sig', separador: str = None):
+    """
+    Lê um extrato CSV sob demanda, uma linha por vez.
+
+    Args:
+        caminho (str): Arquivo CSV, com uma linha de cabeçalho.
+        encoding (str, optional): Codificação do arquivo. Padrão é 'utf-8-sig' (UTF-8, com ou sem BOM).
+        separador (str, optional): Separador de colunas. Padrão é `None` (detectado entre ";", ",", tab e "|").
+
+    Yields:
+        dict: {coluna do cabeçalho: texto da célula}, para cada linha do arquivo.
+    """
+
+    with open(caminho, 'r', encoding=encoding, newline='') as arquivo:
+        if separador is None:
+            amostra = arquivo.read(8192)
+            arquivo.seek(0)
+            try:
+                separador = csv.Sniffer().sniff(amostra, delimiters=";,\t|").delimiter
+            except csv.Error:
+                separador = ";"
+        yield from csv.DictReader(arquivo, delimiter=separador)
+
+
+def _encodingOFX(cabecalho: bytes) -> str:
+    """ Codificação declarada no cabeçalho OFX (SGML "CHARSET:1252" ou XML encoding="...") """
+
+    declarada = re.search(rb'ENCODING\s*[:=]\s*"?([A-Za-z0-9_-]+)', cabecalho, re.IGNORECASE)
+    charset = re.search(rb'CHARSET\s*:\s*([A-Za-z0-9_-]+)', cabecalho, re.IGNORECASE)
+    if charset and charset.group(1).isdigit():
+        return f"cp{charset.group(1).decode()}"
+    if declarada and declarada.group(1).upper() not in (b"USASCII", b"NONE"):
+        try:
+            return codecs.lookup(declarada.group(1).decode()).name
+        except LookupError:
+            pass
+    return 'latin-1'
+
+
+def leOFX(caminho: str, encoding: str = None):
+    """
+    Lê as transações (`<STMTTRN>`) de um extrato OFX/QFX sob demanda, em SGML (OFX 1.x) ou XML (OFX 2.x).
+
+    Args:
+        caminho (str): Arquivo OFX.
+        encoding (str, optional): Codificação do arquivo. Padrão é `None` (a declarada no cabeçalho).
+
+    Yields:
+        dict: {"data": "YYYY-MM-DD", "valor": "-12.50", "descricao", "memo", "id" (FITID), "tipo" (TRNTYPE),
+               "conta" (ACCTID do extrato)}, para cada transação.
+    """
+
+    with open(caminho, 'rb') as arquivo:
+        cabecalho = arquivo.read(1024)
+        arquivo.seek(0)
+
+        conta, transacao = None, None
+        for fecha, tag, valor in _tagsOFX(arquivo, encoding or _encodingOFX(cabecalho)):
+            tag, valor = tag.upper(), valor.strip()
+            if tag in ("STMTTRN", "BANKTRANLIST"):
+                # SGML não exige fechar as tags: uma nova transação (ou o fim da lista) encerra a anterior
+                if transacao is not None:
+                    yield _transacaoOFX(transacao, conta)
+                transacao = {} if tag == "STMTTRN" and not fecha else None
+            elif tag == "ACCTID" and not fecha and transacao is None:
+                # Dentro de uma transação, ACCTID é da conta de destino (BANKACCTTO/CCACCTTO), não a do extrato
+                conta = valor
+            elif transacao is not None and not fecha and valor:
+                transacao[tag] = valor
+
+        if transacao is not None:
+            yield _transacaoOFX(transacao, conta)
+
+
+def _tagsOFX(arquivo, encoding: str):
+    """ Tags (fechamento, nome, texto seguinte) do arquivo, lido em blocos """
+
+    decodificador = codecs.getincrementaldecoder(encoding)(errors='replace')
+    resto = ""
+    for bloco in iter(lambda: arquivo.read(64 * 1024), b""):
+        texto = resto + decodificador.decode(bloco)
+        # A última tag pode estar incompleta (ou seu texto, ainda chegando): fica para o próximo bloco
+        corte = texto.rfind("<")
+        if corte == -1:
+            resto = texto
+            continue
+        texto, resto = texto[:corte], texto[corte:]
+        yield from _TAG_OFX.findall(texto)
+    yield from _TAG_OFX.findall(resto + decodificador.decode(b"", final=True))
+
+
+def _transacaoOFX(campos: dict, conta: str) -> dict:
+    data = campos.get("DTPOSTED", "")[:8]
+    valor = campos.get("TRNAMT", "")
+    if "," in valor and "." not in valor:
+        valor = valor.replace(",", ".")
+    return {"data": f"{data[:4]}-{data[4:6]}-{data[6:8]}" if len(data) == 8 else data,
+            "valor": valor,
+            "descricao": campos.get("NAME") or campos.get("MEMO") or "",
+            "memo": campos.get("MEMO"),
+            "id": campos.get("FITID"),
+            "tipo": campos.get("TRNTYPE"),
+            "conta": conta}
+
+
+# MAPEAMENTO
+
+@dataclass
+class MapeamentoColunas:
+    """
+    Como as colunas de uma linha do extrato viram um JSON_params de `addLancamento`.
+
+    Attributes:
+        data (str): Coluna com a data do lançamento.
+        valor (str): Coluna com o valor, em reais (ex: "-1.234,56").
+        descricao (str): Coluna com a descrição.
+        formatoData (str): Formato da data, para `datetime.strptime`. Datas em "YYYY-MM-DD" são sempre aceitas.
+        separadorDecimal (str): Separador decimal do valor ("," ou "."); o outro é tratado como separador de milhar.
+        inverteSinal (bool): Se `True`, o sinal do valor é invertido (ex: faturas de cartão com compras positivas).
+        conta (str): Coluna com a conta ou cartão de cada linha (nome no Organizze, id ou apelido), se houver.
+        categoria (str): Coluna com o nome ou id da categoria, se houver.
+        notas (str): Coluna copiada para as notas do lançamento, se houver.
+        chave (str): Coluna com o identificador da transação no banco, se houver (usada nos relatórios e no outbox).
+    """
+
+    data: str = "data"
+    valor: str = "valor"
+    descricao: str = "descricao"
+    formatoData: str = "%d/%m/%Y"
+    separadorDecimal: str = ","
+    inverteSinal: bool = False
+    conta: str = None
+    categoria: str = None
+    notas: str = None
+    chave: str = None
+
+
+# Mapeamento das linhas produzidas por `leOFX`
+MAPEAMENTO_OFX = MapeamentoColunas(formatoData="%Y-%m-%d", separadorDecimal=".", conta="conta", notas="memo", chave="id")
+
+
+def _data(valor: str, formato: str) -> str:
+    texto = (valor or "").strip()
+    try:
+        return date.fromisoformat(texto).isoformat()
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(texto, formato).date().isoformat()
+    except ValueError:
+        raise ValueError(f"data inválida: '{texto}' (formato esperado: {formato})")
+
+
+def _centavos(valor, separadorDecimal: str) -> int:
+    if isinstance(valor, (int, float, Decimal)):
+        numero = Decimal(str(valor))
+    else:
+        texto = (valor or "").strip().replace("R$", "").replace(" ", "").replace("\xa0", "")
+        negativo = texto.startswith("(") and texto.endswith(")")
+        texto = texto.strip("()")
+        milhar = "." if separadorDecimal == "," else ","
+        try:
+            numero = Decimal(texto.replace(milhar, "").replace(separadorDecimal, "."))
+        except InvalidOperation:
+            raise ValueError(f"valor inválido: '{valor}'")
+        if negativo:
+            numero = -numero
+    if not numero.is_finite():
+        raise ValueError(f"valor inválido: '{valor}'")
+    return int((numero * 100).to_integral_value(ROUND_HALF_UP))
+
+
+class _Referencias:
+    """ Nomes de contas, cartões e categorias do Organizze, carregados uma única vez sob demanda """
+
+    def __init__(self, sessao: API, apelidos: dict):
+        self.sessao = sessao
+        self.apelidos = {str(k): v for k, v in (apelidos or {}).items()}
+        self._contas = None
+        self._categorias = None
+
+    def conta(self, valor) -> tuple[str, int]:
+        """ (campo do JSON_params, id) da conta ou cartão correspondente ao valor """
+
+        valor = self.apelidos.get(str(valor).strip(), valor)
+        if self._contas is None:
+            self._contas = {}
+            for c in getContas(self.sessao):
+                self._contas[normalizaDescricao(c.name)] = ("account_id", c.id)
+                self._contas[str(c.id)] = ("account_id", c.id)
+            for c in getCartoesCredito(self.sessao):
+                self._contas[normalizaDescricao(c.name)] = ("credit_card_id", c.id)
+                self._contas[str(c.id)] = ("credit_card_id", c.id)
+
+        encontrada = self._contas.get(str(valor).strip()) or self._contas.get(normalizaDescricao(str(valor)))
+        if encontrada is None:
+            raise ValueError(f"conta ou cartão não encontrado: '{valor}'")
+        return encontrada
+
+    def categoria(self, valor) -> int:
+        if self._categorias is None:
+            self._categorias = {}
+            for c in getCategorias(self.sessao):
+                self._categorias[normalizaDescricao(c.name)] = c.id
+                self._categorias[str(c.id)] = c.id
+
+        texto = str(valor).strip()
+        encontrada = self._categorias.get(texto) or self._categorias.get(normalizaDescricao(texto))
+        if encontrada is None:
+            raise ValueError(f"categoria não encontrada: '{valor}'")
+        return encontrada
+
+
+# RELATÓRIO
+
+@dataclass
+class ErroImportacao:
+    """
+    Linha do extrato que não foi importada.
+
+    Attributes:
+        linha (int): Número da linha de dados (a primeira é 1).
+        tipo (str): "invalida" (não passou no mapeamento ou na validação) ou "falha" (o envio não foi concluído).
+        mensagem (str): Descrição do problema.
+        chave (str): Identificador da transação no banco, se mapeado.
+    """
+
+    linha: int
+    tipo: str
+    mensagem: str
+    chave: str = None
+
+    def to_dict(self):
+        """ Retorna uma representação em JSON de um Erro de Importação """
+        return {"linha": self.linha, "tipo": self.tipo, "mensagem": self.mensagem, "chave": self.chave}
+
+
+@dataclass
+class RelatorioImportacao:
+    """
+    Progresso e resultado de uma importação.
+
+    Attributes:
+        lidas (int): Linhas lidas do extrato.
+        enviadas (int): Lançamentos criados no Organizze.
+        enfileiradas (int): Lançamentos gravados no outbox (quando a importação usa um `OutboxLancamentos`).
+        duplicadas (int): Linhas ignoradas por já existirem no Organizze (ou no próprio extrato).
+        invalidas (int): Linhas recusadas no mapeamento ou na validação local.
+        falhas (int): Envios recusados pela API ou interrompidos por outro erro.
+        erros (list[ErroImportacao]): Detalhes das linhas invalidas e falhas (limitado a `maxErros`).
+        duracao (float): Segundos decorridos desde o início da importação.
+    """
+
+    lidas: int = 0
+    enviadas: int = 0
+    enfileiradas: int = 0
+    duplicadas: int = 0
+    invalidas: int = 0
+    falhas: int = 0
+    erros: list[ErroImportacao] = field(default_factory=list)
+    duracao: float = 0.0
+
+    def resumo(self) -> str:
+        """ Uma linha com os totais, para log """
+        return (f"{self.lidas} linhas lidas: {self.enviadas} enviadas, {self.enfileiradas} enfileiradas, "
+                f"{self.duplicadas} duplicadas, {self.invalidas} inválidas, {self.falhas} falhas "
+                f"({self.duracao:.1f}s)")
+
+    def to_dict(self):
+        """ Retorna uma representação em JSON de um Relatório de Importação """
+        return {"lidas": self.lidas, "enviadas": self.enviadas, "enfileiradas": self.enfileiradas,
+                "duplicadas": self.duplicadas, "invalidas": self.invalidas, "falhas": self.falhas,
+                "erros": [e.to_dict() for e in self.erros], "duracao": self.duracao}
+
+    def json(self):
+        """ Retorna o relatório serializado em JSON """
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+
+# IMPORTAÇÃO
+
+class ImportadorExtrato:
+    """
+    Pipeline de importação: mapeia cada linha, valida, descarta duplicatas e envia com concorrência limitada.
+
+    A conta (ou cartão) de cada lançamento vem de `conta`/`cartao` ou, se não informados, da coluna
+    `mapeamento.conta`; a categoria, da coluna `mapeamento.categoria` ou, na falta dela, da sugestão do `sugestor`.
+
+    Examples:
+        >>> importador = ImportadorExtrato(conn, conta="Nubank", sugestor=SugestorCategorias(historico))
+        >>> relatorio = importador.importa(leCSV("extrato.csv"), progresso=lambda r: print(r.resumo()))
+        >>> relatorio.erros[:3]
+    """
+
+    def __init__(self, sessao: API, mapeamento: MapeamentoColunas = None, conta=None, cartao=None,
+                 apelidos: dict = None, sugestor: SugestorCategorias = None, confiancaMinima: float = 0.6,
+                 duplicatas=True, toleranciaDias: int = 0, concorrencia: int = 4, pendentesMaximos: int = None,
+                 outbox: OutboxLancamentos = None, pago: bool = True, maxErros: int = 1000):
+        """
+        Args:
+            sessao (API): Sessão autenticada para realizar chamadas à API.
+            mapeamento (MapeamentoColunas, optional): Colunas do extrato. Padrão é `MapeamentoColunas()`.
+            conta (int | str, optional): Id ou nome da conta de todos os lançamentos.
+            cartao (int | str, optional): Id ou nome do cartão de crédito de todos os lançamentos.
+            apelidos (dict, optional): Valores da coluna `mapeamento.conta` (ex: número da conta no banco) para
+                                       o nome ou id da conta/cartão no Organizze.
+            sugestor (SugestorCategorias, optional): Sugere a categoria das linhas sem categoria.
+            confiancaMinima (float, optional): Confiança mínima para aceitar a sugestão de categoria. Padrão é 0.6.
+            duplicatas (bool | IndiceDuplicatas, optional): `True` consulta os lançamentos existentes mês a mês,
+                                                            conforme as datas aparecem no extrato; um `IndiceDuplicatas`
+                                                            já carregado é usado como está; `False` não verifica.
+                                                            Padrão é `True`.
+            toleranciaDias (int, optional): Tolerância de datas da verificação de duplicatas. Padrão é 0.
+            concorrencia (int, optional): Máximo de envios simultâneos. Padrão é 4.
+            pendentesMaximos (int, optional): Máximo de lançamentos lidos e ainda não enviados; ao atingi-lo,
+                                              a leitura espera. Padrão é `2 * concorrencia`.
+            outbox (OutboxLancamentos, optional): Se informado, os lançamentos são gravados no outbox em vez de
+                                                  enviados diretamente (ver `Outbox`).
+            pago (bool, optional): Valor de `paid` dos lançamentos. Padrão é `True`.
+            maxErros (int, optional): Máximo de erros detalhados no relatório (os totais são sempre exatos). Padrão é 1000.
+
+        Raises:
+            ValueError: Se `conta` e `cartao` forem informados juntos, ou a tolerância de dias for negativa.
+        """
+
+        if conta is not None and cartao is not None:
+            raise ValueError("Informe apenas 'conta' ou 'cartao', não ambos")
+
+        self.sessao = sessao
+        self.mapeamento = mapeamento or MapeamentoColunas()
+        self.sugestor = sugestor
+        self.confiancaMinima = confiancaMinima
+        self.concorrencia = concorrencia
+        self.pendentesMaximos = pendentesMaximos or 2 * concorrencia
+        self.outbox = outbox
+        self.pago = pago
+        self.maxErros = maxErros
+
+        self._referencias = _Referencias(sessao, apelidos)
+        self._conta = None
+        if conta is not None:
+            self._conta = ("account_id", conta) if isinstance(conta, int) else self._referencias.conta(conta)
+        elif cartao is not None:
+            self._conta = ("credit_card_id", cartao) if isinstance(cartao, int) else self._referencias.conta(cartao)
+
+        if isinstance(duplicatas, IndiceDuplicatas):
+            self._duplicatas, self._carregaMeses = duplicatas, False
+        elif duplicatas:
+            self._duplicatas, self._carregaMeses = IndiceDuplicatas(toleranciaDias=toleranciaDias), True
+        else:
+            self._duplicatas, self._carregaMeses = None, False
+        self._mesesCarregados: set[tuple[int, int]] = set()
+        self._usadas: Counter = Counter()
+
+    def mapeia(self, linha: dict) -> dict:
+        """
+        Converte uma linha do extrato no JSON_params de `addLancamento` (ainda sem validação).
+
+        Args:
+            linha (dict): Linha do extrato (ex: via `leCSV` ou `leOFX`).
+
+        Returns:
+            dict: JSON_params do lançamento.
+
+        Raises:
+            ValueError: Se a data, o valor, a conta ou a categoria não puderem ser interpretados.
+        """
+
+        m = self.mapeamento
+        centavos = _centavos(linha.get(m.valor), m.separadorDecimal)
+        payload = {"description": (linha.get(m.descricao) or "").strip(),
+                   "date": _data(linha.get(m.data), m.formatoData),
+                   "amount_cents": -centavos if m.inverteSinal else centavos,
+                   "paid": self.pago}
+
+        if self._conta is not None:
+            campo, idConta = self._conta
+        elif m.conta and linha.get(m.conta):
+            campo, idConta = self._referencias.conta(linha[m.conta])
+        else:
+            raise ValueError("conta não informada (use 'conta', 'cartao' ou a coluna 'mapeamento.conta')")
+        payload[campo] = idConta
+
+        if m.categoria and linha.get(m.categoria):
+            payload["category_id"] = self._referencias.categoria(linha[m.categoria])
+        elif self.sugestor is not None:
+            sugestoes = self.sugestor.sugere(payload["description"], conta=idConta, limite=1)
+            if sugestoes and sugestoes[0][1] >= self.confiancaMinima:
+                payload["category_id"] = sugestoes[0][0]
+
+        if m.notas and linha.get(m.notas) and linha[m.notas].strip() != payload["description"]:
+            payload["notes"] = linha[m.notas].strip()
+        return payload
+
+    def _carregaDuplicatas(self, data: str):
+        """ Carrega no índice os lançamentos existentes dos meses que a data (com a tolerância) alcança """
+
+        dia = date.fromisoformat(data)
+        tolerancia = timedelta(days=self._duplicatas.toleranciaDias)
+        for referencia in (dia - tolerancia, dia + tolerancia):
+            mes = (referencia.year, referencia.month)
+            if mes in self._mesesCarregados:
+                continue
+            ultimoDia = monthrange(*mes)[1]
+            for lancamento in getLancamentos(self.sessao, f"{mes[0]}-{mes[1]:02d}-01", f"{mes[0]}-{mes[1]:02d}-{ultimoDia}"):
+                self._duplicatas.adiciona(lancamento)
+            self._mesesCarregados.add(mes)
+
+    def importa(self, linhas, simulacao: bool = False, progresso=None, intervaloProgresso: int = 500) -> RelatorioImportacao:
+        """
+        Importa as linhas de um extrato, consumindo-as sob demanda.
+
+        Args:
+            linhas (Iterable[dict]): Linhas do extrato (ex: `leCSV(...)` ou `leOFX(...)`).
+            simulacao (bool, optional): Se `True`, nada é enviado: o relatório conta como enviadas as linhas que
+                                        seriam enviadas. Padrão é `False`.
+            progresso (Callable[[RelatorioImportacao], None], optional): Chamada a cada `intervaloProgresso` linhas
+                                                                         e ao final.
+            intervaloProgresso (int, optional): Linhas entre chamadas de `progresso`. Padrão é 500.
+
+        Returns:
+            RelatorioImportacao: Totais e erros da importação.
+        """
+
+        relatorio = RelatorioImportacao()
+        inicio = time.monotonic()
+        trava = threading.Lock()
+        vagas = threading.BoundedSemaphore(self.pendentesMaximos)
+        ocorrencias = Counter()
+
+        def registraErro(n: int, tipo: str, mensagem: str, chave: str):
+            if tipo == "falha":
+                relatorio.falhas += 1
+            else:
+                relatorio.invalidas += 1
+            if len(relatorio.erros) < self.maxErros:
+                relatorio.erros.append(ErroImportacao(linha=n, tipo=tipo, mensagem=mensagem, chave=chave))
+
+        def envia(n: int, chave: str, payload: dict):
+            try:
+                addLancamento(self.sessao, payload)
+            except Exception as erro:
+                # Qualquer erro do envio (não só HTTPError) é uma falha da linha: os totais sempre somam `lidas`
+                with trava:
+                    registraErro(n, "falha", str(erro), chave)
+            else:
+                with trava:
+                    relatorio.enviadas += 1
+            finally:
+                vagas.release()
+
+        with ThreadPoolExecutor(max_workers=self.concorrencia) as executor:
+            for n, linha in enumerate(linhas, start=1):
+                chave = linha.get(self.mapeamento.chave) if self.mapeamento.chave else None
+                with trava:
+                    relatorio.lidas += 1
+
+                try:
+                    payload = self.mapeia(linha)
+                    erros = errosPayload("lancamento", payload)
+                    if erros:
+                        raise ValueError("; ".join(erros))
+                except ValueError as erro:
+                    with trava:
+                        registraErro(n, "invalida", str(erro), chave)
+                    continue
+
+                if self._duplicatas is not None:
+                    if self._carregaMeses:
+                        self._carregaDuplicatas(payload["date"])
+                    if not self._duplicatas.filtraNovo(payload, self._usadas):
+                        with trava:
+                            relatorio.duplicadas += 1
+                        continue
+
+                if simulacao:
+                    with trava:
+                        relatorio.enviadas += 1
+                elif self.outbox is not None:
+                    # A chave de idempotência depende só do conteúdo e de quantas linhas iguais vieram antes (não da
+                    # posição no arquivo): reimportar o mesmo extrato, ou um que o contenha, não duplica
+                    resumo = hashlib.blake2b(f"{chave}:{sorted(payload.items())}".encode(), digest_size=12).hexdigest()
+                    ocorrencias[resumo] += 1
+                    self.outbox.addLancamento(payload, chave=f"importacao-{resumo}-{ocorrencias[resumo]}")
+                    with trava:
+                        relatorio.enfileiradas += 1
+                else:
+                    # Contrapressão: com `pendentesMaximos` envios em aberto, a leitura espera uma vaga
+                    vagas.acquire()
+                    executor.submit(envia, n, chave, payload)
+
+                if progresso is not None and n % intervaloProgresso == 0:
+                    with trava:
+                        relatorio.duracao = time.monotonic() - inicio
+                    progresso(relatorio)
+
+        relatorio.duracao = time.monotonic() - inicio
+        if progresso is not None:
+            progresso(relatorio)
+        return relatorio
+
+
+def importaExtrato(sessao: API, caminho: str, mapeamento: MapeamentoColunas = None, encoding: str = None,
+                   simulacao: bool = False, progresso=None, **opcoes) -> RelatorioImportacao:
+    """
+    Importa um arquivo de extrato (OFX/QFX ou CSV, pela extensão) para o Organizze.
+
+    Args:
+        sessao (API): Sessão autenticada para realizar chamadas à API.
+        caminho (str): Arquivo do extrato.
+        mapeamento (MapeamentoColunas, optional): Colunas do extrato. Padrão é `MAPEAMENTO_OFX` para OFX e
+                                                  `MapeamentoColunas()` para CSV.
+        encoding (str, optional): Codificação do arquivo. Padrão é `None` (a padrão de `leCSV`/`leOFX`).
+        simulacao (bool, optional): Ver `ImportadorExtrato.importa`. Padrão é `False`.
+        progresso (Callable[[RelatorioImportacao], None], optional): Ver `ImportadorExtrato.importa`.
+        **opcoes: Demais argumentos de `ImportadorExtrato` (ex: `conta`, `cartao`, `sugestor`, `concorrencia`).
+
+    Returns:
+        RelatorioImportacao: Totais e erros da importação.
+
+    Examples:
+        >>> relatorio = importaExtrato(conn, "extrato.ofx", conta="Conta Corrente", toleranciaDias=2)
+        >>> print(relatorio.resumo())
+    """
+
+    ofx = os.path.splitext(caminho)[1].lower() in (".ofx", ".qfx")
+    if ofx:
+        linhas = leOFX(caminho, encoding=encoding)
+    else:
+        linhas = leCSV(caminho, encoding=encoding) if encoding else leCSV(caminho)
+
+    importador = ImportadorExtrato(sessao, mapeamento or (MAPEAMENTO_OFX if ofx else MapeamentoColunas()), **opcoes)
+    return importador.importa(linhas, simulacao=simulacao, progresso=progresso)
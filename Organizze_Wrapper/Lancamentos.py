@@ -3,6 +3,15 @@ from dataclasses import dataclass
 from PyMultiHelper.Validation import validateDateFormat, matchesRegex
 from PyMultiHelper.Dates import dateRanges
 from .API import API
+from .FaturasCartao import FaturaCartao
+from .Perfil import fase
+from .Validacao import limpaPayload, validaPayload
+from .Visoes import visaoDe
+
+# OPÇÕES DE PERIODICIDADE: ["weekly", "biweekly", "monthly",  "bimonthly", "trimonthly", "yearly"]
+# Cadê DAILY e SEMESTRAL (or SEMESTRIAL)
+PERIODICIDADES = {'diário': 'daily', 'semanal': 'weekly', 'bissemanal': 'biweekly', 'mensal': 'monthly',
+                  'bimestral': 'bimonthly', 'trimestral': 'trimonthly', 'semestral': 'semesterly', 'anual': 'yearly'}
 
 @dataclass
 class Lancamento:
@@ -92,9 +101,47 @@ class Lancamento:
         """ Útil para chamadas excepcionais. Ex: json.dumps(default=Classe.json)"""
         return obj.to_dict()
 
+LancamentoVisao = visaoDe(Lancamento)
+
+def _invalidaCache(sessao: API, idLancamento: int = None, recorrencia: bool = False):
+    """
+    Invalida o cache após uma escrita: o próprio lançamento (ou todos, se a escrita atingiu outras ocorrências
+    da recorrência) e as faturas, cujos totais podem ter mudado.
+    """
+
+    if recorrencia:
+        sessao.cache.invalida(Lancamento)
+    elif idLancamento is not None:
+        sessao.cache.invalida(Lancamento, idLancamento)
+    sessao.cache.invalida(FaturaCartao)
+
+def _lancamentoDeJSON(i: dict) -> Lancamento:
+    """ Constrói um `Lancamento` a partir de um item de `/transactions` """
+    return Lancamento(id=i['id'],
+                      description=i['description'],
+                      date=i['date'],
+                      paid=i['paid'],
+                      amount_cents=i['amount_cents'],
+                      total_installments=i['total_installments'],
+                      installment=i['installment'],
+                      recurring=i['recurring'],
+                      account_id=i['account_id'],
+                      category_id=i['category_id'],
+                      tags=i['tags'],
+                      notes=i['notes'],
+                      attachments_count=i['attachments_count'],
+                      credit_card_id=i['credit_card_id'],
+                      credit_card_invoice_id=i['credit_card_invoice_id'],
+                      paid_credit_card_id=i['paid_credit_card_id'],
+                      paid_credit_card_invoice_id=i['paid_credit_card_invoice_id'],
+                      oposite_transaction_id=i['oposite_transaction_id'],
+                      oposite_account_id=i['oposite_account_id'],
+                      created_at=i['created_at'],
+                      updated_at=i['updated_at'])
+
 # OPERAÇÕES BÁSICAS
 
-def getLancamentos(sessao: API, dataInicio: str, dataFim: str) -> list[Lancamento]:
+def getLancamentos(sessao: API, dataInicio: str, dataFim: str, visoes: bool = False) -> list[Lancamento] | list[LancamentoVisao]:
     """
     Obtém os lançamentos financeiros em um intervalo de datas da plataforma Organizze.
 
@@ -102,16 +149,42 @@ def getLancamentos(sessao: API, dataInicio: str, dataFim: str) -> list[Lancament
         sessao (API): Sessão autenticada para realizar chamadas à API.
         dataInicio (str): Data de início do intervalo de busca no formato `YYYY-MM-DD`.
         dataFim (str): Data de fim do intervalo de busca no formato `YYYY-MM-DD`.
+        visoes (bool, optional): Se `True`, retorna visões leves (`LancamentoVisao`) sobre a resposta, sem construir
+                                 os objetos nem alimentar o cache (ver `Visoes`). Padrão é `False`.
 
     Returns:
-        list[Lancamento]: Lista de objetos `Lancamento` com os dados dos lançamentos encontrados.
+        list[Lancamento] | list[LancamentoVisao]: Lista de objetos `Lancamento` com os dados dos lançamentos encontrados
+                                                  (ou de `LancamentoVisao`, se `visoes=True`).
+
+    Examples:
+        >>> saldo = sum(l.amount_cents for l in getLancamentos(conn, "2020-01-01", "2024-12-31", visoes=True))
+    """
+
+    results: list[Lancamento] = []
+    for _, _, lancamentos in iteraJanelasLancamentos(sessao, dataInicio, dataFim, visoes=visoes):
+        results.extend(lancamentos)
+    return results
+
+def iteraJanelasLancamentos(sessao: API, dataInicio: str, dataFim: str, visoes: bool = False):
+    """
+    Obtém os lançamentos de um intervalo de datas janela a janela, sem acumular o intervalo inteiro em memória.
+
+    Args:
+        sessao (API): Sessão autenticada para realizar chamadas à API.
+        dataInicio (str): Data de início do intervalo de busca no formato `YYYY-MM-DD`.
+        dataFim (str): Data de fim do intervalo de busca no formato `YYYY-MM-DD`.
+        visoes (bool, optional): Se `True`, os lançamentos são visões leves (ver `getLancamentos`). Padrão é `False`.
+
+    Yields:
+        tuple[str, str, list[Lancamento] | list[LancamentoVisao]]: Início e fim da janela consultada e os lançamentos
+                                                                   encontrados nela (visões, se `visoes=True`).
     """
 
     validateDateFormat(dataInicio, "%Y-%m-%d")
     validateDateFormat(dataFim, "%Y-%m-%d")
-    results: list[Lancamento] = []
 
     for inicio, fim in dateRanges(startDate=dataInicio, endDate=dataFim):
+        results: list[Lancamento] = []
 
         parametros = "?"
         if dataInicio is not None:
@@ -121,29 +194,42 @@ def getLancamentos(sessao: API, dataInicio: str, dataFim: str) -> list[Lancament
 
         response = sessao._get(comando=f'/transactions{parametros}')
 
-        for i in response:
-            results.append(Lancamento(id=i['id'],
-                                      description=i['description'],
-                                      date=i['date'],
-                                      paid=i['paid'],
-                                      amount_cents=i['amount_cents'],
-                                      total_installments=i['total_installments'],
-                                      installment=i['installment'],
-                                      recurring=i['recurring'],
-                                      account_id=i['account_id'],
-                                      category_id=i['category_id'],
-                                      tags=i['tags'],
-                                      notes=i['notes'],
-                                      attachments_count=i['attachments_count'],
-                                      credit_card_id=i['credit_card_id'],
-                                      credit_card_invoice_id=i['credit_card_invoice_id'],
-                                      paid_credit_card_id=i['paid_credit_card_id'],
-                                      paid_credit_card_invoice_id=i['paid_credit_card_invoice_id'],
-                                      oposite_transaction_id=i['oposite_transaction_id'],
-                                      oposite_account_id=i['oposite_account_id'],
-                                      created_at=i['created_at'],
-                                      updated_at=i['updated_at']))
-    return results
+        if visoes:
+            with fase("build", "/transactions", sessao):
+                results = list(map(LancamentoVisao, response))
+            yield inicio, fim, results
+            continue
+
+        with fase("build", "/transactions", sessao):
+            for i in response:
+                results.append(_lancamentoDeJSON(i))
+        sessao.cache.guardaVarios(results)
+        yield inicio, fim, results
+
+def iteraLancamentos(sessao: API, dataInicio: str, dataFim: str):
+    """
+    Obtém os lançamentos de um intervalo de datas um a um, conforme o corpo de cada resposta é recebido.
+
+    Diferente de `getLancamentos`, o primeiro lançamento fica disponível antes do fim da transferência e a resposta
+    nunca é mantida inteira em memória, o que reduz a latência e o pico de memória em janelas grandes.
+
+    Args:
+        sessao (API): Sessão autenticada para realizar chamadas à API.
+        dataInicio (str): Data de início do intervalo de busca no formato `YYYY-MM-DD`.
+        dataFim (str): Data de fim do intervalo de busca no formato `YYYY-MM-DD`.
+
+    Yields:
+        Lancamento: Cada lançamento encontrado, na ordem retornada pela API.
+    """
+
+    validateDateFormat(dataInicio, "%Y-%m-%d")
+    validateDateFormat(dataFim, "%Y-%m-%d")
+
+    for inicio, fim in dateRanges(startDate=dataInicio, endDate=dataFim):
+        for i in sessao._getStream(f'/transactions?start_date={inicio}&end_date={fim}'):
+            lancamento = _lancamentoDeJSON(i)
+            sessao.cache.guarda(lancamento)
+            yield lancamento
 
 def getLancamento(sessao: API, idLancamento: int) -> Lancamento:
     """
@@ -157,28 +243,15 @@ def getLancamento(sessao: API, idLancamento: int) -> Lancamento:
         Lancamento: Objeto `Lancamento` com os dados do lançamento encontrado.
     """
 
+    lancamento = sessao.cache.obtem(Lancamento, idLancamento)
+    if lancamento is not None:
+        return lancamento
+
     response = sessao._get(f'/transactions/{idLancamento}')
-    return Lancamento(id=response['id'],
-                      description=response['description'],
-                      date=response['date'],
-                      paid=response['paid'],
-                      amount_cents=response['amount_cents'],
-                      total_installments=response['total_installments'],
-                      installment=response['installment'],
-                      recurring=response['recurring'],
-                      account_id=response['account_id'],
-                      category_id=response['category_id'],
-                      tags=response['tags'],
-                      notes=response['notes'],
-                      attachments_count=response['attachments_count'],
-                      credit_card_id=response['credit_card_id'],
-                      credit_card_invoice_id=response['credit_card_invoice_id'],
-                      paid_credit_card_id=response['paid_credit_card_id'],
-                      paid_credit_card_invoice_id=response['paid_credit_card_invoice_id'],
-                      oposite_transaction_id=response['oposite_transaction_id'],
-                      oposite_account_id=response['oposite_account_id'],
-                      created_at=response['created_at'],
-                      updated_at=response['updated_at'])
+    with fase("build", "/transactions/{id}", sessao):
+        lancamento = _lancamentoDeJSON(response)
+    sessao.cache.guarda(lancamento)
+    return lancamento
 
 def delLancamento(sessao: API, idLancamento: int, apagaFuturos: bool = False, apagaTodos: bool = False):
     """
@@ -197,6 +270,7 @@ def delLancamento(sessao: API, idLancamento: int, apagaFuturos: bool = False, ap
     elif apagaTodos is True:
         parametros = {"update_all": True}
     sessao._delete(f'/transactions/{idLancamento}', params=parametros)
+    _invalidaCache(sessao, idLancamento, recorrencia=parametros is not None)
 
 def addLancamento(sessao: API, JSON_params: dict):
     """
@@ -205,11 +279,14 @@ def addLancamento(sessao: API, JSON_params: dict):
     Args:
         sessao (API): Sessão autenticada para realizar chamadas à API.
         JSON_params (dict): Parâmetros do lançamento no formato JSON a ser adicionado.
-    """
 
-    # TODO: "Requer validação de parâmetros JSON"
+    Raises:
+        ValueError: Se o JSON_params não passar na validação local (ver `Validacao`).
+    """
 
-    sessao._post("/transactions", params=JSON_params)
+    validaPayload("lancamento", JSON_params)
+    sessao._post("/transactions", params=limpaPayload("lancamento", JSON_params))
+    _invalidaCache(sessao)
 
 def addLancamentoFixo(sessao: API, JSON_params: dict, periodicidade: str):
     """
@@ -224,13 +301,10 @@ def addLancamentoFixo(sessao: API, JSON_params: dict, periodicidade: str):
 
     # TODO: "Incompleta. Mais testes"
 
-    # OPÇÕES DE PERIODICIDADE: ["weekly", "biweekly", "monthly",  "bimonthly", "trimonthly", "yearly"]
-    # Cadê DAILY e SEMESTRAL (or SEMESTRIAL)
-    periodos = {'diário': 'daily', 'semanal': 'weekly', 'bissemanal': 'biweekly', 'mensal': 'monthly',
-                'bimestral': 'bimonthly', 'trimestral': 'trimonthly', 'semestral': 'semesterly', 'anual': 'yearly'}
-
-    JSON_params.update({"recurrence_attributes": {"periodicity": periodos[periodicidade]}})
-    sessao._post("/transactions", params=JSON_params)
+    JSON_params.update({"recurrence_attributes": {"periodicity": PERIODICIDADES[periodicidade]}})
+    validaPayload("lancamento", JSON_params)
+    sessao._post("/transactions", params=limpaPayload("lancamento", JSON_params))
+    _invalidaCache(sessao)
 
 def addLancamentoRecorrente(sessao: API, JSON_params: dict, periodicidade: str, parcelas: int):
     """
@@ -249,16 +323,14 @@ def addLancamentoRecorrente(sessao: API, JSON_params: dict, periodicidade: str,
 
     # TODO: "Incompleta. Mais testes"
 
-    # OPÇÕES DE PERIODICIDADE: ["weekly", "biweekly", "monthly",  "bimonthly", "trimonthly", "yearly"]
-    # Cadê DAILY e SEMESTRAL (or SEMESTRIAL)
-    periodos = {'diário': 'daily', 'semanal': 'weekly', 'bissemanal': 'biweekly', 'mensal': 'monthly',
-                'bimestral': 'bimonthly', 'trimestral': 'trimonthly', 'semestral': 'semesterly', 'anual': 'yearly'}
-    periodicidade = periodos[periodicidade]
+    periodicidade = PERIODICIDADES[periodicidade]
 
     if not (2 <= parcelas <= 480):
         raise ValueError("O número de parcelas é inválido (utilize um Nº entre 2 a 480)")
     JSON_params.update({"installments_attributes": {"periodicity": periodicidade, "total": parcelas}})
-    sessao._post("/transactions", params=JSON_params)
+    validaPayload("lancamento", JSON_params)
+    sessao._post("/transactions", params=limpaPayload("lancamento", JSON_params))
+    _invalidaCache(sessao)
 
 def updLancamento(sessao: API, idLancamento: int, JSON_params: dict, atualizaFuturos: bool = False, atualizaTodos: bool = False):
     """
@@ -272,16 +344,18 @@ def updLancamento(sessao: API, idLancamento: int, JSON_params: dict, atualizaFut
         atualizaTodos (bool): Se True, atualiza todos os lançamentos relacionados.
 
     Raises:
-        ValueError: Se nenhum dos parâmetros de atualização (atualizaFuturos ou atualizaTodos) for fornecido.
+        ValueError: Se nenhum dos parâmetros de atualização (atualizaFuturos ou atualizaTodos) for fornecido,
+                    ou se o JSON_params não passar na validação local (ver `Validacao`).
     """
 
-    # TODO: "Requer validação de parâmetros JSON"
-
+    validaPayload("lancamento_atualizacao", JSON_params)
+    JSON_params = limpaPayload("lancamento_atualizacao", JSON_params)
     if atualizaFuturos is True:
         JSON_params.update({"update_future": True})
     elif atualizaTodos is True:
         JSON_params.update({"update_all": True})
     sessao._put(f'/transactions/{idLancamento}', params=JSON_params)
+    _invalidaCache(sessao, idLancamento, recorrencia=atualizaFuturos or atualizaTodos)
 
 # OPERAÇÕES CUSTOMIZADAS
 
@@ -301,25 +375,26 @@ def filtraLancamentos(lancamentos: list[Lancamento], contaBuscada: int = None, t
 
     results: list[Lancamento] = []
 
-    for l in lancamentos:
-        # Considera até 2ª ordem
-        considera = True
+    with fase("filter", "filtraLancamentos"):
+        for l in lancamentos:
+            # Considera até 2ª ordem
+            considera = True
 
-        # Busca por Conta
-        if contaBuscada:
-            if l.account_id != contaBuscada:
-                considera = False
-
-        # Busca pelo Título
-        if tituloBuscado:
-            if usaRegex:
-                if not matchesRegex(l.description, tituloBuscado):
-                    considera = False
-            else:
-                if not tituloBuscado.upper() in l.description.upper():
+            # Busca por Conta
+            if contaBuscada:
+                if l.account_id != contaBuscada:
                     considera = False
 
-        if considera:
-            results.append(l)
+            # Busca pelo Título
+            if tituloBuscado:
+                if usaRegex:
+                    if not matchesRegex(l.description, tituloBuscado):
+                        considera = False
+                else:
+                    if not tituloBuscado.upper() in l.description.upper():
+                        considera = False
+
+            if considera:
+                results.append(l)
 
     return results
@@ -3,6 +3,7 @@ from datetime import datetime
 
 from PyMultiHelper.Validation import validateYear
 from .API import API
+from .Perfil import fase
 
 @dataclass
 class Meta:
@@ -76,12 +77,13 @@ def getMetas(sessao: API, ano: int, mes: int = None) -> list[Meta]:
 
     results = []
     response = sessao._get(f'/budgets/{parametros}')
-    for i in response:
-        results.append(Meta(amount_in_cents=i['amount_in_cents'],
-                            category_id=i['category_id'],
-                            date=i['date'],
-                            activity_type=i['activity_type'],
-                            total=i['total'],
-                            predicted_total = i['predicted_total'],
-                            percentage = i['percentage']))
+    with fase("build", "/budgets", sessao):
+        for i in response:
+            results.append(Meta(amount_in_cents=i['amount_in_cents'],
+                                category_id=i['category_id'],
+                                date=i['date'],
+                                activity_type=i['activity_type'],
+                                total=i['total'],
+                                predicted_total = i['predicted_total'],
+                                percentage = i['percentage']))
     return results
@@ -0,0 +1,348 @@
+"""
+Monitoramento contínuo de lançamentos, faturas e metas, com eventos de alteração.
+
+Cada fonte (janela recente de lançamentos, faturas em aberto de cada cartão, metas do mês) é consultada em
+intervalos adaptativos: após uma consulta com alterações o intervalo volta ao mínimo; a cada consulta sem
+alterações ele é multiplicado por `fatorRecuo`, até o máximo. As alterações são detectadas por `updated_at`
+(quando o recurso tem) e pela impressão do conteúdo (ver `Diferencas.impressao`), e publicadas como
+`EventoAlteracao` para callbacks inscritos e filas `asyncio`.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+from PyMultiHelper.Logging import logFail
+
+from .API import API
+from .CartoesCredito import getCartoesCredito
+from .Diferencas import camposAlterados, impressao
+from .FaturasCartao import getFaturasCartao
+from .Lancamentos import getLancamentos
+from .Metas import getMetas
+
+ADICIONADO, ALTERADO, REMOVIDO = "adicionado", "alterado", "removido"
+
+
+@dataclass
+class EventoAlteracao:
+    """
+    Uma alteração detectada pelo monitor.
+
+    Attributes:
+        recurso (str): "lancamentos", "faturas" ou "metas".
+        tipo (str): "adicionado", "alterado" ou "removido".
+        chave (int | tuple): `id` do registro (para metas, a tupla (`category_id`, `date`)).
+        atual (dict): Registro atual (`None` se removido).
+        anterior (dict): Registro na consulta anterior (`None` se adicionado).
+        campos (dict[str, tuple]): Campos alterados, no formato {campo: (antes, depois)} (só para "alterado").
+        momento (str): Data e hora da detecção, no formato ISO.
+    """
+
+    recurso: str
+    tipo: str
+    chave: object
+    atual: dict = None
+    anterior: dict = None
+    campos: dict = field(default_factory=dict)
+    momento: str = None
+
+    def to_dict(self):
+        """ Retorna uma representação em JSON de um Evento de Alteração """
+        return {"recurso": self.recurso,
+                "tipo": self.tipo,
+                "chave": self.chave,
+                "atual": self.atual,
+                "anterior": self.anterior,
+                "campos": {campo: list(valores) for campo, valores in self.campos.items()},
+                "momento": self.momento}
+
+
+class _Fonte:
+    """
+    Uma consulta monitorada e seu estado: os registros da última consulta e o período que ela cobria.
+
+    `consulta()` devolve (início, fim, {chave: registro}); registros cuja data fica fora do período da outra
+    consulta (janela que avançou, mês que virou) entram ou saem do estado sem gerar evento.
+    """
+
+    def __init__(self, recurso: str, nome: str, consulta, intervalo: float):
+        self.recurso = recurso
+        self.nome = nome
+        self.consulta = consulta
+        self.intervalo = intervalo
+        self.proxima = 0.0
+        self.estado: dict = None  # chave -> (updated_at, impressão, registro)
+        self.cobertura: tuple[str, str] = None
+
+    def compara(self, momento: str) -> list[EventoAlteracao]:
+        inicio, fim, registros = self.consulta()
+        anterior, coberturaAnterior = self.estado, self.cobertura
+        self.estado = {chave: (r.get("updated_at"), impressao(r), r) for chave, r in registros.items()}
+        self.cobertura = (inicio, fim)
+        if anterior is None:
+            return []
+
+        eventos = []
+        for chave, (atualizado, resumo, registro) in self.estado.items():
+            antigo = anterior.pop(chave, None)
+            if antigo is None:
+                if coberturaAnterior[0] <= registro.get("date", "") <= coberturaAnterior[1]:
+                    eventos.append(EventoAlteracao(self.recurso, ADICIONADO, chave, atual=registro, momento=momento))
+            elif antigo[0] != atualizado or antigo[1] != resumo:
+                eventos.append(EventoAlteracao(self.recurso, ALTERADO, chave, atual=registro, anterior=antigo[2],
+                                               campos=camposAlterados(antigo[2], registro), momento=momento))
+
+        for chave, (_, _, registro) in anterior.items():
+            if inicio <= registro.get("date", "") <= fim:
+                eventos.append(EventoAlteracao(self.recurso, REMOVIDO, chave, anterior=registro, momento=momento))
+        return eventos
+
+
+class MonitorAlteracoes:
+    """
+    Observador de longa duração: consulta periodicamente os dados recentes e publica as alterações encontradas.
+
+    Examples:
+        >>> monitor = MonitorAlteracoes(conn, diasRecentes=15)
+        >>> monitor.inscreve(lambda evento: print(evento.recurso, evento.tipo, evento.chave))
+        >>> with monitor:
+        ...     time.sleep(3600)
+
+        Em código assíncrono:
+
+        >>> fila = monitor.fila()
+        >>> monitor.inicia()
+        >>> while True:
+        ...     evento = await fila.get()
+    """
+
+    def __init__(self, sessao: API, diasRecentes: int = 30, diasFuturos: int = 0, cartoes: list[int] = None,
+                 recursos: tuple = ("lancamentos", "faturas", "metas"), intervaloMinimo: float = 15.0,
+                 intervaloMaximo: float = 600.0, fatorRecuo: float = 2.0):
+        """
+        Args:
+            sessao (API): Sessão autenticada para realizar chamadas à API.
+            diasRecentes (int, optional): Dias para trás monitorados nos lançamentos. Padrão é 30.
+            diasFuturos (int, optional): Dias para frente monitorados nos lançamentos (ex: lançamentos agendados). Padrão é 0.
+            cartoes (list[int], optional): Cartões cujas faturas em aberto (vencimento a partir de hoje) são monitoradas.
+                                           Padrão é `None` (todos os cartões não arquivados).
+            recursos (tuple, optional): Recursos monitorados, entre "lancamentos", "faturas" e "metas". Padrão é todos.
+            intervaloMinimo (float, optional): Intervalo, em segundos, após uma consulta com alterações. Padrão é 15.
+            intervaloMaximo (float, optional): Maior intervalo, em segundos, entre consultas de uma fonte sem alterações.
+                                               Padrão é 600.
+            fatorRecuo (float, optional): Multiplicador do intervalo a cada consulta sem alterações. Padrão é 2.0.
+
+        Raises:
+            ValueError: Se um recurso for desconhecido ou os intervalos forem inválidos.
+        """
+
+        desconhecidos = set(recursos) - {"lancamentos", "faturas", "metas"}
+        if desconhecidos:
+            raise ValueError(f"Recursos desconhecidos: {', '.join(sorted(desconhecidos))}")
+        if not 0 < intervaloMinimo <= intervaloMaximo or fatorRecuo < 1:
+            raise ValueError("Use 0 < intervaloMinimo <= intervaloMaximo e fatorRecuo >= 1")
+
+        self.sessao = sessao
+        self.diasRecentes = diasRecentes
+        self.diasFuturos = diasFuturos
+        self.intervaloMinimo = intervaloMinimo
+        self.intervaloMaximo = intervaloMaximo
+        self.fatorRecuo = fatorRecuo
+
+        self._fontes: list[_Fonte] = []
+        if "lancamentos" in recursos:
+            self._fontes.append(_Fonte("lancamentos", "lancamentos", self._consultaLancamentos, intervaloMinimo))
+        if "faturas" in recursos:
+            if cartoes is None:
+                cartoes = [c.id for c in getCartoesCredito(sessao, visoes=True) if not c.archived]
+            for idCartao in cartoes:
+                self._fontes.append(_Fonte("faturas", f"faturas/{idCartao}",
+                                           lambda idCartao=idCartao: self._consultaFaturas(idCartao), intervaloMinimo))
+        if "metas" in recursos:
+            self._fontes.append(_Fonte("metas", "metas", self._consultaMetas, intervaloMinimo))
+
+        self._inscritos: list[tuple] = []
+        self._trava = threading.Lock()
+        self._parar = threading.Event()
+        self._thread: threading.Thread = None
+
+    def __enter__(self):
+        self.inicia()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.para()
+
+    # CONSULTAS
+
+    def _consultaLancamentos(self):
+        hoje = date.today()
+        inicio = (hoje - timedelta(days=self.diasRecentes)).isoformat()
+        fim = (hoje + timedelta(days=self.diasFuturos)).isoformat()
+        return inicio, fim, {l.id: l.to_dict() for l in getLancamentos(self.sessao, inicio, fim, visoes=True)}
+
+    def _consultaFaturas(self, idCartao: int):
+        hoje = date.today().isoformat()
+        return hoje, "9999-12-31", {f.id: f.to_dict() for f in getFaturasCartao(self.sessao, idCartao, visoes=True)
+                                    if f.date >= hoje}
+
+    def _consultaMetas(self):
+        hoje = date.today()
+        inicio = hoje.replace(day=1)
+        fim = (inicio + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        # A meta é identificada também pela data: na virada do mês, as do novo mês não são confundidas com as do anterior
+        return inicio.isoformat(), fim.isoformat(), {(m.category_id, m.date): m.to_dict()
+                                                     for m in getMetas(self.sessao, hoje.year, hoje.month)}
+
+    # INSCRIÇÕES
+
+    def inscreve(self, callback, recursos: tuple = None):
+        """
+        Registra uma função chamada a cada evento (na thread do monitor).
+
+        Args:
+            callback (Callable[[EventoAlteracao], None]): Função a ser chamada.
+            recursos (tuple, optional): Recursos de interesse (ex: ("faturas",)). Padrão é `None` (todos).
+
+        Returns:
+            O próprio `callback`, para uso em `cancela`.
+        """
+
+        with self._trava:
+            self._inscritos.append((callback, frozenset(recursos) if recursos else None))
+        return callback
+
+    def cancela(self, callback):
+        """ Remove um callback (ou uma fila criada por `fila`) """
+
+        with self._trava:
+            self._inscritos = [(c, r) for c, r in self._inscritos
+                               if c is not callback and getattr(c, "fila", None) is not callback]
+
+    def fila(self, loop: asyncio.AbstractEventLoop = None, recursos: tuple = None, maximo: int = 0) -> asyncio.Queue:
+        """
+        Cria uma `asyncio.Queue` que recebe os eventos, para consumo em código assíncrono.
+
+        Args:
+            loop (asyncio.AbstractEventLoop, optional): Loop dono da fila. Padrão é o loop em execução.
+            recursos (tuple, optional): Recursos de interesse. Padrão é `None` (todos).
+            maximo (int, optional): Tamanho máximo da fila; cheia, o evento mais antigo é descartado. Padrão é 0 (sem limite).
+
+        Returns:
+            asyncio.Queue: Fila de `EventoAlteracao`.
+        """
+
+        loop = loop or asyncio.get_running_loop()
+        fila = asyncio.Queue(maxsize=maximo)
+
+        def coloca(evento):
+            if fila.full():
+                fila.get_nowait()
+            fila.put_nowait(evento)
+
+        def entrega(evento):
+            loop.call_soon_threadsafe(coloca, evento)
+
+        entrega.fila = fila
+        self.inscreve(entrega, recursos)
+        return fila
+
+    def _publica(self, eventos: list[EventoAlteracao]):
+        with self._trava:
+            inscritos = list(self._inscritos)
+        for evento in eventos:
+            for callback, recursos in inscritos:
+                if recursos is not None and evento.recurso not in recursos:
+                    continue
+                try:
+                    callback(evento)
+                except Exception as erro:
+                    logFail(f"Monitor: erro no callback {getattr(callback, '__name__', callback)}: {erro}")
+
+    # EXECUÇÃO
+
+    def verifica(self, fonte: _Fonte = None) -> list[EventoAlteracao]:
+        """
+        Consulta uma fonte (ou todas) imediatamente, publica e retorna os eventos encontrados.
+
+        A primeira consulta de cada fonte só registra o estado inicial, sem gerar eventos.
+
+        Returns:
+            list[EventoAlteracao]: Eventos encontrados.
+        """
+
+        eventos = []
+        for f in [fonte] if fonte is not None else self._fontes:
+            momento = datetime.now().isoformat(timespec="seconds")
+            try:
+                encontrados = f.compara(momento)
+            except Exception as erro:
+                # Qualquer falha (rede, resposta inesperada) afeta só esta fonte, que recua como se estivesse ociosa
+                logFail(f"Monitor: falha ao consultar {f.nome}: {erro}")
+                f.intervalo = min(f.intervalo * self.fatorRecuo, self.intervaloMaximo)
+            else:
+                # Intervalo adaptativo: volta ao mínimo após atividade, recua enquanto a fonte está ociosa
+                if encontrados:
+                    f.intervalo = self.intervaloMinimo
+                else:
+                    f.intervalo = min(f.intervalo * self.fatorRecuo, self.intervaloMaximo)
+                eventos += encontrados
+            f.proxima = time.monotonic() + f.intervalo
+
+        self._publica(eventos)
+        return eventos
+
+    def _executa(self):
+        while not self._parar.is_set():
+            fonte = min(self._fontes, key=lambda f: f.proxima)
+            espera = fonte.proxima - time.monotonic()
+            if espera > 0 and self._parar.wait(espera):
+                break
+            self.verifica(fonte)
+
+    def inicia(self):
+        """
+        Inicia a thread de monitoramento (a primeira consulta de cada fonte é imediata).
+
+        Raises:
+            ValueError: Se não houver fontes a monitorar.
+            RuntimeError: Se a thread de um `para` anterior ainda não terminou (ex: `para` com `timeout` esgotado).
+        """
+
+        if self._thread is not None and self._thread.is_alive():
+            if not self._parar.is_set():
+                return
+            # Limpar `_parar` agora reativaria a thread antiga ao lado da nova
+            raise RuntimeError("A thread anterior do monitor ainda está em execução; aguarde `para()` terminar")
+        if not self._fontes:
+            raise ValueError("Nenhuma fonte a monitorar")
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executa, name="organizze-monitor", daemon=True)
+        self._thread.start()
+
+    def para(self, timeout: float = None) -> bool:
+        """
+        Interrompe o monitoramento, aguardando a consulta em andamento terminar.
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera, em segundos. Padrão é `None` (sem limite).
+
+        Returns:
+            bool: `True` se a thread terminou, `False` se o tempo acabou antes (chame `para` de novo para aguardá-la).
+        """
+
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                return False
+            self._thread = None
+        return True
+
+    @property
+    def intervalos(self) -> dict[str, float]:
+        """ Intervalo atual, em segundos, de cada fonte monitorada """
+        return {f.nome: f.intervalo for f in self._fontes}
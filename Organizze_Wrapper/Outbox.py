@@ -0,0 +1,412 @@
+"""
+Outbox persistente para alterações de lançamentos.
+
+As operações são gravadas em um diário SQLite e retornam imediatamente; uma thread de descarga as envia à API
+com concorrência limitada, novas tentativas com espera exponencial e chaves de idempotência. O diário sobrevive
+a reinícios do processo: ao reabrir o mesmo arquivo, o envio continua de onde parou.
+"""
+
+import json
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from requests import HTTPError
+
+from .API import API
+from .Duplicatas import IndiceDuplicatas
+from .Lancamentos import _invalidaCache, getLancamentos
+from .Validacao import limpaPayload, validaPayload
+
+PENDENTE, ENVIANDO, CONCLUIDA, FALHOU, INCERTA = "pendente", "enviando", "concluida", "falhou", "incerta"
+
+# Códigos 4xx que indicam falha transitória (os demais 4xx não adiantam repetir)
+CODIGOS_TRANSITORIOS = {408, 425, 429}
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS operacoes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    chave TEXT NOT NULL UNIQUE,
+    metodo TEXT NOT NULL,
+    comando TEXT NOT NULL,
+    params TEXT,
+    estado TEXT NOT NULL,
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    proxima REAL NOT NULL,
+    incerta INTEGER NOT NULL DEFAULT 0,
+    erro TEXT,
+    criada TEXT NOT NULL
+)
+"""
+
+
+class OutboxLancamentos:
+    """
+    Modo "write-behind" para `addLancamento`, `updLancamento` e `delLancamento`.
+
+    Cada operação recebe uma chave de idempotência: reenfileirar a mesma chave não duplica a operação. Um
+    `addLancamento` de resultado desconhecido (ex: queda do processo ou da rede no meio do envio) só é reenviado
+    se nenhum lançamento igual for encontrado no Organizze. Se houver, ele pode ser tanto o enviado quanto outra
+    compra idêntica legítima: a operação fica "incerta" (ver `incertas`) até ser reenviada com `reenvia` ou
+    descartada com `descarta`, em vez de ser dada como concluída.
+
+    Alterações e exclusões do mesmo lançamento são enviadas na ordem em que foram enfileiradas: uma operação
+    só sai depois que as anteriores do mesmo comando terminarem (concluídas ou falhas), inclusive enquanto
+    uma delas aguarda nova tentativa. Criações (`addLancamento`) são independentes entre si.
+
+    Examples:
+        >>> with OutboxLancamentos(conn, "outbox.sqlite") as outbox:
+        ...     outbox.addLancamento({"description": "Mercado", "date": "2024-06-01", "amount_cents": -1990,
+        ...                           "account_id": 123}, chave="extrato-8841")
+        ...     outbox.aguarda()
+        >>> outbox.falhas()
+        []
+    """
+
+    def __init__(self, sessao: API, caminho: str, concorrencia: int = 4, maxTentativas: int = 8,
+                 esperaBase: float = 1.0, esperaMaxima: float = 300.0):
+        """
+        Args:
+            sessao (API): Sessão autenticada usada pelo envio.
+            caminho (str): Arquivo SQLite do diário (criado se não existir).
+            concorrencia (int, optional): Máximo de requisições simultâneas. Padrão é 4.
+            maxTentativas (int, optional): Tentativas antes de marcar a operação como falha. Padrão é 8.
+            esperaBase (float, optional): Espera, em segundos, antes da 2ª tentativa; dobra a cada falha. Padrão é 1.0.
+            esperaMaxima (float, optional): Limite da espera entre tentativas, em segundos. Padrão é 300.0.
+        """
+
+        self.sessao = sessao
+        self.concorrencia = concorrencia
+        self.maxTentativas = maxTentativas
+        self.esperaBase = esperaBase
+        self.esperaMaxima = esperaMaxima
+
+        self._banco = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None)
+        self._banco.execute("PRAGMA journal_mode=WAL")
+        self._banco.execute(_ESQUEMA)
+        self._trava = threading.Lock()
+        self._sinal = threading.Condition(self._trava)
+        self._parar = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+        # Operações que estavam em envio quando o processo anterior parou: o resultado é desconhecido
+        with self._trava:
+            self._banco.execute("UPDATE operacoes SET estado = ?, incerta = 1 WHERE estado = ?", (PENDENTE, ENVIANDO))
+
+    def __enter__(self):
+        self.inicia()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.para()
+
+    # ENFILEIRAMENTO
+
+    def _enfileira(self, metodo: str, comando: str, params: dict, chave: str) -> str:
+        chave = chave or str(uuid.uuid4())
+        with self._sinal:
+            self._banco.execute("INSERT OR IGNORE INTO operacoes (chave, metodo, comando, params, estado, proxima, criada) "
+                                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                (chave, metodo, comando, json.dumps(params) if params is not None else None,
+                                 PENDENTE, time.time(), datetime.now().isoformat()))
+            self._sinal.notify()
+        return chave
+
+    def addLancamento(self, JSON_params: dict, chave: str = None) -> str:
+        """
+        Enfileira a criação de um lançamento (ver `Lancamentos.addLancamento`).
+
+        Args:
+            JSON_params (dict): Parâmetros do lançamento no formato JSON a ser adicionado.
+            chave (str, optional): Chave de idempotência (ex: id da transação no banco). Padrão é um UUID novo.
+
+        Returns:
+            str: A chave da operação.
+
+        Raises:
+            ValueError: Se o JSON_params não passar na validação local (nada é gravado no diário).
+        """
+
+        validaPayload("lancamento", JSON_params)
+        return self._enfileira("POST", "/transactions", limpaPayload("lancamento", JSON_params), chave)
+
+    def updLancamento(self, idLancamento: int, JSON_params: dict, atualizaFuturos: bool = False,
+                      atualizaTodos: bool = False, chave: str = None) -> str:
+        """
+        Enfileira a atualização de um lançamento (ver `Lancamentos.updLancamento`).
+
+        Args:
+            idLancamento (int): ID do lançamento a ser atualizado.
+            JSON_params (dict): Parâmetros atualizados do lançamento no formato JSON.
+            atualizaFuturos (bool, optional): Se `True`, atualiza os lançamentos futuros. Padrão é `False`.
+            atualizaTodos (bool, optional): Se `True`, atualiza todos os lançamentos relacionados. Padrão é `False`.
+            chave (str, optional): Chave de idempotência. Padrão é um UUID novo.
+
+        Returns:
+            str: A chave da operação.
+
+        Raises:
+            ValueError: Se o JSON_params não passar na validação local (nada é gravado no diário).
+        """
+
+        validaPayload("lancamento_atualizacao", JSON_params)
+        params = limpaPayload("lancamento_atualizacao", JSON_params)
+        if atualizaFuturos:
+            params.update({"update_future": True})
+        elif atualizaTodos:
+            params.update({"update_all": True})
+        return self._enfileira("PUT", f'/transactions/{idLancamento}', params, chave)
+
+    def delLancamento(self, idLancamento: int, apagaFuturos: bool = False, apagaTodos: bool = False,
+                      chave: str = None) -> str:
+        """
+        Enfileira a exclusão de um lançamento (ver `Lancamentos.delLancamento`).
+
+        Args:
+            idLancamento (int): ID do lançamento a ser excluído.
+            apagaFuturos (bool, optional): Se `True`, apaga os lançamentos futuros. Padrão é `False`.
+            apagaTodos (bool, optional): Se `True`, apaga todos os lançamentos relacionados. Padrão é `False`.
+            chave (str, optional): Chave de idempotência. Padrão é um UUID novo.
+
+        Returns:
+            str: A chave da operação.
+        """
+
+        params = {}
+        if apagaFuturos:
+            params.update({"update_future": True})
+        elif apagaTodos:
+            params.update({"update_all": True})
+        return self._enfileira("DELETE", f'/transactions/{idLancamento}', params or None, chave)
+
+    # DESCARGA
+
+    def inicia(self):
+        """ Inicia as threads de descarga (uma por unidade de concorrência) """
+
+        if self._threads:
+            return
+        self._parar.clear()
+        self._threads = [threading.Thread(target=self._descarrega, name=f"outbox-{n}", daemon=True)
+                         for n in range(self.concorrencia)]
+        for t in self._threads:
+            t.start()
+
+    def para(self, timeout: float = None):
+        """
+        Interrompe a descarga após as requisições em andamento. O que estiver pendente continua no diário.
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera por thread, em segundos. Padrão é `None` (sem limite).
+        """
+
+        self._parar.set()
+        with self._sinal:
+            self._sinal.notify_all()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def aguarda(self, timeout: float = None) -> bool:
+        """
+        Bloqueia até o diário não ter operações pendentes ou em envio.
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera, em segundos. Padrão é `None` (sem limite).
+
+        Returns:
+            bool: `True` se o diário esvaziou, `False` se o tempo acabou antes.
+
+        Raises:
+            RuntimeError: Se houver operações pendentes e nenhuma thread de descarga em execução
+                          (ex: `inicia()` não foi chamado, ou a descarga foi parada).
+        """
+
+        limite = None if timeout is None else time.time() + timeout
+        while self.pendentes():
+            if not any(t.is_alive() for t in self._threads):
+                raise RuntimeError("Há operações pendentes, mas a descarga não está em execução (chame `inicia()`)")
+            if limite is not None and time.time() >= limite:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def _reserva(self):
+        """
+        Marca como em envio a próxima operação pronta, ou devolve o tempo até a próxima ficar pronta.
+        Uma operação só está liberada se nenhuma anterior do mesmo comando estiver pendente ou em envio.
+        """
+
+        liberadas = ("FROM operacoes o WHERE o.estado = ? AND (o.metodo = 'POST' OR NOT EXISTS ("
+                     "SELECT 1 FROM operacoes a WHERE a.comando = o.comando AND a.seq < o.seq AND a.estado IN (?, ?)))")
+
+        with self._trava:
+            agora = time.time()
+            linha = self._banco.execute("SELECT o.seq, o.metodo, o.comando, o.params, o.tentativas, o.incerta "
+                                        f"{liberadas} AND o.proxima <= ? ORDER BY o.seq LIMIT 1",
+                                        (PENDENTE, PENDENTE, ENVIANDO, agora)).fetchone()
+            if linha:
+                self._banco.execute("UPDATE operacoes SET estado = ? WHERE seq = ?", (ENVIANDO, linha[0]))
+                return linha, None
+
+            # As bloqueadas só ficam prontas quando uma anterior termina, o que é sinalizado em `_finaliza`/`_reagenda`
+            proxima = self._banco.execute(f"SELECT MIN(o.proxima) {liberadas}",
+                                          (PENDENTE, PENDENTE, ENVIANDO)).fetchone()[0]
+            return None, None if proxima is None else max(proxima - agora, 0.01)
+
+    def _descarrega(self):
+        while not self._parar.is_set():
+            linha, espera = self._reserva()
+            if linha is None:
+                with self._sinal:
+                    self._sinal.wait(timeout=espera if espera is not None else 1.0)
+                continue
+
+            seq, metodo, comando, params, tentativas, incerta = linha
+            params = json.loads(params) if params else None
+            try:
+                if incerta and metodo == "POST":
+                    iguais = self._jaCriado(params)
+                    if iguais:
+                        self._finaliza(seq, INCERTA, f"Lançamentos iguais já existem no Organizze: {iguais}")
+                        continue
+                self._envia(metodo, comando, params)
+                self._finaliza(seq, CONCLUIDA)
+
+            except HTTPError as erro:
+                status = erro.response.status_code if erro.response is not None else None
+                if metodo == "DELETE" and status == 404:
+                    # Já excluído (ex: envio anterior concluído sem confirmação)
+                    self._finaliza(seq, CONCLUIDA)
+                elif status is not None and 400 <= status < 500 and status not in CODIGOS_TRANSITORIOS:
+                    self._finaliza(seq, FALHOU, str(erro))
+                else:
+                    # Sem resposta (rede), a criação pode ter sido gravada mesmo assim
+                    self._reagenda(seq, tentativas + 1, str(erro), incerta=incerta or status is None)
+
+            except Exception as erro:
+                # Falha inesperada (ex: rede fora do HTTPError, resposta inválida): a thread segue viva e a operação
+                # volta para a fila, em vez de ficar presa "em envio"
+                self._reagenda(seq, tentativas + 1, repr(erro), incerta=True)
+
+    def _envia(self, metodo: str, comando: str, params: dict):
+        if metodo == "POST":
+            self.sessao._post(comando, params=params)
+        elif metodo == "PUT":
+            self.sessao._put(comando, params=params)
+        else:
+            self.sessao._delete(comando, params=params)
+
+        idLancamento = int(comando.rsplit("/", 1)[1]) if metodo != "POST" else None
+        recorrencia = bool(params) and ("update_future" in params or "update_all" in params)
+        _invalidaCache(self.sessao, idLancamento, recorrencia=recorrencia)
+
+    def _jaCriado(self, params: dict) -> list[int]:
+        """
+        Ids dos lançamentos do Organizze iguais a um `addLancamento` de resultado desconhecido (vazio se não houver).
+        Um lançamento igual não prova que o envio foi gravado: pode ser outra compra idêntica.
+        """
+
+        return [l.id for l in getLancamentos(self.sessao, params["date"], params["date"])
+                if IndiceDuplicatas([l]).contem(params)]
+
+    def _finaliza(self, seq: int, estado: str, erro: str = None):
+        with self._sinal:
+            self._banco.execute("UPDATE operacoes SET estado = ?, erro = ?, incerta = 0 WHERE seq = ?",
+                                (estado, erro, seq))
+            self._sinal.notify_all()
+
+    def _reagenda(self, seq: int, tentativas: int, erro: str, incerta: bool = False):
+        with self._sinal:
+            self._sinal.notify_all()
+            if tentativas >= self.maxTentativas:
+                self._banco.execute("UPDATE operacoes SET estado = ?, tentativas = ?, erro = ?, incerta = ? WHERE seq = ?",
+                                    (FALHOU, tentativas, erro, int(incerta), seq))
+                return
+
+            # Espera exponencial com jitter, para não sincronizar as threads contra a API
+            espera = min(self.esperaBase * 2 ** (tentativas - 1), self.esperaMaxima) * random.uniform(0.5, 1.0)
+            self._banco.execute("UPDATE operacoes SET estado = ?, tentativas = ?, erro = ?, proxima = ?, incerta = ? "
+                                "WHERE seq = ?", (PENDENTE, tentativas, erro, time.time() + espera, int(incerta), seq))
+
+    # CONSULTAS
+
+    def pendentes(self) -> int:
+        """ Quantidade de operações ainda não concluídas (pendentes ou em envio) """
+
+        with self._trava:
+            return self._banco.execute("SELECT COUNT(*) FROM operacoes WHERE estado IN (?, ?)",
+                                       (PENDENTE, ENVIANDO)).fetchone()[0]
+
+    def estado(self, chave: str) -> str:
+        """
+        Args:
+            chave (str): Chave retornada no enfileiramento.
+
+        Returns:
+            str: Um de "pendente", "enviando", "concluida", "falhou" ou "incerta"; `None` se a chave não existir.
+        """
+
+        with self._trava:
+            linha = self._banco.execute("SELECT estado FROM operacoes WHERE chave = ?", (chave,)).fetchone()
+        return linha[0] if linha else None
+
+    def _lista(self, estado: str) -> list[dict]:
+        with self._trava:
+            linhas = self._banco.execute("SELECT chave, metodo, comando, params, tentativas, erro FROM operacoes "
+                                         "WHERE estado = ? ORDER BY seq", (estado,)).fetchall()
+        return [{"chave": chave, "metodo": metodo, "comando": comando,
+                 "params": json.loads(params) if params else None, "tentativas": tentativas, "erro": erro}
+                for chave, metodo, comando, params, tentativas, erro in linhas]
+
+    def falhas(self) -> list[dict]:
+        """
+        Returns:
+            list[dict]: Operações que esgotaram as tentativas ou foram recusadas pela API, com o último erro.
+        """
+
+        return self._lista(FALHOU)
+
+    def incertas(self) -> list[dict]:
+        """
+        Returns:
+            list[dict]: Criações de resultado desconhecido para as quais já existe um lançamento igual no Organizze
+                        (os ids estão em "erro"). Use `reenvia` se forem compras diferentes, ou `descarta` se não.
+        """
+
+        return self._lista(INCERTA)
+
+    def reenvia(self, chave: str):
+        """
+        Recoloca uma operação que falhou (ou incerta) na fila, zerando as tentativas. Uma operação incerta é
+        enviada sem nova conferência.
+
+        Args:
+            chave (str): Chave da operação.
+        """
+
+        with self._sinal:
+            self._banco.execute("UPDATE operacoes SET estado = ?, tentativas = 0, proxima = ?, incerta = 0 "
+                                "WHERE chave = ? AND estado IN (?, ?)", (PENDENTE, time.time(), chave, FALHOU, INCERTA))
+            self._sinal.notify()
+
+    def descarta(self, chave: str):
+        """
+        Dá por concluída uma operação incerta, sem enviá-la (o lançamento igual encontrado é o dela).
+
+        Args:
+            chave (str): Chave da operação.
+        """
+
+        with self._trava:
+            self._banco.execute("UPDATE operacoes SET estado = ?, erro = NULL WHERE chave = ? AND estado = ?",
+                                (CONCLUIDA, chave, INCERTA))
+
+    def limpaConcluidas(self):
+        """ Remove do diário as operações já concluídas (as chaves deixam de impedir novos enfileiramentos) """
+
+        with self._trava:
+            self._banco.execute("DELETE FROM operacoes WHERE estado = ?", (CONCLUIDA,))
@@ -0,0 +1,66 @@
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import fields
+
+import pandas as pd
+from PyMultiHelper.Validation import validateDateFormat
+from PyMultiHelper.Dates import dateRanges
+
+from .API import API
+from .Lancamentos import Lancamento
+
+CAMPOS_LANCAMENTO = [f.name for f in fields(Lancamento)]
+
+
+def _decodificaLancamentos(corpo: bytes) -> dict[str, list]:
+    """
+    Executado nos processos auxiliares: decodifica o corpo de `/transactions` em colunas (uma lista por campo).
+
+    Colunas de valores simples voltam ao processo principal muito mais baratas que objetos `Lancamento`:
+    desserializar uma lista de objetos custa quase o mesmo que construí-los, o que anulava o ganho do pool.
+    """
+
+    itens = json.loads(corpo)
+    return {campo: [i[campo] for i in itens] for campo in CAMPOS_LANCAMENTO}
+
+
+def getLancamentosParalelo(sessao: API, dataInicio: str, dataFim: str, processos: int = None,
+                           conexoes: int = 4, colunar: bool = False):
+    """
+    Obtém os lançamentos de um intervalo longo usando vários núcleos: as janelas são baixadas em paralelo
+    e a decodificação do JSON ocorre em um pool de processos, que devolve colunas de valores simples; o processo
+    principal só monta os objetos (ou o DataFrame) a partir delas.
+
+    Args:
+        sessao (API): Sessão autenticada para realizar chamadas à API.
+        dataInicio (str): Data de início do intervalo de busca no formato `YYYY-MM-DD`.
+        dataFim (str): Data de fim do intervalo de busca no formato `YYYY-MM-DD`.
+        processos (int, optional): Nº de processos para decodificação. Padrão é `None` (um por núcleo).
+        conexoes (int, optional): Nº de janelas baixadas simultaneamente. Padrão é 4.
+        colunar (bool, optional): Se `True`, retorna um `pd.DataFrame` montado direto das colunas decodificadas,
+                                  sem criar objetos `Lancamento`. Padrão é `False`.
+
+    Returns:
+        list[Lancamento] | pd.DataFrame: Os lançamentos, na mesma ordem de `getLancamentos`.
+
+    Warnings:
+        Em sistemas que iniciam processos via 'spawn' (Windows, macOS), chame esta função dentro de
+        `if __name__ == "__main__":`.
+    """
+
+    validateDateFormat(dataInicio, "%Y-%m-%d")
+    validateDateFormat(dataFim, "%Y-%m-%d")
+    janelas = dateRanges(startDate=dataInicio, endDate=dataFim)
+
+    with ThreadPoolExecutor(max_workers=conexoes) as rede, ProcessPoolExecutor(max_workers=processos) as cpu:
+        downloads = [rede.submit(sessao._getBruto, f'/transactions?start_date={inicio}&end_date={fim}')
+                     for inicio, fim in janelas]
+        decodificacoes = [cpu.submit(_decodificaLancamentos, d.result()) for d in downloads]
+        blocos = [d.result() for d in decodificacoes]
+
+    colunas = {campo: [v for bloco in blocos for v in bloco[campo]] for campo in CAMPOS_LANCAMENTO}
+    if colunar:
+        return pd.DataFrame(colunas, columns=CAMPOS_LANCAMENTO)
+
+    # Os campos estão na ordem de declaração do dataclass, então cada linha vira os argumentos posicionais
+    return list(map(Lancamento, *colunas.values()))
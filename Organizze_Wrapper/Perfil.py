@@ -0,0 +1,189 @@
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+FASES = ["fetch", "decode", "build", "filter"]
+
+_ID_NUMERICO = re.compile(r'/\d+')
+
+# Perfil ativo no contexto atual, para as fases que não pertencem a uma sessão (ex: filtros).
+# As fases de uma sessão usam o perfil da própria sessão, que também vale nas threads que ela usar.
+_perfilContexto: ContextVar = ContextVar("perfilContexto", default=None)
+
+
+@dataclass
+class MedicaoFase:
+    """
+    Totais acumulados de uma fase em um endpoint.
+
+    Attributes:
+        chamadas (int): Quantidade de vezes em que a fase foi executada.
+        parede (float): Tempo de relógio somado, em segundos.
+        cpu (float): Tempo de CPU da thread somado, em segundos.
+        alocado (int): Memória líquida alocada e ainda retida ao fim da fase, em bytes (exige tracemalloc).
+        pico (int): Maior pico de memória da fase acima da memória do seu início, em bytes (exige tracemalloc).
+                    Se a fase não superou o pico já registrado pelo tracemalloc, vale a memória retida ao seu
+                    fim (um limite inferior).
+    """
+
+    chamadas: int = 0
+    parede: float = 0.0
+    cpu: float = 0.0
+    alocado: int = 0
+    pico: int = 0
+
+    def to_dict(self):
+        """ Retorna uma representação em JSON de uma Medição """
+        return {"chamadas": self.chamadas,
+                "parede": self.parede,
+                "cpu": self.cpu,
+                "alocado": self.alocado,
+                "pico": self.pico}
+
+
+class PerfilExecucao:
+    """
+    Medições por fase (fetch → decode → build → filter) e por endpoint, coletadas por `API.profile()`.
+
+    Warnings:
+        A memória é medida pelo tracemalloc, que é global: fases executadas em paralelo por outras threads
+        (mesmo de outras sessões) se misturam nas medições de alocação umas das outras.
+    """
+
+    def __init__(self, memoria: bool = True):
+        self.memoria = memoria
+        self.medicoes: dict[tuple[str, str], MedicaoFase] = {}
+        self._trava = threading.Lock()
+
+    def registra(self, fase: str, endpoint: str, parede: float, cpu: float, alocado: int = 0, pico: int = 0):
+        with self._trava:
+            medicao = self.medicoes.setdefault((fase, endpoint), MedicaoFase())
+            medicao.chamadas += 1
+            medicao.parede += parede
+            medicao.cpu += cpu
+            medicao.alocado += alocado
+            medicao.pico = max(medicao.pico, pico)
+
+    def porFase(self) -> dict[str, MedicaoFase]:
+        """ Totais de cada fase, somando todos os endpoints """
+
+        results: dict[str, MedicaoFase] = {}
+        for (fase, _), m in self.medicoes.items():
+            total = results.setdefault(fase, MedicaoFase())
+            total.chamadas += m.chamadas
+            total.parede += m.parede
+            total.cpu += m.cpu
+            total.alocado += m.alocado
+            total.pico = max(total.pico, m.pico)
+        return results
+
+    def relatorio(self) -> str:
+        """
+        Monta um relatório em texto, com uma linha por fase/endpoint, ordenado pelo maior tempo de relógio.
+
+        Returns:
+            str: Tabela pronta para impressão.
+        """
+
+        linhas = [f"{'fase':<8} {'endpoint':<40} {'chamadas':>8} {'parede ms':>11} {'cpu ms':>11} "
+                  f"{'alocado KiB':>12} {'pico KiB':>10}"]
+        ordenadas = sorted(self.medicoes.items(), key=lambda item: item[1].parede, reverse=True)
+        for (fase, endpoint), m in ordenadas:
+            linhas.append(f"{fase:<8} {endpoint:<40} {m.chamadas:>8} {m.parede * 1000:>11.1f} {m.cpu * 1000:>11.1f} "
+                          f"{m.alocado / 1024:>12.1f} {m.pico / 1024:>10.1f}")
+
+        linhas.append("")
+        for fase, m in sorted(self.porFase().items(), key=lambda item: FASES.index(item[0]) if item[0] in FASES else 99):
+            linhas.append(f"{fase:<8} {'(total)':<40} {m.chamadas:>8} {m.parede * 1000:>11.1f} {m.cpu * 1000:>11.1f} "
+                          f"{m.alocado / 1024:>12.1f} {m.pico / 1024:>10.1f}")
+        return "\n".join(linhas)
+
+    def to_dict(self):
+        """ Retorna uma representação em JSON do Perfil """
+        return {f'{fase} {endpoint}': m.to_dict() for (fase, endpoint), m in self.medicoes.items()}
+
+    def exportaFlamegraph(self, caminho: str):
+        """
+        Grava as medições no formato de pilhas colapsadas ("endpoint;fase microssegundos"), aceito por
+        flamegraph.pl, speedscope e similares.
+
+        Args:
+            caminho (str): Caminho do arquivo a ser criado.
+        """
+
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            for (fase, endpoint), m in self.medicoes.items():
+                arquivo.write(f"{endpoint};{fase} {round(m.parede * 1_000_000)}\n")
+
+
+@contextmanager
+def fase(nome: str, endpoint: str = "-", sessao=None):
+    """
+    Mede um trecho do pipeline como a fase `nome` do `endpoint`, se houver um perfil ativo.
+    Sem perfil ativo, não faz nada.
+
+    Args:
+        nome (str): Nome da fase (ver `FASES`).
+        endpoint (str, optional): Comando da API; identificadores numéricos são agrupados como `{id}`.
+        sessao (API, optional): Sessão que executa a fase; registra no perfil dela. Se não informada,
+                                registra no perfil ativo do contexto atual.
+    """
+
+    perfil = _perfilContexto.get() if sessao is None else getattr(sessao, "_perfil", None)
+    if perfil is None:
+        yield
+        return
+
+    endpoint = _ID_NUMERICO.sub('/{id}', endpoint.split('?')[0])
+    medeMemoria = perfil.memoria and tracemalloc.is_tracing()
+    if medeMemoria:
+        # O pico do tracemalloc não é zerado aqui, para não corromper o de fases aninhadas ou concorrentes
+        memoriaInicial, picoInicial = tracemalloc.get_traced_memory()
+    parede, cpu = time.perf_counter(), time.thread_time()
+
+    try:
+        yield
+    finally:
+        parede, cpu = time.perf_counter() - parede, time.thread_time() - cpu
+        if medeMemoria:
+            memoriaFinal, picoFinal = tracemalloc.get_traced_memory()
+            pico = picoFinal if picoFinal > picoInicial else memoriaFinal
+            perfil.registra(nome, endpoint, parede, cpu, memoriaFinal - memoriaInicial, max(0, pico - memoriaInicial))
+        else:
+            perfil.registra(nome, endpoint, parede, cpu)
+
+
+@contextmanager
+def perfilAtivo(memoria: bool = True, sessao=None):
+    """
+    Ativa a coleta de um `PerfilExecucao` enquanto o contexto estiver aberto. Use via `API.profile()`.
+
+    O perfil recebe as fases da `sessao` (em qualquer thread) e as fases sem sessão executadas neste contexto;
+    outras sessões e outras threads não são registradas.
+
+    Args:
+        memoria (bool, optional): Se `True`, mede alocações com tracemalloc (mais lento). Padrão é `True`.
+        sessao (API, optional): Sessão cujas fases serão medidas.
+    """
+
+    perfil = PerfilExecucao(memoria=memoria)
+    iniciouTracemalloc = memoria and not tracemalloc.is_tracing()
+    if iniciouTracemalloc:
+        tracemalloc.start()
+
+    anterior = getattr(sessao, "_perfil", None)
+    if sessao is not None:
+        sessao._perfil = perfil
+    token = _perfilContexto.set(perfil)
+    try:
+        yield perfil
+    finally:
+        _perfilContexto.reset(token)
+        if sessao is not None:
+            sessao._perfil = anterior
+        if iniciouTracemalloc:
+            tracemalloc.stop()
@@ -0,0 +1,290 @@
+from dataclasses import dataclass, field
+from datetime import date
+from math import ceil
+
+import numpy as np
+import pandas as pd
+
+from .Lancamentos import Lancamento, PERIODICIDADES
+
+# Passo de cada periodicidade da API, em (meses, dias)
+PASSOS = {'daily': (0, 1), 'weekly': (0, 7), 'biweekly': (0, 14), 'monthly': (1, 0),
+          'bimonthly': (2, 0), 'trimonthly': (3, 0), 'semesterly': (6, 0), 'yearly': (12, 0)}
+
+COLUNAS_PROJECAO = ["serie", "description", "date", "amount_cents", "installment", "total_installments",
+                    "recurring", "account_id", "credit_card_id", "category_id"]
+
+
+@dataclass
+class Serie:
+    """
+    Representa uma série de lançamentos (parcelamento ou lançamento fixo) agrupada pela origem comum.
+
+    Attributes:
+        chave (tuple): Assinatura da série (descrição, conta, cartão, categoria, total de parcelas e origem:
+                       mês/dia da 1ª parcela, ou o dia ordinal da 1ª ocorrência conhecida nos fixos), mais um
+                       desempate se duas séries tiverem a mesma origem (ex: duas compras iguais no mesmo dia).
+        periodicidade (str): Periodicidade da série, nos valores da API (ex: `monthly`).
+        parcelada (bool): `True` para parcelamentos (total conhecido), `False` para lançamentos fixos (sem fim).
+        lancamentos (list[Lancamento]): Ocorrências conhecidas da série, ordenadas por data.
+    """
+
+    chave: tuple
+    periodicidade: str
+    parcelada: bool
+    lancamentos: list = field(default_factory=list)
+
+    @property
+    def ultimo(self) -> Lancamento:
+        """ Última ocorrência conhecida da série """
+        return self.lancamentos[-1]
+
+
+def _origem(dataLancamento: str, deslocamento: int, periodicidade: str) -> int:
+    """ Retorna o mês (ou dia ordinal) da 1ª ocorrência, recuando 'deslocamento' passos da data informada """
+
+    meses, dias = PASSOS[periodicidade]
+    d = date.fromisoformat(dataLancamento)
+    if meses:
+        return d.year * 12 + d.month - 1 - deslocamento * meses
+    return d.toordinal() - deslocamento * dias
+
+
+def _diasPasso(periodicidade: str) -> float:
+    meses, dias = PASSOS[periodicidade]
+    return meses * 30.4375 + dias
+
+
+def _desvioPasso(intervalo: int, periodicidade: str = None) -> tuple[str, float]:
+    """
+    Periodicidade cujo passo explica o intervalo (em dias) entre duas ocorrências e o desvio em relação a ele,
+    ou (`None`, `None`) se nenhum passo o explica.
+    """
+
+    candidata = periodicidade or min(PASSOS, key=lambda p: abs(_diasPasso(p) - intervalo))
+    desvio = abs(_diasPasso(candidata) - intervalo)
+    # Tolerância para meses de tamanhos diferentes e pequenos deslocamentos de data
+    if desvio <= max(1.0, 0.1 * _diasPasso(candidata)):
+        return candidata, desvio
+    return None, None
+
+
+def _encadeiaSeries(grupo: list[Lancamento], padrao: str, parcelada: bool) -> list[tuple[str, list[Lancamento]]]:
+    """
+    Separa lançamentos de mesma assinatura em séries pelo espaçamento das datas: cada ocorrência continua a série
+    cujo próximo vencimento esperado fica mais perto da sua data, ou inicia uma nova série.
+
+    Nos parcelamentos, o espaçamento é medido por parcela (dias entre as datas / parcelas entre elas) e uma série
+    só aceita parcelas de número maior que a sua última, de modo que compras homônimas (no mesmo mês ou em meses
+    diferentes) ficam em séries separadas antes de a periodicidade ser deduzida.
+
+    Returns:
+        list[tuple[str, list[Lancamento]]]: (periodicidade, ocorrências) de cada série; séries com uma única
+                                            ocorrência conhecida usam a periodicidade padrão.
+    """
+
+    cadeias: list[list] = []  # [periodicidade ou None, ocorrências]
+    for l in sorted(grupo, key=lambda l: (l.date, l.installment or 0)):
+        dia = date.fromisoformat(l.date)
+        melhor, melhorDesvio, melhorPeriodicidade = None, None, None
+        for cadeia in cadeias:
+            anterior = cadeia[1][-1]
+            passos = (l.installment or 1) - (anterior.installment or 1) if parcelada else 1
+            if passos <= 0:
+                continue
+            intervalo = (dia - date.fromisoformat(anterior.date)).days / passos
+            periodicidade, desvio = _desvioPasso(intervalo, cadeia[0])
+            # No empate, séries de periodicidade já conhecida têm prioridade sobre as de uma ocorrência só
+            if periodicidade is not None and (melhor is None or (desvio, cadeia[0] is None) < (melhorDesvio, melhor[0] is None)):
+                melhor, melhorDesvio, melhorPeriodicidade = cadeia, desvio, periodicidade
+        if melhor is None:
+            cadeias.append([None, [l]])
+        else:
+            melhor[0] = melhorPeriodicidade
+            melhor[1].append(l)
+
+    return [(periodicidade or padrao, ocorrencias) for periodicidade, ocorrencias in cadeias]
+
+
+def agrupaSeries(lancamentos: list[Lancamento], periodicidadePadrao: str = "mensal") -> list[Serie]:
+    """
+    Agrupa parcelamentos e lançamentos fixos em séries, pela origem comum de suas ocorrências.
+
+    Args:
+        lancamentos (list[Lancamento]): Lançamentos já obtidos (ex: via `getLancamentos`).
+        periodicidadePadrao (str, optional): Periodicidade assumida quando não for possível deduzi-la das ocorrências.
+                                             Deve ser uma das chaves de `PERIODICIDADES`. Padrão é "mensal".
+
+    Returns:
+        list[Serie]: Lista de séries encontradas. Lançamentos avulsos são ignorados.
+
+    Raises:
+        KeyError: Se a periodicidade padrão não for reconhecida.
+    """
+
+    padrao = PERIODICIDADES[periodicidadePadrao]
+
+    # 1º nível: assinatura da série (sem o valor, pois a 1ª parcela pode carregar o arredondamento)
+    assinaturas: dict[tuple, list[Lancamento]] = {}
+    for l in lancamentos:
+        if not l.recurring and (l.total_installments or 1) <= 1:
+            continue
+        assinatura = (l.description, l.account_id, l.credit_card_id, l.category_id,
+                      l.total_installments if not l.recurring else None)
+        assinaturas.setdefault(assinatura, []).append(l)
+
+    # 2º nível: o espaçamento das datas separa as séries homônimas e dá a periodicidade de cada uma; a chave
+    # termina pela origem (mês ou dia da 1ª parcela, ou o dia da 1ª ocorrência conhecida nos fixos)
+    results: list[Serie] = []
+    for assinatura, grupo in assinaturas.items():
+        parcelada = assinatura[-1] is not None
+        series: dict[tuple, Serie] = {}
+
+        for periodicidade, ocorrencias in _encadeiaSeries(grupo, padrao, parcelada):
+            primeira = ocorrencias[0]
+            if parcelada:
+                origem = _origem(primeira.date, (primeira.installment or 1) - 1, periodicidade)
+            else:
+                origem = date.fromisoformat(primeira.date).toordinal()
+            chave = assinatura + (origem,)
+            while chave in series:
+                # Duas compras iguais no mesmo dia têm a mesma origem
+                chave = chave + (len(series),)
+            series[chave] = Serie(chave=chave, periodicidade=periodicidade, parcelada=parcelada,
+                                  lancamentos=list(ocorrencias))
+
+        for serie in series.values():
+            serie.lancamentos.sort(key=lambda l: (l.date, l.installment or 0))
+            results.append(serie)
+
+    return results
+
+
+def projetaSeries(series: list[Serie], dataFim: str) -> pd.DataFrame:
+    """
+    Expande localmente as ocorrências futuras das séries até o horizonte informado, de forma vetorizada.
+
+    Args:
+        series (list[Serie]): Séries obtidas via `agrupaSeries`.
+        dataFim (str): Data final do horizonte de projeção no formato `YYYY-MM-DD`.
+
+    Returns:
+        pd.DataFrame: Uma linha por ocorrência projetada, com as colunas de `COLUNAS_PROJECAO`.
+                      Somente ocorrências posteriores à última conhecida de cada série são incluídas.
+    """
+
+    fim = np.datetime64(date.fromisoformat(dataFim), 'D')
+    blocos = []
+
+    for indice, serie in enumerate(series):
+        ultimo = serie.ultimo
+        meses, dias = PASSOS[serie.periodicidade]
+        base = np.datetime64(ultimo.date, 'D')
+
+        if serie.parcelada:
+            quantidade = (ultimo.total_installments or 0) - (ultimo.installment or 0)
+        else:
+            duracaoPasso = meses * 28 + dias
+            quantidade = ceil(int((fim - base).astype(int)) / duracaoPasso)
+        if quantidade <= 0:
+            continue
+
+        passos = np.arange(1, quantidade + 1)
+        if meses:
+            # Mantém o dia original, limitado ao último dia de cada mês (ex: 31/01 -> 28/02 -> 31/03)
+            dia = max(int(l.date[8:10]) for l in serie.lancamentos)
+            mes = base.astype('datetime64[M]') + passos * meses
+            diasNoMes = ((mes + 1).astype('datetime64[D]') - mes.astype('datetime64[D]')).astype(int)
+            datas = mes.astype('datetime64[D]') + (np.minimum(dia, diasNoMes) - 1)
+        else:
+            datas = base + passos * dias
+
+        dentro = datas <= fim
+        if not dentro.any():
+            continue
+
+        n = int(dentro.sum())
+        blocos.append(pd.DataFrame({
+            "serie": indice,
+            "description": ultimo.description,
+            "date": datas[dentro],
+            "amount_cents": ultimo.amount_cents,
+            "installment": (ultimo.installment or 0) + passos[dentro] if serie.parcelada else np.ones(n, dtype=int),
+            "total_installments": ultimo.total_installments,
+            "recurring": ultimo.recurring,
+            "account_id": ultimo.account_id,
+            "credit_card_id": ultimo.credit_card_id,
+            "category_id": ultimo.category_id}))
+
+    if not blocos:
+        return pd.DataFrame(columns=COLUNAS_PROJECAO)
+    return pd.concat(blocos, ignore_index=True).sort_values(["date", "serie"], ignore_index=True)
+
+
+def projetaLancamentos(lancamentos: list[Lancamento], dataFim: str, periodicidadePadrao: str = "mensal") -> list[Lancamento]:
+    """
+    Projeta localmente as ocorrências futuras de parcelamentos e lançamentos fixos, sem chamadas à API.
+
+    Args:
+        lancamentos (list[Lancamento]): Lançamentos já obtidos (ex: via `getLancamentos`).
+        dataFim (str): Data final do horizonte de projeção no formato `YYYY-MM-DD`.
+        periodicidadePadrao (str, optional): Periodicidade assumida quando não for possível deduzi-la. Padrão é "mensal".
+
+    Returns:
+        list[Lancamento]: Lançamentos projetados (sem `id`, não pagos), ordenados por data.
+    """
+
+    projecao = projetaSeries(agrupaSeries(lancamentos, periodicidadePadrao), dataFim)
+    results: list[Lancamento] = []
+
+    # 'object' devolve tipos nativos do Python em vez de escalares numpy
+    for i in projecao.astype(object).itertuples(index=False):
+        results.append(Lancamento(id=None,
+                                  description=i.description,
+                                  date=str(i.date)[:10],
+                                  paid=False,
+                                  amount_cents=i.amount_cents,
+                                  total_installments=i.total_installments,
+                                  installment=i.installment,
+                                  recurring=i.recurring,
+                                  account_id=i.account_id,
+                                  category_id=i.category_id,
+                                  tags=[],
+                                  notes=None,
+                                  attachments_count=0,
+                                  credit_card_id=i.credit_card_id,
+                                  credit_card_invoice_id=None,
+                                  paid_credit_card_id=None,
+                                  paid_credit_card_invoice_id=None,
+                                  oposite_transaction_id=None,
+                                  oposite_account_id=None,
+                                  created_at=None,
+                                  updated_at=None))
+    return results
+
+
+def fluxoCaixaProjetado(lancamentos: list[Lancamento], dataFim: str, periodicidadePadrao: str = "mensal") -> pd.DataFrame:
+    """
+    Calcula o fluxo de caixa mensal comprometido por parcelamentos e lançamentos fixos até o horizonte informado.
+
+    Args:
+        lancamentos (list[Lancamento]): Lançamentos já obtidos (ex: via `getLancamentos`).
+        dataFim (str): Data final do horizonte de projeção no formato `YYYY-MM-DD`.
+        periodicidadePadrao (str, optional): Periodicidade assumida quando não for possível deduzi-la. Padrão é "mensal".
+
+    Returns:
+        pd.DataFrame: Indexado por mês (`YYYY-MM`), com as colunas `receitas`, `despesas`, `saldo` e `acumulado` (em centavos).
+    """
+
+    projecao = projetaSeries(agrupaSeries(lancamentos, periodicidadePadrao), dataFim)
+    colunas = ["receitas", "despesas", "saldo", "acumulado"]
+    if projecao.empty:
+        return pd.DataFrame(columns=colunas, dtype="int64")
+
+    valores = projecao["amount_cents"].astype("int64")
+    fluxo = pd.DataFrame({"mes": pd.to_datetime(projecao["date"]).dt.strftime("%Y-%m"),
+                          "receitas": valores.clip(lower=0),
+                          "despesas": valores.clip(upper=0)}).groupby("mes").sum()
+    fluxo["saldo"] = fluxo["receitas"] + fluxo["despesas"]
+    fluxo["acumulado"] = fluxo["saldo"].cumsum()
+    return fluxo[colunas]
@@ -0,0 +1,116 @@
+import math
+from collections import Counter, defaultdict
+
+from .Duplicatas import normalizaDescricao
+from .Lancamentos import Lancamento
+
+
+def _termos(descricao: str) -> Counter:
+    """ Trigramas (com bordas) e palavras inteiras da descrição normalizada """
+
+    normalizada = normalizaDescricao(descricao)
+    termos = Counter()
+    for palavra in normalizada.split():
+        termos[f'#{palavra}'] += 1
+        estendida = f' {palavra} '
+        for i in range(len(estendida) - 2):
+            termos[estendida[i:i + 3]] += 1
+    return termos
+
+
+class SugestorCategorias:
+    """
+    Sugere `category_id` para novos lançamentos a partir do histórico, usando um índice invertido
+    de trigramas e palavras das descrições.
+
+    O índice é atualizado incrementalmente via `adiciona`, e cada consulta só percorre as listas dos termos
+    presentes na descrição buscada, sem varrer o histórico.
+
+    Examples:
+        >>> sugestor = SugestorCategorias(getLancamentos(conn, "2023-01-01", "2024-12-31"))
+        >>> sugestor.sugere("PAG*MERCADO SAO JOSE", conta=123)
+        [(4512, 0.91), (4520, 0.06)]
+    """
+
+    def __init__(self, lancamentos: list[Lancamento] = (), pesoConta: float = 0.5):
+        """
+        Args:
+            lancamentos (list[Lancamento], optional): Histórico inicial (ex: via `getLancamentos`).
+            pesoConta (float, optional): Peso extra dado às categorias já usadas na mesma conta. Padrão é 0.5.
+        """
+
+        self.pesoConta = pesoConta
+        self._indice: dict[str, Counter] = defaultdict(Counter)  # termo -> categoria -> ocorrências
+        self._totais: Counter = Counter()  # termo -> ocorrências (todas as categorias)
+        self._porConta: dict[int, Counter] = defaultdict(Counter)  # conta -> categoria -> lançamentos
+        self._documentos = 0
+
+        for l in lancamentos:
+            self.adiciona(l)
+
+    def __len__(self):
+        return self._documentos
+
+    def adiciona(self, lancamento: Lancamento):
+        """
+        Acrescenta um lançamento (ou JSON_params com `description` e `category_id`) ao índice.
+
+        Args:
+            lancamento (Lancamento | dict): Lançamento já categorizado. Itens sem categoria são ignorados.
+        """
+
+        if isinstance(lancamento, dict):
+            descricao, categoria = lancamento.get("description"), lancamento.get("category_id")
+            conta = lancamento.get("account_id") or lancamento.get("credit_card_id")
+        else:
+            descricao, categoria = lancamento.description, lancamento.category_id
+            conta = lancamento.account_id or lancamento.credit_card_id
+
+        if categoria is None:
+            return
+
+        for termo in _termos(descricao):
+            self._indice[termo][categoria] += 1
+            self._totais[termo] += 1
+        if conta is not None:
+            self._porConta[conta][categoria] += 1
+        self._documentos += 1
+
+    def sugere(self, descricao: str, conta: int = None, limite: int = 3) -> list[tuple[int, float]]:
+        """
+        Retorna as categorias mais prováveis para uma descrição.
+
+        Args:
+            descricao (str): Descrição do novo lançamento (ex: linha do extrato).
+            conta (int, optional): Conta ou cartão do lançamento, para favorecer as categorias usadas nele.
+            limite (int, optional): Quantidade máxima de sugestões. Padrão é 3.
+
+        Returns:
+            list[tuple[int, float]]: Pares (category_id, confiança), da mais para a menos provável.
+                                     A confiança é a fração da pontuação de todas as candidatas. Lista vazia se não houver termos em comum.
+        """
+
+        pontuacao: Counter = Counter()
+        for termo, frequencia in _termos(descricao).items():
+            categorias = self._indice.get(termo)
+            if not categorias:
+                continue
+
+            # Termos muito frequentes no histórico distinguem pouco (idf)
+            total = self._totais[termo]
+            idf = math.log(1 + self._documentos / total)
+            for categoria, ocorrencias in categorias.items():
+                pontuacao[categoria] += frequencia * idf * ocorrencias / total
+
+        if not pontuacao:
+            return []
+
+        if conta is not None and conta in self._porConta:
+            usoConta = self._porConta[conta]
+            totalConta = sum(usoConta.values())
+            for categoria in pontuacao:
+                pontuacao[categoria] *= 1 + self.pesoConta * usoConta[categoria] / totalConta
+
+        melhores = pontuacao.most_common(limite)
+        soma = sum(pontuacao.values())
+        return [(categoria, valor / soma) for categoria, valor in melhores]
@@ -0,0 +1,142 @@
+from dataclasses import dataclass
+
+from .API import API
+from .Lancamentos import Lancamento, getLancamento
+
+
+@dataclass
+class Transferencia:
+    """
+    Representa uma transferência entre contas, formada pelas duas pernas (lançamentos) ligadas entre si.
+
+    Attributes:
+        saida (Lancamento): Perna de saída (valor negativo), na conta de origem.
+        entrada (Lancamento): Perna de entrada (valor positivo), na conta de destino.
+    """
+
+    saida: Lancamento
+    entrada: Lancamento
+
+    @property
+    def valor_cents(self) -> int:
+        """ Valor transferido em centavos (sempre positivo) """
+        return abs(self.entrada.amount_cents)
+
+    def to_dict(self):
+        """ Retorna uma representação em JSON de uma Transferência """
+        return {"saida": self.saida.to_dict(),
+                "entrada": self.entrada.to_dict()}
+
+    @classmethod
+    def json(cls, obj):
+        """ Útil para chamadas excepcionais. Ex: json.dumps(default=Classe.json)"""
+        return obj.to_dict()
+
+
+class IndiceTransferencias:
+    """
+    Índice que pareia as duas pernas das transferências em uma única passagem pelos lançamentos.
+
+    Attributes:
+        pares (list[Transferencia]): Transferências com ambas as pernas encontradas.
+        orfaos (list[Lancamento]): Pernas cuja perna oposta não estava entre os lançamentos indexados
+                                   (normalmente por estar fora da janela de datas consultada).
+    """
+
+    def __init__(self, lancamentos: list[Lancamento]):
+        """
+        Args:
+            lancamentos (list[Lancamento]): Lançamentos já obtidos (ex: via `getLancamentos`).
+        """
+
+        self.pares: list[Transferencia] = []
+        self._porId: dict[int, Transferencia] = {}
+        self._pendentes: dict[int, Lancamento] = {}
+
+        for l in lancamentos:
+            self._indexa(l)
+
+    def _indexa(self, lancamento: Lancamento):
+        if not lancamento.oposite_transaction_id:
+            return
+
+        oposta = self._pendentes.pop(lancamento.oposite_transaction_id, None)
+        if oposta is None:
+            self._pendentes[lancamento.id] = lancamento
+            return
+
+        if lancamento.amount_cents < 0:
+            par = Transferencia(saida=lancamento, entrada=oposta)
+        else:
+            par = Transferencia(saida=oposta, entrada=lancamento)
+        self.pares.append(par)
+        self._porId[lancamento.id] = par
+        self._porId[oposta.id] = par
+
+    @property
+    def orfaos(self) -> list[Lancamento]:
+        """ Pernas ainda sem a perna oposta indexada """
+        return list(self._pendentes.values())
+
+    def ehTransferencia(self, lancamento: Lancamento) -> bool:
+        """ Indica se o lançamento é uma perna de transferência (pareada ou órfã) """
+        return lancamento.id in self._porId or lancamento.id in self._pendentes
+
+    def par(self, idLancamento: int) -> Transferencia:
+        """ Retorna a transferência da qual o lançamento faz parte, ou `None` se não estiver pareado """
+        return self._porId.get(idLancamento)
+
+    def buscaPernasFaltantes(self, sessao: API) -> list[Transferencia]:
+        """
+        Busca na API somente as pernas opostas dos órfãos, completando os pares.
+
+        Args:
+            sessao (API): Sessão autenticada para realizar chamadas à API.
+
+        Returns:
+            list[Transferencia]: As transferências que foram completadas por esta busca.
+        """
+
+        quantidade = len(self.pares)
+        for orfao in self.orfaos:
+            if orfao.id in self._pendentes:
+                self._indexa(getLancamento(sessao, orfao.oposite_transaction_id))
+        return self.pares[quantidade:]
+
+    def excluiTransferencias(self, lancamentos: list[Lancamento]) -> list[Lancamento]:
+        """
+        Remove as transferências internas (pareadas ou órfãs) de uma lista de lançamentos.
+
+        Args:
+            lancamentos (list[Lancamento]): Lista de lançamentos a ser filtrada.
+
+        Returns:
+            list[Lancamento]: Lançamentos que não são pernas de transferência.
+        """
+
+        return [l for l in lancamentos if not self.ehTransferencia(l)]
+
+    def colapsaTransferencias(self, lancamentos: list[Lancamento]) -> list:
+        """
+        Substitui as duas pernas de cada transferência pareada por um único objeto `Transferencia`.
+
+        Args:
+            lancamentos (list[Lancamento]): Lista de lançamentos a ser colapsada.
+
+        Returns:
+            list: Lista na ordem original, com `Lancamento` para os demais itens e `Transferencia` no lugar
+                  da primeira perna encontrada de cada par. Órfãos são mantidos como `Lancamento`.
+        """
+
+        results = []
+        vistos: set[int] = set()
+
+        for l in lancamentos:
+            par = self._porId.get(l.id)
+            if par is None:
+                results.append(l)
+            elif id(par) not in vistos:
+                vistos.add(id(par))
+                results.append(par)
+
+        return results
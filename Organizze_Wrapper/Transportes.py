@@ -0,0 +1,331 @@
+"""
+Camada de transporte plugável da `API`.
+
+Um transporte recebe (método, URL, parâmetros) e devolve uma `Resposta`; a `API` cuida de autenticação,
+cabeçalhos, tratamento de status e medição de fases. Implementações incluídas:
+
+- `TransporteRequests`: HTTP/1.1 via `requests.Session` (padrão; compatível com cassetes e hooks do requests).
+- `TransporteHTTP2`: HTTP/2 via httpx, multiplexando requisições concorrentes em uma única conexão.
+- `TransporteMemoria`: respostas registradas em memória (ou lidas de um cassete), para testes sem rede.
+"""
+
+import abc
+import base64
+import codecs
+import json
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+import requests
+from requests.models import RequestEncodingMixin
+
+
+class Resposta:
+    """
+    Resposta HTTP mínima e independente do transporte, usada internamente pela `API`.
+
+    Attributes:
+        status_code (int): Código de status HTTP.
+        reason (str): Frase de status (ex: "Not Found").
+        headers (dict): Cabeçalhos da resposta.
+        url (str): URL requisitada.
+    """
+
+    def __init__(self, status_code: int, reason: str, headers, url: str, conteudo: bytes = None,
+                 blocos=None, fechar=None, encoding: str = None):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.url = url
+        self.encoding = encoding or 'utf-8'
+        self._conteudo = conteudo
+        self._blocos = blocos
+        self._fechar = fechar
+
+    @property
+    def content(self) -> bytes:
+        if self._conteudo is None:
+            self._conteudo = b"".join(self._blocos(64 * 1024)) if self._blocos else b""
+        return self._conteudo
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iteraTexto(self, tamanhoBloco: int):
+        """ Texto do corpo em blocos, conforme é recebido (ou de uma vez, se já estiver em memória) """
+
+        if self._conteudo is not None or self._blocos is None:
+            yield self.content.decode(self.encoding)
+            return
+        decodificador = codecs.getincrementaldecoder(self.encoding)(errors='replace')
+        for bloco in self._blocos(tamanhoBloco):
+            texto = decodificador.decode(bloco)
+            if texto:
+                yield texto
+        texto = decodificador.decode(b"", final=True)
+        if texto:
+            yield texto
+
+    def fecha(self):
+        if self._fechar is not None:
+            self._fechar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.fecha()
+
+
+class Transporte(abc.ABC):
+    """
+    Interface dos transportes. Erros de rede devem ser lançados como `requests.exceptions.RequestException`
+    (ou subclasses), para que a `API` os trate igualmente em qualquer transporte; inclusive os que ocorrerem
+    durante a leitura de um corpo em streaming.
+
+    `configura` e `requisita` são abstratos: um transporte incompleto falha já ao ser instanciado.
+    """
+
+    @abc.abstractmethod
+    def configura(self, usuario: str, senha: str, headers: dict):
+        """ Recebe da `API` as credenciais (autenticação básica) e os cabeçalhos fixos das requisições """
+
+    @abc.abstractmethod
+    def requisita(self, metodo: str, url: str, params: dict = None, stream: bool = False) -> Resposta:
+        """
+        Args:
+            metodo (str): Método HTTP ("GET", "POST", "PUT", "DELETE").
+            url (str): URL completa.
+            params (dict, optional): Parâmetros enviados na query string.
+            stream (bool, optional): Se `True`, o corpo é lido sob demanda (ver `Resposta.iteraTexto`).
+
+        Returns:
+            Resposta: A resposta, com qualquer status (a `API` decide o que é erro).
+        """
+
+    def fecha(self):
+        """ Libera conexões abertas """
+
+
+class TransporteRequests(Transporte):
+    """ Transporte HTTP/1.1 padrão, sobre o `requests.Session` fornecido pela `API` (ver `API.sessao`) """
+
+    def __init__(self, obtemSessao):
+        """
+        Args:
+            obtemSessao (Callable[[], requests.Session]): Função que devolve a sessão da thread atual.
+        """
+
+        self._obtemSessao = obtemSessao
+
+    def configura(self, usuario: str, senha: str, headers: dict):
+        # A sessão modelo da API já é criada com autenticação e cabeçalhos
+        pass
+
+    def requisita(self, metodo: str, url: str, params: dict = None, stream: bool = False) -> Resposta:
+        response = self._obtemSessao().request(metodo, url, params=params, stream=stream)
+        if stream:
+            return Resposta(response.status_code, response.reason, response.headers, response.url,
+                            blocos=response.iter_content, fechar=response.close, encoding=response.encoding)
+        return Resposta(response.status_code, response.reason, response.headers, response.url,
+                        conteudo=response.content, encoding=response.encoding)
+
+
+def _httpx():
+    try:
+        import httpx
+    except ImportError:
+        raise ImportError("O transporte HTTP/2 requer o pacote 'httpx[http2]'. "
+                          "Instale com: pip install Organizze_Wrapper[http2]")
+    return httpx
+
+
+@contextmanager
+def _errosRequests(httpx):
+    """ Converte os erros de rede do httpx nas exceções equivalentes do requests (ver `Transporte`) """
+
+    try:
+        yield
+    except httpx.TimeoutException as erro:
+        raise requests.exceptions.Timeout(str(erro)) from erro
+    except httpx.HTTPError as erro:
+        raise requests.exceptions.ConnectionError(str(erro)) from erro
+
+
+class TransporteHTTP2(Transporte):
+    """
+    Transporte HTTP/2 (httpx): requisições concorrentes de várias threads são multiplexadas como streams
+    em uma mesma conexão TCP+TLS, em vez de abrir uma conexão por requisição simultânea.
+
+    Examples:
+        >>> conn = API(email="...", token="...", transporte=TransporteHTTP2())
+        >>> with ThreadPoolExecutor(max_workers=32) as executor:
+        ...     list(executor.map(lambda j: getLancamentos(conn, *j), janelas))
+    """
+
+    def __init__(self, conexoes: int = 1, timeout: float = 60.0):
+        """
+        Args:
+            conexoes (int, optional): Máximo de conexões abertas; cada uma multiplexa várias requisições. Padrão é 1.
+            timeout (float, optional): Tempo máximo de cada operação de rede, em segundos. Padrão é 60.
+        """
+
+        self.conexoes = conexoes
+        self.timeout = timeout
+        self._cliente = None
+        self._configuracao: tuple = None
+        self._trava = threading.Lock()
+
+    def configura(self, usuario: str, senha: str, headers: dict):
+        _httpx()
+        with self._trava:
+            if self._cliente is not None:
+                self._cliente.close()
+                self._cliente = None
+            self._configuracao = (usuario, senha, dict(headers))
+
+    def _obtemCliente(self):
+        """ Devolve o cliente httpx, criando-o na primeira requisição (inclusive após `fecha`) """
+
+        httpx = _httpx()
+        with self._trava:
+            if self._cliente is None:
+                if self._configuracao is None:
+                    raise RuntimeError("Transporte HTTP/2 não configurado: informe-o à API via `API(transporte=...)`")
+                usuario, senha, headers = self._configuracao
+                self._cliente = httpx.Client(http2=True, auth=(usuario, senha), headers=headers, timeout=self.timeout,
+                                             limits=httpx.Limits(max_connections=self.conexoes))
+            return self._cliente
+
+    def requisita(self, metodo: str, url: str, params: dict = None, stream: bool = False) -> Resposta:
+        httpx = _httpx()
+
+        # Mesma codificação de parâmetros do requests, para o servidor receber exatamente a mesma query string
+        if params:
+            url = f"{url}{'&' if '?' in url else '?'}{RequestEncodingMixin._encode_params(params)}"
+
+        cliente = self._obtemCliente()
+        with _errosRequests(httpx):
+            response = cliente.send(cliente.build_request(metodo, url), stream=stream)
+
+        if stream:
+            def blocos(tamanho: int):
+                # A conexão pode cair ou expirar no meio do corpo, já fora do `send`
+                with _errosRequests(httpx):
+                    yield from response.iter_bytes(tamanho)
+
+            return Resposta(response.status_code, response.reason_phrase, response.headers, str(response.url),
+                            blocos=blocos, fechar=response.close, encoding=response.charset_encoding)
+        return Resposta(response.status_code, response.reason_phrase, response.headers, str(response.url),
+                        conteudo=response.content, encoding=response.charset_encoding)
+
+    def fecha(self):
+        """ Fecha as conexões; uma requisição posterior abre um novo cliente com a mesma configuração """
+
+        with self._trava:
+            if self._cliente is not None:
+                self._cliente.close()
+                self._cliente = None
+
+
+def _caminhoComando(caminho: str) -> str:
+    """ Remove o prefixo da API (ex: "/rest/v2") do caminho de uma URL, mantendo o caminho do comando """
+
+    return caminho[caminho.find("/rest/v2") + len("/rest/v2"):] if "/rest/v2" in caminho else caminho
+
+
+class TransporteMemoria(Transporte):
+    """
+    Transporte sem rede para testes: responde a partir de respostas registradas e guarda as requisições feitas.
+
+    Respostas registradas para o mesmo método e caminho são usadas em ordem; esgotadas, a última é repetida.
+
+    Attributes:
+        requisicoes (list[tuple]): Requisições recebidas, no formato (método, caminho com query, params).
+
+    Examples:
+        >>> transporte = TransporteMemoria()
+        >>> transporte.responde("GET", "/categories", [{"id": 1, "name": "Mercado", "color": "fff", "parent_id": None}])
+        >>> getCategorias(API(email="teste@exemplo.com", token="-", transporte=transporte))
+    """
+
+    def __init__(self):
+        self.requisicoes: list[tuple] = []
+        self._respostas: dict[tuple, deque] = defaultdict(deque)
+        self._trava = threading.Lock()
+
+    @classmethod
+    def deCassete(cls, caminho: str):
+        """
+        Cria um transporte que responde com o conteúdo de um cassete gravado via `gravaCassete`.
+
+        Args:
+            caminho (str): Caminho do arquivo de cassete.
+
+        Returns:
+            TransporteMemoria: O transporte com todas as respostas do cassete registradas.
+        """
+
+        from .Cassetes import carregaCassete
+
+        transporte = cls()
+        for entrada in carregaCassete(caminho):
+            if entrada["codificacao"] == "base64":
+                corpo = base64.b64decode(entrada["corpo"])
+            else:
+                corpo = entrada["corpo"].encode('utf-8')
+            url = urlsplit(entrada["url"])
+            caminho = _caminhoComando(url.path)
+            caminhoCompleto = f"{caminho}?{url.query}" if url.query else caminho
+            transporte._registra(entrada["metodo"], caminhoCompleto, entrada["status"], corpo, entrada["headers"])
+        return transporte
+
+    def responde(self, metodo: str, caminho: str, corpo=None, status: int = 200, headers: dict = None):
+        """
+        Registra uma resposta.
+
+        Args:
+            metodo (str): Método HTTP.
+            caminho (str): Caminho relativo à API, com a query string se houver (ex: "/transactions?start_date=...").
+            corpo (optional): Objeto serializado como JSON (ou `bytes`, enviado como está). Padrão é `None` (corpo vazio).
+            status (int, optional): Código de status. Padrão é 200.
+            headers (dict, optional): Cabeçalhos da resposta.
+        """
+
+        if corpo is None:
+            conteudo = b""
+        elif isinstance(corpo, bytes):
+            conteudo = corpo
+        else:
+            conteudo = json.dumps(corpo).encode('utf-8')
+        self._registra(metodo, caminho, status, conteudo, headers or {"Content-Type": "application/json"})
+
+    def _registra(self, metodo: str, caminho: str, status: int, conteudo: bytes, headers: dict):
+        with self._trava:
+            self._respostas[(metodo.upper(), caminho)].append((status, conteudo, headers))
+
+    def configura(self, usuario: str, senha: str, headers: dict):
+        pass
+
+    def requisita(self, metodo: str, url: str, params: dict = None, stream: bool = False) -> Resposta:
+        partes = urlsplit(url)
+        caminho = _caminhoComando(partes.path)
+        query = "&".join(q for q in (partes.query, RequestEncodingMixin._encode_params(params) if params else "") if q)
+        chave = (metodo.upper(), f"{caminho}?{query}" if query else caminho)
+
+        with self._trava:
+            self.requisicoes.append((chave[0], chave[1], params))
+            # Sem resposta para a query exata, vale a registrada para o caminho sem query
+            fila = self._respostas.get(chave) or self._respostas.get((chave[0], caminho))
+            if not fila:
+                raise requests.exceptions.ConnectionError(f"Nenhuma resposta registrada para {chave[0]} {chave[1]}")
+            status, conteudo, headers = fila.popleft() if len(fila) > 1 else fila[0]
+
+        try:
+            motivo = HTTPStatus(status).phrase
+        except ValueError:
+            motivo = ""
+        return Resposta(status, motivo, headers, url, conteudo=conteudo)
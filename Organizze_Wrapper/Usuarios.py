@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 
 from .API import API
+from .Perfil import fase
 
 @dataclass
 class Usuario:
@@ -53,11 +54,13 @@ def getUsuarios(sessao: API) -> list[Usuario]:
 
     results = []
     response = sessao._get("/users")
-    for i in response:
-        results.append(Usuario(id=i['id'],
-                               name=i['name'],
-                               email=i['email'],
-                               role=i['role']))
+    with fase("build", "/users", sessao):
+        for i in response:
+            results.append(Usuario(id=i['id'],
+                                   name=i['name'],
+                                   email=i['email'],
+                                   role=i['role']))
+    sessao.cache.guardaVarios(results)
     return results
 
 def getUsuario(sessao: API, idUsuario: int) -> Usuario:
@@ -72,8 +75,15 @@ def getUsuario(sessao: API, idUsuario: int) -> Usuario:
         Usuario: Um objeto `Usuario` contendo os dados do usuário obtido.
     """
 
+    usuario = sessao.cache.obtem(Usuario, idUsuario)
+    if usuario is not None:
+        return usuario
+
     response = sessao._get(f'/users/{idUsuario}')
-    return Usuario(id=response['id'],
-                   name=response['name'],
-                   email=response['email'],
-                   role=response['role'])
\ No newline at end of file
+    with fase("build", "/users/{id}", sessao):
+        usuario = Usuario(id=response['id'],
+                          name=response['name'],
+                          email=response['email'],
+                          role=response['role'])
+    sessao.cache.guarda(usuario)
+    return usuario
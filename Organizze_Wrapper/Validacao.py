@@ -0,0 +1,315 @@
+"""
+Validação local dos JSON_params enviados à API, antes de gastar uma requisição com um payload que voltaria com 4xx.
+
+Cada esquema é compilado uma única vez em uma lista de verificações simples (tipo, obrigatoriedade, opções,
+faixa, data), de modo que validar um item custa poucos microssegundos. `validaLote` aplica o mesmo esquema
+de forma vetorizada a um `pd.DataFrame` inteiro.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+TIPOS_CONTA = ("checking", "savings", "other")
+
+
+@dataclass(frozen=True)
+class Campo:
+    """
+    Regra de um campo do JSON_params.
+
+    Attributes:
+        tipos (tuple): Tipos aceitos (`bool` nunca é aceito como `int`).
+        obrigatorio (bool): Se o campo precisa estar presente e não nulo.
+        opcoes (tuple): Valores permitidos, se houver.
+        minimo (int): Menor valor permitido, se houver.
+        maximo (int): Maior valor permitido, se houver.
+        data (bool): Se o valor deve ser uma data no formato `YYYY-MM-DD`.
+        subcampos (str): Nome do esquema que valida o valor (um dict aninhado), se houver.
+        somenteLeitura (bool): Se o campo é preenchido pelo Organizze (ex: `id`, `created_at`). É aceito, para que
+                               o `to_dict()` de um objeto possa ser reenviado, mas não é validado nem enviado
+                               (ver `limpaPayload`).
+    """
+
+    tipos: tuple
+    obrigatorio: bool = False
+    opcoes: tuple = None
+    minimo: int = None
+    maximo: int = None
+    data: bool = False
+    subcampos: str = None
+    somenteLeitura: bool = False
+
+
+def _esquemas() -> dict:
+    """ Definição de todos os esquemas. Importa os módulos de recursos só aqui, para evitar importação circular """
+
+    from .Lancamentos import PERIODICIDADES
+
+    periodicidades = tuple(PERIODICIDADES.values())
+    texto, inteiro, booleano = (str,), (int,), (bool,)
+
+    camposLancamento = {
+        "description": Campo(texto, obrigatorio=True),
+        "date": Campo(texto, obrigatorio=True, data=True),
+        "amount_cents": Campo(inteiro, obrigatorio=True),
+        "paid": Campo(booleano),
+        "account_id": Campo(inteiro),
+        "credit_card_id": Campo(inteiro),
+        "credit_card_invoice_id": Campo(inteiro),
+        "paid_credit_card_id": Campo(inteiro),
+        "paid_credit_card_invoice_id": Campo(inteiro),
+        "oposite_account_id": Campo(inteiro),
+        "category_id": Campo(inteiro),
+        "notes": Campo(texto),
+        "tags": Campo((list,)),
+        "recurrence_attributes": Campo((dict,), subcampos="recorrencia"),
+        "installments_attributes": Campo((dict,), subcampos="parcelamento"),
+        "id": Campo(inteiro, somenteLeitura=True),
+        "total_installments": Campo(inteiro, somenteLeitura=True),
+        "installment": Campo(inteiro, somenteLeitura=True),
+        "recurring": Campo(booleano, somenteLeitura=True),
+        "attachments_count": Campo(inteiro, somenteLeitura=True),
+        "oposite_transaction_id": Campo(inteiro, somenteLeitura=True),
+        "created_at": Campo(texto, somenteLeitura=True),
+        "updated_at": Campo(texto, somenteLeitura=True),
+    }
+
+    return {
+        "lancamento": camposLancamento,
+        "lancamento_atualizacao": {**{nome: Campo(c.tipos, opcoes=c.opcoes, data=c.data, subcampos=c.subcampos,
+                                                  somenteLeitura=c.somenteLeitura)
+                                      for nome, c in camposLancamento.items()},
+                                   "update_future": Campo(booleano),
+                                   "update_all": Campo(booleano)},
+        "recorrencia": {"periodicity": Campo(texto, obrigatorio=True, opcoes=periodicidades)},
+        "parcelamento": {"periodicity": Campo(texto, obrigatorio=True, opcoes=periodicidades),
+                         "total": Campo(inteiro, obrigatorio=True, minimo=2, maximo=480)},
+        "conta": {"name": Campo(texto, obrigatorio=True),
+                  "type": Campo(texto, obrigatorio=True, opcoes=TIPOS_CONTA),
+                  "description": Campo(texto),
+                  "default": Campo(booleano)},
+        "conta_atualizacao": {"name": Campo(texto, obrigatorio=True)},
+        "cartao": {"name": Campo(texto, obrigatorio=True),
+                   "card_network": Campo(texto, obrigatorio=True),
+                   "due_day": Campo(inteiro, obrigatorio=True, minimo=1, maximo=31),
+                   "closing_day": Campo(inteiro, obrigatorio=True, minimo=1, maximo=31),
+                   "limit_cents": Campo(inteiro, obrigatorio=True, minimo=0)},
+        "cartao_atualizacao": {"name": Campo(texto),
+                               "card_network": Campo(texto),
+                               "due_day": Campo(inteiro, minimo=1, maximo=31),
+                               "closing_day": Campo(inteiro, minimo=1, maximo=31),
+                               "limit_cents": Campo(inteiro, minimo=0),
+                               "update_invoices_since": Campo(texto, data=True),
+                               "archived": Campo(booleano)},
+        "categoria": {"name": Campo(texto, obrigatorio=True),
+                      "parent_id": Campo(inteiro)},
+    }
+
+
+def _ehData(valor: str) -> bool:
+    try:
+        return len(valor) == 10 and date.fromisoformat(valor) is not None
+    except ValueError:
+        return False
+
+
+@lru_cache(maxsize=None)
+def _compila(nomeEsquema: str):
+    """ Transforma o esquema em uma função que devolve a lista de erros de um payload """
+
+    esquemas = _esquemas()
+    if nomeEsquema not in esquemas:
+        raise ValueError(f"Esquema desconhecido: '{nomeEsquema}'. Use um entre: {', '.join(esquemas)}")
+
+    esquema = esquemas[nomeEsquema]
+    conhecidos = frozenset(esquema)
+    obrigatorios = tuple(nome for nome, c in esquema.items() if c.obrigatorio)
+    exigeConta = nomeEsquema == "lancamento"
+
+    # Só as regras além do tipo entram no laço "lento"; a maioria dos campos para no isinstance
+    regras = tuple((nome, c.tipos, bool not in c.tipos, frozenset(c.opcoes) if c.opcoes else None,
+                    c.minimo, c.maximo, c.data, c.subcampos) for nome, c in esquema.items() if not c.somenteLeitura)
+
+    def valida(payload: dict) -> list[str]:
+        if not isinstance(payload, dict):
+            return [f"esperado um dict, recebido {type(payload).__name__}"]
+
+        erros = [f"campo desconhecido '{nome}'" for nome in payload.keys() - conhecidos]
+        erros += [f"campo obrigatório '{nome}' ausente" for nome in obrigatorios if payload.get(nome) is None]
+
+        for nome, tipos, rejeitaBool, opcoes, minimo, maximo, data, subcampos in regras:
+            valor = payload.get(nome)
+            if valor is None:
+                continue
+            if not isinstance(valor, tipos) or (rejeitaBool and isinstance(valor, bool)):
+                erros.append(f"'{nome}' deve ser {'/'.join(t.__name__ for t in tipos)}, recebido {type(valor).__name__}")
+                continue
+            if opcoes is not None and valor not in opcoes:
+                erros.append(f"'{nome}' inválido: '{valor}' (use um entre: {', '.join(sorted(opcoes))})")
+            if minimo is not None and valor < minimo:
+                erros.append(f"'{nome}' deve ser no mínimo {minimo}, recebido {valor}")
+            if maximo is not None and valor > maximo:
+                erros.append(f"'{nome}' deve ser no máximo {maximo}, recebido {valor}")
+            if data and not _ehData(valor):
+                erros.append(f"'{nome}' deve estar no formato YYYY-MM-DD, recebido '{valor}'")
+            if subcampos is not None:
+                erros += [f"{nome}.{erro}" for erro in _compila(subcampos)(valor)]
+
+        if exigeConta and payload.get("account_id") is None and payload.get("credit_card_id") is None:
+            erros.append("informe 'account_id' ou 'credit_card_id'")
+        return erros
+
+    return valida
+
+
+@lru_cache(maxsize=None)
+def _somenteLeitura(nomeEsquema: str) -> frozenset:
+    _compila(nomeEsquema)  # valida o nome do esquema
+    return frozenset(nome for nome, c in _esquemas()[nomeEsquema].items() if c.somenteLeitura)
+
+
+def errosPayload(nomeEsquema: str, payload: dict) -> list[str]:
+    """
+    Lista os problemas de um JSON_params, sem lançar exceção.
+
+    Args:
+        nomeEsquema (str): Esquema a aplicar (ex: "lancamento", "lancamento_atualizacao", "conta", "cartao_atualizacao").
+        payload (dict): JSON_params a ser verificado.
+
+    Returns:
+        list[str]: Mensagens de erro; lista vazia se o payload é válido.
+    """
+
+    return _compila(nomeEsquema)(payload)
+
+
+def limpaPayload(nomeEsquema: str, payload: dict) -> dict:
+    """
+    Remove do JSON_params os campos somente leitura do esquema (ex: `id`, `created_at`), que a API não altera.
+
+    Args:
+        nomeEsquema (str): Esquema a aplicar (ver `errosPayload`).
+        payload (dict): JSON_params a ser enviado (ex: o `to_dict()` de um `Lancamento`).
+
+    Returns:
+        dict: Uma cópia do payload sem os campos somente leitura.
+
+    Raises:
+        ValueError: Se o esquema não existir.
+    """
+
+    somenteLeitura = _somenteLeitura(nomeEsquema)
+    return {nome: valor for nome, valor in payload.items() if nome not in somenteLeitura}
+
+
+def validaPayload(nomeEsquema: str, payload: dict):
+    """
+    Verifica um JSON_params localmente antes do envio.
+
+    Args:
+        nomeEsquema (str): Esquema a aplicar (ver `errosPayload`).
+        payload (dict): JSON_params a ser verificado.
+
+    Raises:
+        ValueError: Com todos os problemas encontrados, se o payload for inválido.
+    """
+
+    erros = _compila(nomeEsquema)(payload)
+    if erros:
+        raise ValueError(f"JSON_params inválido ({nomeEsquema}): {'; '.join(erros)}")
+
+
+def validaLote(nomeEsquema: str, itens) -> dict:
+    """
+    Valida um lote inteiro antes de enviar qualquer item.
+
+    Para um `pd.DataFrame` (uma coluna por campo), as verificações de obrigatoriedade, opções, faixa e data
+    são feitas coluna a coluna, de forma vetorizada; para uma lista de dicts, cada item passa pelo validador compilado.
+
+    Args:
+        nomeEsquema (str): Esquema a aplicar (ver `errosPayload`).
+        itens (list[dict] | pd.DataFrame): Payloads do lote.
+
+    Returns:
+        dict: {posição ou índice do item: lista de erros}, apenas para os itens inválidos.
+
+    Examples:
+        >>> invalidos = validaLote("lancamento", payloads)
+        >>> enviaveis = [p for n, p in enumerate(payloads) if n not in invalidos]
+    """
+
+    if not isinstance(itens, pd.DataFrame):
+        valida = _compila(nomeEsquema)
+        results = {}
+        for n, item in enumerate(itens):
+            erros = valida(item)
+            if erros:
+                results[n] = erros
+        return results
+
+    esquema = _esquemas()[nomeEsquema]
+    _compila(nomeEsquema)  # valida o nome do esquema
+    erros = pd.Series([[] for _ in range(len(itens))], index=itens.index, dtype=object)
+
+    def marca(mascara, mensagem):
+        for i in itens.index[np.asarray(mascara, dtype=bool)]:
+            erros[i].append(mensagem)
+
+    for nome in itens.columns.difference(list(esquema)):
+        marca(itens[nome].notna(), f"campo desconhecido '{nome}'")
+
+    for nome, c in esquema.items():
+        if nome not in itens.columns:
+            if c.obrigatorio:
+                marca(np.ones(len(itens)), f"campo obrigatório '{nome}' ausente")
+            continue
+
+        if c.somenteLeitura:
+            continue
+
+        coluna = itens[nome]
+        presentes = coluna.notna()
+        if c.obrigatorio:
+            marca(~presentes, f"campo obrigatório '{nome}' ausente")
+
+        valores = coluna[presentes]
+        if c.tipos == (int,):
+            # Valor a valor, como no validador compilado: textos ("100") e booleanos são recusados. Floats inteiros
+            # são aceitos, pois uma coluna de inteiros com ausentes vira float64 no pandas
+            tipoInvalido = ~valores.map(lambda v: not isinstance(v, (bool, np.bool_)) and (
+                isinstance(v, (int, np.integer)) or (isinstance(v, (float, np.floating)) and float(v).is_integer())))
+        elif c.tipos == (bool,):
+            tipoInvalido = ~valores.map(lambda v: isinstance(v, (bool, np.bool_)))
+        else:
+            tipoInvalido = ~valores.map(lambda v: isinstance(v, c.tipos))
+        marca(presentes & tipoInvalido.reindex(itens.index, fill_value=False),
+              f"'{nome}' deve ser {'/'.join(t.__name__ for t in c.tipos)}")
+
+        validos = valores[~tipoInvalido]
+        if c.opcoes:
+            marca(presentes & (~validos.isin(c.opcoes)).reindex(itens.index, fill_value=False),
+                  f"'{nome}' inválido (use um entre: {', '.join(c.opcoes)})")
+        if c.minimo is not None:
+            marca((validos.astype("int64") < c.minimo).reindex(itens.index, fill_value=False),
+                  f"'{nome}' deve ser no mínimo {c.minimo}")
+        if c.maximo is not None:
+            marca((validos.astype("int64") > c.maximo).reindex(itens.index, fill_value=False),
+                  f"'{nome}' deve ser no máximo {c.maximo}")
+        if c.data:
+            datas = pd.to_datetime(validos, format="%Y-%m-%d", errors="coerce")
+            marca(datas.isna().reindex(itens.index, fill_value=False), f"'{nome}' deve estar no formato YYYY-MM-DD")
+        if c.subcampos:
+            valida = _compila(c.subcampos)
+            for i, valor in validos.items():
+                erros[i] += [f"{nome}.{erro}" for erro in valida(valor)]
+
+    if nomeEsquema == "lancamento":
+        conta = itens["account_id"].notna() if "account_id" in itens.columns else pd.Series(False, index=itens.index)
+        cartao = itens["credit_card_id"].notna() if "credit_card_id" in itens.columns else pd.Series(False, index=itens.index)
+        marca(~(conta | cartao), "informe 'account_id' ou 'credit_card_id'")
+
+    return {i: e for i, e in erros.items() if e}
@@ -0,0 +1,92 @@
+from dataclasses import fields
+
+
+def _leitor(campo: str):
+    def le(self):
+        try:
+            return self._bruto[campo]
+        except KeyError:
+            # AttributeError (e não KeyError), para que hasattr/getattr com padrão funcionem como no modelo
+            raise AttributeError(f"'{type(self).__name__}' sem o campo '{campo}' na resposta da API") from None
+    return le
+
+
+class Visao:
+    """
+    Base das visões: objetos leves, somente leitura, sobre o dict já decodificado da resposta da API.
+
+    Os campos têm os mesmos nomes do modelo e são lidos do dict no momento do acesso; o objeto do modelo
+    (ex: `Lancamento`) só é construído se `materializa` for chamado. `to_dict` e `Modelo.json` funcionam igual.
+
+    Warnings:
+        Uma visão não é instância do modelo (`isinstance(v, Lancamento)` é `False`) e não pode ser alterada:
+        use `materializa()` para obter um objeto editável.
+    """
+
+    __slots__ = ("_bruto", "_objeto")
+    _modelo: type = None
+    _campos: tuple = ()
+
+    def __init__(self, bruto: dict):
+        """
+        Args:
+            bruto (dict): Item da resposta da API, com os mesmos campos do modelo.
+        """
+
+        self._bruto = bruto
+        self._objeto = None
+
+    def materializa(self):
+        """ Constrói (uma única vez) e retorna o objeto completo do modelo """
+
+        if self._objeto is None:
+            self._objeto = self._modelo(**{campo: self._bruto[campo] for campo in self._campos})
+        return self._objeto
+
+    def to_dict(self):
+        """ Retorna a mesma representação em JSON do modelo """
+        return {campo: self._bruto[campo] for campo in self._campos}
+
+    @classmethod
+    def json(cls, obj):
+        """ Útil para chamadas excepcionais. Ex: json.dumps(default=Classe.json)"""
+        return obj.to_dict()
+
+    def __eq__(self, outro):
+        if isinstance(outro, (Visao, self._modelo)):
+            return self.to_dict() == outro.to_dict()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{campo}={self._bruto[campo]!r}' for campo in self._campos)})"
+
+    def __getstate__(self):
+        return self._bruto
+
+    def __setstate__(self, bruto):
+        self._bruto = bruto
+        self._objeto = None
+
+
+def visaoDe(modelo: type) -> type:
+    """
+    Cria a classe de visão de um modelo (um `@dataclass` cujos campos têm os nomes das chaves da API).
+
+    Args:
+        modelo (type): Classe do modelo (ex: `Lancamento`).
+
+    Returns:
+        type: Subclasse de `Visao` com uma propriedade somente leitura por campo do modelo.
+    """
+
+    campos = tuple(f.name for f in fields(modelo))
+    atributos = {"__slots__": (),
+                 "__module__": modelo.__module__,
+                 "__doc__": f"Visão somente leitura de um `{modelo.__name__}` (ver `Visao`).",
+                 "_modelo": modelo,
+                 "_campos": campos}
+    for campo in campos:
+        atributos[campo] = property(_leitor(campo))
+    return type(f"{modelo.__name__}Visao", (Visao,), atributos)
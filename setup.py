@@ -9,6 +9,16 @@ setup(
         "PyMultiHelper>=1.1.11",
         "pandas>=2.2.3"
     ],
+    extras_require={
+        "parquet": ["pyarrow>=15.0.0"],
+        "compressao": ["brotli>=1.1.0"],
+        "http2": ["httpx[http2]>=0.27"],
+        "testes": ["pytest>=8"]
+    },
+    entry_points={
+        "console_scripts": ["organizze-export=Organizze_Wrapper.CLI:main",
+                            "organizze-backfill=Organizze_Wrapper.Coordenador:main"]
+    },
     description='Biblioteca Python de Wrapper para a API do Organizze.com.br',
     author='Anderson',
     author_email='anderbytes@gmail.com',
@@ -0,0 +1,34 @@
+import pytest
+
+from Organizze_Wrapper.API import API
+from Organizze_Wrapper.Lancamentos import Lancamento
+from Organizze_Wrapper.Transportes import TransporteMemoria
+
+
+def jsonLancamento(id: int = 1, description: str = "Mercado", date: str = "2024-01-10", amount_cents: int = -1000,
+                   **campos) -> dict:
+    """ Item de `/transactions` como a API o devolve, com valores padrão para os campos não informados """
+
+    item = {"id": id, "description": description, "date": date, "paid": True, "amount_cents": amount_cents,
+            "total_installments": 1, "installment": 1, "recurring": False, "account_id": 1, "category_id": 10,
+            "tags": [], "notes": None, "attachments_count": 0, "credit_card_id": None, "credit_card_invoice_id": None,
+            "paid_credit_card_id": None, "paid_credit_card_invoice_id": None, "oposite_transaction_id": None,
+            "oposite_account_id": None, "created_at": "2024-01-01T10:00:00-03:00",
+            "updated_at": "2024-01-01T10:00:00-03:00"}
+    item.update(campos)
+    return item
+
+
+def novoLancamento(*args, **campos) -> Lancamento:
+    """ `Lancamento` com os mesmos valores padrão de `jsonLancamento` """
+    return Lancamento(**jsonLancamento(*args, **campos))
+
+
+@pytest.fixture
+def transporte():
+    return TransporteMemoria()
+
+
+@pytest.fixture
+def sessao(transporte):
+    return API(email="teste@exemplo.com", token="-", autor="testes", transporte=transporte)
@@ -0,0 +1,155 @@
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from requests import HTTPError
+
+import Organizze_Wrapper.API as moduloAPI
+from Organizze_Wrapper.API import API, _iteraArrayJSON
+from Organizze_Wrapper.Lancamentos import getLancamentos, iteraLancamentos
+from Organizze_Wrapper.Transportes import Resposta
+
+from tests.conftest import jsonLancamento
+
+
+def fatias(texto, tamanho):
+    return [texto[i:i + tamanho] for i in range(0, len(texto), tamanho)]
+
+
+def test_array_json_em_trechos_de_qualquer_tamanho():
+    itens = [jsonLancamento(i, f"Café {i} \"aspas\" ]}}[{{", notes="a,b") for i in range(5)]
+    texto = json.dumps(itens, ensure_ascii=False, indent=1)
+
+    for tamanho in (1, 2, 7, 64, len(texto)):
+        assert list(_iteraArrayJSON(fatias(texto, tamanho))) == itens
+
+
+def test_array_json_vazio_e_invalido():
+    assert list(_iteraArrayJSON(["", " [", " ]"])) == []
+
+    with pytest.raises(ValueError):
+        list(_iteraArrayJSON(['{"erro": 1}']))
+    with pytest.raises(ValueError):
+        list(_iteraArrayJSON(['[{"id": 1}, {"id"']))
+
+
+def test_array_json_entrega_itens_antes_do_fim():
+    trechos = iter(['[{"id": 1}, ', '{"id": 2}'])
+    itens = _iteraArrayJSON(trechos)
+
+    assert next(itens) == {"id": 1}
+    assert next(itens) == {"id": 2}
+    with pytest.raises(ValueError):
+        next(itens)
+
+
+def test_resposta_decodifica_utf8_partido_entre_blocos():
+    corpo = json.dumps([{"description": "Pão de açúcar"}], ensure_ascii=False).encode("utf-8")
+    resposta = Resposta(200, "OK", {}, "/", blocos=lambda tamanho: fatias(corpo, 1))
+
+    assert list(_iteraArrayJSON(resposta.iteraTexto(1))) == [{"description": "Pão de açúcar"}]
+
+
+def test_sessao_negocia_compressao(sessao):
+    assert "gzip" in sessao.sessao.headers["Accept-Encoding"]
+
+
+def test_iteraLancamentos_igual_a_getLancamentos(sessao, transporte):
+    itens = [jsonLancamento(i, date=f"2024-01-{i:02d}") for i in range(1, 6)]
+    transporte.responde("GET", "/transactions", itens)
+
+    assert list(iteraLancamentos(sessao, "2024-01-01", "2024-01-20")) == getLancamentos(sessao, "2024-01-01", "2024-01-20")
+    assert [r[1] for r in transporte.requisicoes] == ["/transactions?start_date=2024-01-01&end_date=2024-01-20"] * 2
+
+
+def test_iteraLancamentos_erro_http(sessao, transporte):
+    transporte.responde("GET", "/transactions", {"error": "x"}, status=500)
+
+    with pytest.raises(HTTPError):
+        list(iteraLancamentos(sessao, "2024-01-01", "2024-01-20"))
+
+
+@pytest.fixture
+def servidor(monkeypatch):
+    """ Servidor HTTP/1.1 local (keep-alive) que responde `[]` e registra a porta de origem de cada requisição """
+
+    portas = []
+
+    class Manipulador(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            portas.append(self.client_address[1])
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"[]")
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Manipulador)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    monkeypatch.setattr(moduloAPI, "API_URL", f"http://127.0.0.1:{servidor.server_address[1]}/rest/v2")
+    yield portas
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def test_email_invalido():
+    with pytest.raises(SyntaxError):
+        API(email="sem-arroba", token="-")
+
+
+def test_sessao_unica_ou_por_thread():
+    compartilhada = API(email="teste@exemplo.com", token="-")
+    porThread = API(email="teste@exemplo.com", token="-", porThread=True)
+
+    def sessoes(api):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            return list(executor.map(lambda _: (threading.get_ident(), api.sessao), range(16)))
+
+    assert {id(s) for _, s in sessoes(compartilhada)} == {id(compartilhada.sessao)}
+
+    porIdentificador = dict(sessoes(porThread))
+    assert len({id(s) for s in porIdentificador.values()}) == len(porIdentificador)
+    for s in porIdentificador.values():
+        assert s.adapters is porThread._modelo.adapters and s.hooks is porThread._modelo.hooks
+        assert s.headers == porThread._modelo.headers and s.headers is not porThread._modelo.headers
+
+
+def test_pool_dimensionado_e_keepalive():
+    adaptador = API(email="teste@exemplo.com", token="-", conexoes=16).sessao.get_adapter("https://api")
+    semKeepAlive = API(email="teste@exemplo.com", token="-", keepAlive=False).sessao.get_adapter("https://api")
+
+    assert adaptador._pool_maxsize == 16
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in adaptador.poolmanager.connection_pool_kw["socket_options"]
+    assert "socket_options" not in semKeepAlive.poolmanager.connection_pool_kw
+
+
+def test_threads_reaproveitam_as_conexoes_do_pool(servidor):
+    conn = API(email="teste@exemplo.com", token="-", conexoes=4, porThread=True)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        resultados = list(executor.map(lambda _: getLancamentos(conn, "2024-01-01", "2024-01-10"), range(40)))
+
+    assert resultados == [[]] * 40
+    assert len(servidor) == 40
+    assert len(set(servidor)) <= 4
+
+
+def test_chamadas_concorrentes_no_mesmo_transporte(sessao, transporte):
+    for i in range(1, 9):
+        transporte.responde("GET", f"/transactions?start_date=2024-01-0{i}&end_date=2024-01-0{i}",
+                            [jsonLancamento(i, date=f"2024-01-0{i}")])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        resultados = list(executor.map(lambda i: getLancamentos(sessao, f"2024-01-0{i}", f"2024-01-0{i}"),
+                                       list(range(1, 9)) * 4))
+
+    assert [[l.id for l in r] for r in resultados] == [[i] for i in range(1, 9)] * 4
+    assert len(transporte.requisicoes) == 32
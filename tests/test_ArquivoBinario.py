@@ -0,0 +1,47 @@
+import pytest
+
+from Organizze_Wrapper.ArquivoBinario import ArquivoLancamentos, gravaArquivo
+
+from tests.conftest import novoLancamento
+
+
+@pytest.fixture
+def lancamentos():
+    return [novoLancamento(1, "Café ☕", "2024-01-10", -750, tags=[{"name": "viagem"}], notes="com açúcar"),
+            novoLancamento(2, "Salário", "2024-01-05", 1_000_000, paid=False, recurring=True, tags=None,
+                           credit_card_id=3, account_id=None, created_at=None)]
+
+
+def test_ida_e_volta_preserva_todos_os_campos(tmp_path, lancamentos):
+    caminho = str(tmp_path / "historico.ozla")
+
+    assert gravaArquivo(lancamentos, caminho) == 2
+    with ArquivoLancamentos(caminho) as arquivo:
+        assert len(arquivo) == 2
+        assert list(arquivo) == lancamentos
+        assert arquivo[-1] == lancamentos[1]
+        with pytest.raises(IndexError):
+            arquivo[2]
+
+
+def test_colunas_sem_copia(tmp_path, lancamentos):
+    caminho = str(tmp_path / "historico.ozla")
+    gravaArquivo(lancamentos, caminho)
+
+    arquivo = ArquivoLancamentos(caminho)
+    assert list(arquivo.coluna("amount_cents")) == [-750, 1_000_000]
+    assert int(arquivo.colunaNumpy("id").sum()) == 3
+    with pytest.raises(KeyError):
+        arquivo.coluna("inexistente")
+    arquivo.fecha()
+
+
+def test_arquivo_vazio_e_arquivo_invalido(tmp_path):
+    vazio, invalido = str(tmp_path / "vazio.ozla"), tmp_path / "invalido.ozla"
+    gravaArquivo([], vazio)
+    invalido.write_bytes(b"XXXX" + bytes(60))
+
+    with ArquivoLancamentos(vazio) as arquivo:
+        assert len(arquivo) == 0 and list(arquivo) == []
+    with pytest.raises(ValueError):
+        ArquivoLancamentos(str(invalido))
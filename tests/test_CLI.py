@@ -0,0 +1,102 @@
+import json
+import sqlite3
+
+import pytest
+
+from Organizze_Wrapper import CLI
+from Organizze_Wrapper.API import API
+from Organizze_Wrapper.CLI import Checkpoint, Gravador, main, planejaTarefas
+
+from tests.conftest import jsonLancamento, novoLancamento
+
+
+@pytest.fixture
+def exporta(transporte, monkeypatch, tmp_path):
+    """ Executa `main` com as sessões ligadas ao `TransporteMemoria` e devolve o código de saída """
+
+    monkeypatch.setattr(CLI, "API", lambda **kwargs: API(**kwargs, transporte=transporte))
+    destino = tmp_path / "saida"
+
+    def executa(*argumentos):
+        return main(["--email", "teste@exemplo.com", "--token", "-", "--recursos", "lancamentos",
+                     "--destino", str(destino), *argumentos])
+    executa.destino = destino
+    return executa
+
+
+def test_checkpoint_grava_parametros_e_concluidas(tmp_path):
+    caminho = str(tmp_path / "checkpoint.json")
+    checkpoint = Checkpoint(caminho)
+    checkpoint.fixaParametros("2024-01-01", None, None)
+    checkpoint.conclui("a|lancamentos|x")
+
+    retomado = Checkpoint(caminho)
+    assert retomado.concluidas == {"a|lancamentos|x"}
+    assert (retomado.inicio, retomado.fim, retomado.janelaDias) == (checkpoint.inicio, checkpoint.fim, 30)
+
+    retomado.fixaParametros(None, None, None)
+    assert (retomado.inicio, retomado.janelaDias) == ("2024-01-01", 30)
+    for parametros in (("2024-01-02", None, None), (None, "2000-01-01", None), (None, None, 15)):
+        with pytest.raises(ValueError):
+            Checkpoint(caminho).fixaParametros(*parametros)
+
+
+def test_checkpoint_novo_exige_inicio(tmp_path):
+    with pytest.raises(ValueError):
+        Checkpoint(str(tmp_path / "checkpoint.json")).fixaParametros(None, "2024-01-31", None)
+
+
+def test_planeja_janelas_de_lancamentos(sessao):
+    tarefas = planejaTarefas(sessao, ["lancamentos", "contas"], "2024-01-01", "2024-01-25", diasJanela=10)
+
+    assert [(r, c) for r, c, _ in tarefas] == [("lancamentos", "2024-01-01_2024-01-10"),
+                                               ("lancamentos", "2024-01-11_2024-01-20"),
+                                               ("lancamentos", "2024-01-21_2024-01-25"),
+                                               ("contas", "todos")]
+
+
+def test_retomada_reaproveita_os_parametros_do_checkpoint(exporta, transporte):
+    transporte.responde("GET", "/transactions?start_date=2024-01-01&end_date=2024-01-10", [jsonLancamento(1)])
+    transporte.responde("GET", "/transactions?start_date=2024-01-11&end_date=2024-01-20", {"erro": 1}, status=500)
+    transporte.responde("GET", "/transactions?start_date=2024-01-11&end_date=2024-01-20", [jsonLancamento(2)])
+
+    assert exporta("--inicio", "2024-01-01", "--fim", "2024-01-20", "--janela-dias", "10") == 1
+
+    transporte.requisicoes.clear()
+    assert exporta() == 0
+
+    assert [r[1] for r in transporte.requisicoes] == ["/transactions?start_date=2024-01-11&end_date=2024-01-20"]
+    arquivos = sorted(p.name for p in (exporta.destino / "teste@exemplo.com" / "lancamentos").iterdir())
+    assert arquivos == ["2024-01-01_2024-01-10.jsonl", "2024-01-11_2024-01-20.jsonl"]
+
+
+def test_retomada_com_outra_janela_e_recusada(exporta, transporte):
+    transporte.responde("GET", "/transactions", [])
+    assert exporta("--inicio", "2024-01-01", "--fim", "2024-01-20") == 0
+
+    for argumentos in (("--janela-dias", "10"), ("--inicio", "2023-12-01"), ("--fim", "2024-02-01")):
+        with pytest.raises(SystemExit) as saida:
+            exporta(*argumentos)
+        assert saida.value.code == 2
+
+
+def test_gravador_jsonl_regrava_a_tarefa(tmp_path):
+    gravador = Gravador("jsonl", str(tmp_path))
+    gravador.grava("a@b.com", "lancamentos", "chave", [novoLancamento(1), novoLancamento(2)])
+    gravador.grava("a@b.com", "lancamentos", "chave", [novoLancamento(1)])
+
+    linhas = (tmp_path / "a@b.com" / "lancamentos" / "chave.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(l)["id"] for l in linhas] == [1]
+
+
+def test_gravador_sqlite_substitui_pela_chave_primaria(tmp_path):
+    gravador = Gravador("sqlite", str(tmp_path))
+    gravador.grava("a@b.com", "lancamentos", "x", [novoLancamento(1, tags=[{"name": "t"}]), novoLancamento(2)])
+    gravador.grava("a@b.com", "lancamentos", "x", [novoLancamento(1, "Outro")])
+    gravador.grava("c@d.com", "lancamentos", "x", [novoLancamento(1)])
+    gravador.fecha()
+
+    banco = sqlite3.connect(tmp_path / "organizze.sqlite")
+    linhas = banco.execute('SELECT credencial, id, description, tags FROM lancamentos ORDER BY credencial, id').fetchall()
+    banco.close()
+    assert linhas == [("a@b.com", 1, "Outro", "[]"), ("a@b.com", 2, "Mercado", "[]"), ("c@d.com", 1, "Mercado", "[]")]
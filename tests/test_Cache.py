@@ -0,0 +1,66 @@
+from Organizze_Wrapper.API import API
+from Organizze_Wrapper.Cache import CacheObjetos
+from Organizze_Wrapper.Categorias import Categoria, getCategoria, getCategorias
+from Organizze_Wrapper.Lancamentos import Lancamento, getLancamento, getLancamentos, updLancamento
+
+from tests.conftest import jsonLancamento, novoLancamento
+
+
+def categoria(id):
+    return Categoria(id=id, name=f"Categoria {id}", color="fff", parent_id=None)
+
+
+def test_cache_desligado_nao_guarda():
+    cache = CacheObjetos()
+    cache.guarda(categoria(1))
+
+    assert not cache and len(cache) == 0
+    assert cache.obtem(Categoria, 1) is None
+
+
+def test_descarta_o_menos_usado_e_separa_por_tipo():
+    cache = CacheObjetos(2)
+    cache.guardaVarios([categoria(1), categoria(2)])
+    assert cache.obtem(Categoria, 1) is not None
+    cache.guarda(categoria(3))
+
+    assert cache.obtem(Categoria, 2) is None
+    assert cache.obtem(Categoria, 1).id == 1
+    assert cache.obtem(Lancamento, 1) is None
+    assert (cache.acertos, cache.falhas) == (2, 2)
+
+
+def test_invalida_objeto_tipo_e_tudo():
+    cache = CacheObjetos(10)
+    cache.guardaVarios([categoria(1), categoria(2), novoLancamento(1)])
+
+    cache.invalida(Categoria, 1)
+    assert cache.obtem(Categoria, 1) is None and cache.obtem(Categoria, 2) is not None
+    cache.invalida(Categoria)
+    assert len(cache) == 1
+    cache.limpa()
+    assert len(cache) == 0
+
+
+def test_getter_individual_usa_o_que_a_lista_trouxe(transporte):
+    sessao = API(email="teste@exemplo.com", token="-", autor="testes", cache=100, transporte=transporte)
+    transporte.responde("GET", "/categories", [{"id": 5, "name": "Mercado", "color": "fff", "parent_id": None}])
+
+    lista = getCategorias(sessao)
+
+    assert getCategoria(sessao, 5) is lista[0]
+    assert [r[1] for r in transporte.requisicoes] == ["/categories"]
+
+
+def test_escrita_invalida_o_lancamento(transporte):
+    sessao = API(email="teste@exemplo.com", token="-", autor="testes", cache=100, transporte=transporte)
+    transporte.responde("GET", "/transactions", [jsonLancamento(1), jsonLancamento(2)])
+    transporte.responde("GET", "/transactions/1", jsonLancamento(1, "Atualizado"))
+    transporte.responde("PUT", "/transactions/1", {})
+
+    getLancamentos(sessao, "2024-01-01", "2024-01-10")
+    updLancamento(sessao, 1, {"description": "Atualizado"})
+
+    assert getLancamento(sessao, 1).description == "Atualizado"
+    assert getLancamento(sessao, 2).description == "Mercado"
+    assert [r[1] for r in transporte.requisicoes if r[0] == "GET"][1:] == ["/transactions/1"]
@@ -0,0 +1,72 @@
+import pandas as pd
+
+from Organizze_Wrapper.CalculoFaturas import ConfiguracaoAnterior, atribuiFaturas, calculaFatura, totaisPorFatura
+from Organizze_Wrapper.CartoesCredito import CartaoCredito
+
+from tests.conftest import novoLancamento
+
+
+def cartao(id=7, fechamento=10, vencimento=17):
+    return CartaoCredito(id=id, name="Cartão", description=None, card_network="visa", closing_day=fechamento,
+                         due_day=vencimento, limit_cents=100000, type="credit_card", archived=False, default=False,
+                         created_at="2023-01-01", updated_at="2023-01-01")
+
+
+def periodo(p):
+    return p.starting_date, p.closing_date, p.date
+
+
+def test_compra_no_dia_do_fechamento_vai_para_a_proxima_fatura():
+    assert periodo(calculaFatura(cartao(), "2024-01-09")) == ("2023-12-10", "2024-01-09", "2024-01-17")
+    assert periodo(calculaFatura(cartao(), "2024-01-10")) == ("2024-01-10", "2024-02-09", "2024-02-17")
+
+
+def test_vencimento_antes_do_fechamento_cai_no_mes_seguinte():
+    assert periodo(calculaFatura(cartao(fechamento=25, vencimento=5), "2024-01-30")) == ("2024-01-25", "2024-02-24", "2024-03-05")
+
+
+def test_dias_inexistentes_usam_o_ultimo_dia_do_mes():
+    fatura = calculaFatura(cartao(fechamento=31, vencimento=31), "2024-02-15")
+
+    assert periodo(fatura) == ("2024-01-31", "2024-02-28", "2024-03-31")
+
+
+def test_configuracao_anterior_vale_ate_a_alteracao():
+    anteriores = [ConfiguracaoAnterior(ate="2024-03-01", closing_day=20, due_day=28)]
+
+    assert calculaFatura(cartao(), "2024-02-25", anteriores).closing_date == "2024-03-19"
+    assert calculaFatura(cartao(), "2024-03-01", anteriores).closing_date == "2024-03-09"
+
+
+def test_lote_igual_ao_calculo_individual_e_descarta_sem_cartao():
+    cartoes = [cartao(7), cartao(8, fechamento=1, vencimento=8)]
+    lancamentos = [novoLancamento(1, date="2024-01-09", credit_card_id=7, account_id=None),
+                   novoLancamento(2, date="2024-01-10", account_id=1),
+                   novoLancamento(3, date="2024-01-31", credit_card_id=8, account_id=None),
+                   novoLancamento(4, date="2024-01-10", credit_card_id=99, account_id=None)]
+
+    tabela = atribuiFaturas(lancamentos, cartoes)
+
+    assert tabela["id"].tolist() == [1, 3]
+    for linha in tabela.itertuples():
+        esperado = calculaFatura(next(c for c in cartoes if c.id == linha.credit_card_id), linha.date)
+        assert str(linha.invoice_date.date()) == esperado.date
+        assert str(linha.invoice_closing_date.date()) == esperado.closing_date
+
+
+def test_lote_vazio_e_dataframe():
+    assert list(atribuiFaturas([], [cartao()]).columns)[-3:] == ["invoice_starting_date", "invoice_closing_date", "invoice_date"]
+
+    tabela = pd.DataFrame({"date": ["2024-01-09"], "credit_card_id": [7.0], "amount_cents": [-100]})
+    assert atribuiFaturas(tabela, [cartao()])["credit_card_id"].dtype == "int64"
+
+
+def test_totais_por_fatura():
+    lancamentos = [novoLancamento(i, date=d, amount_cents=-100 * i, credit_card_id=7, account_id=None)
+                   for i, d in enumerate(("2024-01-02", "2024-01-09", "2024-01-10"), start=1)]
+
+    totais = totaisPorFatura(lancamentos, [cartao()])
+
+    assert [str(d.date()) for d in totais["invoice_date"]] == ["2024-01-17", "2024-02-17"]
+    assert totais["amount_cents"].tolist() == [-300, -300]
+    assert totais["quantidade"].tolist() == [2, 1]
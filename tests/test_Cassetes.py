@@ -0,0 +1,115 @@
+import gzip
+import json
+from datetime import timedelta
+
+import pytest
+import requests
+from requests import HTTPError
+from requests.structures import CaseInsensitiveDict
+
+from Organizze_Wrapper import Cassetes
+from Organizze_Wrapper.API import API, API_URL
+from Organizze_Wrapper.Cassetes import GravadorCassete, carregaCassete, gravaCassete, reproduzCassete
+from Organizze_Wrapper.Categorias import getCategorias
+from Organizze_Wrapper.Lancamentos import getLancamentos
+
+from tests.conftest import jsonLancamento
+
+CATEGORIAS = [{"id": 1, "name": "Mercado", "color": "fff", "parent_id": None}]
+JANELA = "/transactions?start_date=2024-01-01&end_date=2024-01-20"
+
+
+def resposta(metodo, caminho, corpo, status=200, duracao=0.25):
+    """ `requests.Response` como o transporte padrão a entregaria aos hooks """
+
+    response = requests.Response()
+    response.request = requests.Request(metodo, API_URL + caminho).prepare()
+    response.status_code = status
+    response.reason = "OK"
+    response.headers = CaseInsensitiveDict({"Content-Type": "application/json", "Content-Encoding": "gzip"})
+    response._content = corpo if isinstance(corpo, bytes) else json.dumps(corpo).encode("utf-8")
+    response.elapsed = timedelta(seconds=duracao)
+    return response
+
+
+@pytest.fixture
+def cassete(tmp_path):
+    caminho = str(tmp_path / "trafego.cassete")
+    gravador = GravadorCassete(caminho)
+    gravador.registra(resposta("GET", "/categories", CATEGORIAS))
+    gravador.registra(resposta("GET", JANELA, [jsonLancamento(1)]))
+    gravador.registra(resposta("GET", JANELA, [jsonLancamento(1), jsonLancamento(2)]))
+    gravador.fecha()
+    return caminho
+
+
+@pytest.fixture
+def conn():
+    return API(email="teste@exemplo.com", token="offline", autor="testes")
+
+
+def test_cassete_guarda_requisicao_resposta_e_tempo(cassete, tmp_path):
+    entradas = carregaCassete(cassete)
+
+    assert [(e["metodo"], e["url"], e["status"]) for e in entradas] == [("GET", API_URL + "/categories", 200),
+                                                                         ("GET", API_URL + JANELA, 200),
+                                                                         ("GET", API_URL + JANELA, 200)]
+    assert entradas[0]["duracao"] == 0.25
+    assert "Content-Encoding" not in entradas[0]["headers"]
+
+    binario = str(tmp_path / "binario.cassete")
+    gravador = GravadorCassete(binario)
+    gravador.registra(resposta("GET", "/anexo", b"\xff\x00\xfe"))
+    gravador.fecha()
+    assert carregaCassete(binario)[0]["codificacao"] == "base64"
+
+
+def test_cassete_invalido(tmp_path):
+    caminho = tmp_path / "outro.gz"
+    with gzip.open(caminho, "wt") as arquivo:
+        arquivo.write('{"versao": 99}\n')
+
+    with pytest.raises(ValueError):
+        carregaCassete(str(caminho))
+
+
+def test_reproducao_responde_em_ordem_e_repete_a_ultima(cassete, conn):
+    adaptadores = dict(conn.sessao.adapters)
+
+    with reproduzCassete(conn, cassete):
+        assert [c.id for c in getCategorias(conn)] == [1]
+        assert [l.id for l in getLancamentos(conn, "2024-01-01", "2024-01-20")] == [1]
+        assert [l.id for l in getLancamentos(conn, "2024-01-01", "2024-01-20")] == [1, 2]
+        assert [l.id for l in getLancamentos(conn, "2024-01-01", "2024-01-20")] == [1, 2]
+
+        with pytest.raises(HTTPError):
+            getLancamentos(conn, "2024-02-01", "2024-02-20")
+
+    assert conn.sessao.adapters == adaptadores
+
+
+def test_reproducao_com_latencia_escalada(cassete, conn, monkeypatch):
+    esperas = []
+    monkeypatch.setattr(Cassetes.time, "sleep", esperas.append)
+
+    with reproduzCassete(conn, cassete, latencia=0.5):
+        getCategorias(conn)
+    with reproduzCassete(conn, cassete, latencia="gravada"):
+        getCategorias(conn)
+    with reproduzCassete(conn, cassete):
+        getCategorias(conn)
+
+    assert esperas == [0.125, 0.25]
+
+
+def test_regravar_uma_reproducao_gera_o_mesmo_cassete(cassete, conn, tmp_path):
+    copia = str(tmp_path / "copia.cassete")
+
+    with reproduzCassete(conn, cassete), gravaCassete(conn, copia):
+        getCategorias(conn)
+        getLancamentos(conn, "2024-01-01", "2024-01-20")
+
+    assert conn.sessao.hooks["response"] == []
+    sem_duracao = lambda entradas: [{**e, "duracao": None} for e in entradas]
+    assert sem_duracao(carregaCassete(copia)) == sem_duracao(carregaCassete(cassete)[:2])
+
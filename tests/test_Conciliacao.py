@@ -0,0 +1,87 @@
+import pytest
+
+from Organizze_Wrapper.Conciliacao import concilia, conciliaConta, similaridade
+
+from tests.conftest import jsonLancamento, novoLancamento
+
+
+def externo(descricao, data, valor, **campos):
+    return {"description": descricao, "date": data, "amount_cents": valor, **campos}
+
+
+def test_similaridade():
+    assert similaridade("PADARIA SÃO JOÃO", "Padaria Sao Joao") == 1.0
+    assert similaridade("Padaria", "Posto Shell") < 0.2
+    assert similaridade("", "Padaria") == 0.0
+
+
+def test_concilia_por_valor_dentro_da_tolerancia():
+    lancamentos = [novoLancamento(1, "Mercado", "2024-01-11", -1000),
+                   novoLancamento(2, "Aluguel", "2024-01-05", -150000),
+                   novoLancamento(3, "Cinema", "2024-01-20", -4000)]
+    externos = [externo("Mercado", "2024-01-10", -1000),
+                externo("Aluguel", "2024-01-01", -150000),
+                externo("Padaria", "2024-01-15", -500)]
+
+    resultado = concilia(externos, lancamentos, toleranciaDias=3)
+
+    assert [(p.externo["description"], p.lancamento.id, p.diasDiferenca) for p in resultado.conciliados] == [
+        ("Mercado", 1, 1)]
+    assert [e["description"] for e in resultado.ausentes] == ["Aluguel", "Padaria"]
+    assert [l.id for l in resultado.sobrando] == [2, 3]
+    assert not resultado.completa
+
+
+def test_desempate_pela_descricao_e_similaridade_minima():
+    lancamentos = [novoLancamento(1, "Uber viagem", "2024-01-10", -2500),
+                   novoLancamento(2, "Padaria Central", "2024-01-10", -2500)]
+
+    resultado = concilia([externo("PADARIA CENTRAL LTDA", "2024-01-10", -2500)], lancamentos)
+    assert resultado.conciliados[0].lancamento.id == 2
+    assert resultado.conciliados[0].similaridade > 0.5
+
+    exigente = concilia([externo("Farmácia", "2024-01-10", -2500)], lancamentos[:1], similaridadeMinima=0.5)
+    assert exigente.conciliados == [] and len(exigente.ausentes) == 1
+
+
+def test_cada_lancamento_concilia_uma_unica_vez():
+    lancamentos = [novoLancamento(1, "Café", "2024-01-10", -800)]
+    externos = [externo("Café", "2024-01-10", -800), externo("Café", "2024-01-10", -800)]
+
+    resultado = concilia(externos, lancamentos)
+
+    assert len(resultado.conciliados) == 1 and len(resultado.ausentes) == 1 and resultado.sobrando == []
+
+
+def test_conta_e_cartao_com_o_mesmo_id_nao_se_misturam():
+    lancamentos = [novoLancamento(1, "Mercado", "2024-01-10", -1000, account_id=5),
+                   novoLancamento(2, "Mercado", "2024-01-10", -1000, account_id=None, credit_card_id=5)]
+    externos = [externo("Mercado", "2024-01-10", -1000)]
+
+    assert [p.lancamento.id for p in concilia(externos, lancamentos, conta=5).conciliados] == [1]
+    assert [p.lancamento.id for p in concilia(externos, lancamentos, cartao=5).conciliados] == [2]
+    with pytest.raises(ValueError):
+        concilia(externos, lancamentos, conta=5, cartao=5)
+    with pytest.raises(ValueError):
+        concilia(externos, lancamentos, toleranciaDias=-1)
+
+
+def test_conciliaConta_busca_o_periodo_do_extrato(sessao, transporte):
+    transporte.responde("GET", "/transactions", [jsonLancamento(1, "Mercado", "2024-01-10", -1000, account_id=5),
+                                                 jsonLancamento(2, "Loja", "2024-01-12", -3000, account_id=None,
+                                                                credit_card_id=5)])
+
+    resultado = conciliaConta(sessao, [externo("Loja", "2024-01-12", -3000)], cartao=5, toleranciaDias=2)
+
+    assert [p.lancamento.id for p in resultado.conciliados] == [2] and resultado.completa
+    assert [r[1] for r in transporte.requisicoes] == ["/transactions?start_date=2024-01-10&end_date=2024-01-14"]
+    assert conciliaConta(sessao, [], conta=5).completa
+    with pytest.raises(ValueError):
+        conciliaConta(sessao, [externo("Loja", "2024-01-12", -3000)])
+
+
+def test_to_dict():
+    resultado = concilia([externo("Mercado", "2024-01-10", -1000)], [novoLancamento(1, "Mercado", "2024-01-10", -1000)])
+
+    assert resultado.to_dict()["conciliados"][0]["lancamento"]["id"] == 1
+    assert resultado.to_dict()["conciliados"][0]["diasDiferenca"] == 0
@@ -0,0 +1,124 @@
+import json
+
+import pytest
+
+from Organizze_Wrapper import Coordenador
+from Organizze_Wrapper.API import API
+from Organizze_Wrapper.Coordenador import (ALUGADO, CONCLUIDO, FALHOU, PENDENTE, FilaShards, executaTrabalhador,
+                                           main, planejaBackfill)
+
+from tests.conftest import jsonLancamento
+
+CREDENCIAL = {"email": "teste@exemplo.com", "token": "-", "autor": "testes"}
+
+
+@pytest.fixture
+def fila(tmp_path):
+    with FilaShards(str(tmp_path / "fila.sqlite")) as fila:
+        yield fila
+
+
+def test_enfileira_sem_duplicar(fila):
+    assert fila.enfileira("a@b.com", [("contas", "todos"), ("lancamentos", "x")]) == 2
+    assert fila.enfileira("a@b.com", [("contas", "todos"), ("lancamentos", "y")]) == 1
+    assert fila.progresso()[PENDENTE] == 3
+
+
+def test_aluga_em_ordem_e_renova_so_do_dono(fila):
+    fila.enfileira("a@b.com", [("contas", "todos"), ("cartoes", "todos")])
+
+    primeiro = fila.aluga("t1", 60)
+    segundo = fila.aluga("t2", 60)
+
+    assert (primeiro[2], segundo[2]) == ("contas", "cartoes")
+    assert fila.aluga("t3", 60) is None
+    assert fila.renova(primeiro[0], "t1", 60) and not fila.renova(primeiro[0], "t2", 60)
+    assert fila.progresso()[ALUGADO] == 2 and fila.progresso()["trabalhadores"] == 2
+
+
+def test_aluguel_vencido_conta_como_tentativa_ate_falhar(fila):
+    fila.enfileira("a@b.com", [("contas", "todos")])
+
+    tentativas = []
+    for dono in ("t1", "t2", "t3"):
+        shard = fila.aluga(dono, -1, maxTentativas=3)
+        tentativas.append(shard and shard[4])
+
+    assert tentativas == [0, 1, 2]
+    assert fila.aluga("t4", -1, maxTentativas=3) is None
+    assert fila.falhas() == [{"credencial": "a@b.com", "recurso": "contas", "chave": "todos", "tentativas": 3,
+                              "erro": "aluguel expirado sem conclusão"}]
+
+    assert fila.reabreFalhas() == 1
+    assert fila.aluga("t5", 60, maxTentativas=3)[4] == 0
+
+
+def test_falha_reagenda_com_espera_e_depois_desiste(fila):
+    fila.enfileira("a@b.com", [("contas", "todos")])
+
+    idShard = fila.aluga("t1", 60)[0]
+    fila.falha(idShard, "t1", "erro", 1, maxTentativas=2, esperaBase=60)
+    assert fila.aluga("t1", 60) is None and fila.progresso()[PENDENTE] == 1
+
+    fila.falha(idShard, "t1", "erro", 1, maxTentativas=2, esperaBase=60)  # não é mais do t1: ignorado
+    fila._transacao("UPDATE shards SET disponivel = 0")
+    idShard = fila.aluga("t2", 60)[0]
+    fila.falha(idShard, "t2", "erro final", 2, maxTentativas=2, esperaBase=60)
+    assert fila.progresso()[FALHOU] == 1 and fila.falhas()[0]["erro"] == "erro final"
+
+
+def test_planeja_valida_recursos(fila):
+    with pytest.raises(ValueError):
+        planejaBackfill(fila, [CREDENCIAL], ["lancamentos", "extratos"], "2024-01-01", "2024-02-15")
+
+    assert planejaBackfill(fila, [CREDENCIAL], ["lancamentos", "contas"], "2024-01-01", "2024-02-15") == 3
+    assert planejaBackfill(fila, [CREDENCIAL], ["lancamentos", "contas"], "2024-01-01", "2024-02-15") == 0
+
+
+def test_trabalhador_executa_repete_e_conclui(tmp_path, transporte, monkeypatch):
+    monkeypatch.setattr(Coordenador, "API", lambda **kwargs: API(**kwargs, transporte=transporte))
+    transporte.responde("GET", "/transactions?start_date=2024-01-01&end_date=2024-01-10", {"erro": 1}, status=503)
+    transporte.responde("GET", "/transactions?start_date=2024-01-01&end_date=2024-01-10", [jsonLancamento(1)])
+    caminho = str(tmp_path / "fila.sqlite")
+
+    with FilaShards(caminho) as fila:
+        fila.enfileira(CREDENCIAL["email"], [("lancamentos", "2024-01-01_2024-01-10"), ("lancamentos", "2024-02-01_2024-02-10")])
+
+    concluidos = executaTrabalhador(caminho, [CREDENCIAL], str(tmp_path / "saida"), maxTentativas=2, esperaBase=0.01)
+
+    with FilaShards(caminho) as fila:
+        progresso, falhas = fila.progresso(), fila.falhas()
+    assert concluidos == 1
+    assert (progresso[CONCLUIDO], progresso[FALHOU], progresso["registros"]) == (1, 1, 1)
+    assert falhas[0]["chave"] == "2024-02-01_2024-02-10" and falhas[0]["tentativas"] == 2
+    assert (tmp_path / "saida" / CREDENCIAL["email"] / "lancamentos" / "2024-01-01_2024-01-10.jsonl").exists()
+
+
+def test_main_abre_a_fila_uma_vez_e_fecha(tmp_path, monkeypatch, capsys):
+    abertas, fechadas = [], []
+
+    class FilaContada(FilaShards):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            abertas.append(self)
+
+        def fecha(self):
+            fechadas.append(self)
+            super().fecha()
+
+    monkeypatch.setattr(Coordenador, "FilaShards", FilaContada)
+    credenciais = tmp_path / "credenciais.json"
+    credenciais.write_text(json.dumps([CREDENCIAL]), encoding="utf-8")
+    caminho = str(tmp_path / "fila.sqlite")
+
+    assert main(["--fila", caminho, "planeja", "--credenciais", str(credenciais), "--recursos", "contas",
+                 "--inicio", "2024-01-01"]) == 0
+    assert main(["--fila", caminho, "reabre"]) == 0
+    assert main(["--fila", caminho, "progresso"]) == 0
+
+    assert len(abertas) == 3 and fechadas == abertas
+    assert json.loads(capsys.readouterr().out.splitlines()[-1])[PENDENTE] == 1
+
+    with pytest.raises(SystemExit):
+        main(["--fila", caminho, "planeja", "--credenciais", str(credenciais), "--recursos", "extratos",
+              "--inicio", "2024-01-01"])
@@ -0,0 +1,63 @@
+import json
+
+from Organizze_Wrapper.Diferencas import (Diferenca, camposAlterados, comparaLancamentos, comparaSnapshots,
+                                          gravaSnapshot, impressao)
+
+from tests.conftest import novoLancamento
+
+
+def conjuntos():
+    antes = [novoLancamento(1), novoLancamento(2, amount_cents=-500), novoLancamento(3, tags=[{"name": "a"}])]
+    depois = [novoLancamento(4), novoLancamento(2, amount_cents=-700, paid=False), novoLancamento(1),
+              novoLancamento(3, tags=[{"name": "a"}])]
+    return antes, depois
+
+
+def test_impressao_ignora_a_ordem_das_chaves():
+    assert impressao({"a": 1, "b": [1, 2]}) == impressao({"b": [1, 2], "a": 1})
+    assert impressao({"a": 1}) != impressao({"a": 2})
+
+
+def test_campos_alterados():
+    assert camposAlterados({"a": 1, "b": 2}, {"a": 1, "b": 3, "c": None}) == {"b": (2, 3)}
+    assert camposAlterados({"a": 1}, {"b": 1}) == {"a": (1, None), "b": (None, 1)}
+
+
+def test_compara_lancamentos():
+    antes, depois = conjuntos()
+
+    diferenca = comparaLancamentos(antes, depois)
+
+    assert [r["id"] for r in diferenca.adicionados] == [4]
+    assert diferenca.removidos == []
+    assert [(a.id, a.campos) for a in diferenca.alterados] == [(2, {"amount_cents": (-500, -700), "paid": (True, False)})]
+
+    removido = comparaLancamentos(antes, [r.to_dict() for r in antes[:2]])
+    assert [r["id"] for r in removido.removidos] == [3]
+    assert not comparaLancamentos(antes, list(reversed(antes)))
+    assert json.dumps(diferenca.to_dict())
+    assert not Diferenca()
+
+
+def test_snapshots_iguais_a_comparacao_em_memoria(tmp_path):
+    antes, depois = conjuntos()
+    antes.append(novoLancamento(5))
+    caminhoAntes, caminhoDepois = str(tmp_path / "antes.jsonl.gz"), str(tmp_path / "depois.jsonl")
+    gravaSnapshot(antes, caminhoAntes)
+    gravaSnapshot(iter(depois), caminhoDepois)
+
+    for particoes in (1, 3, 64):
+        eventos = list(comparaSnapshots(caminhoAntes, caminhoDepois, particoes=particoes))
+        assert sorted((tipo, item["id"] if isinstance(item, dict) else item.id) for tipo, item in eventos) == \
+               [("adicionado", 4), ("alterado", 2), ("removido", 5)]
+
+    alterado = next(item for tipo, item in comparaSnapshots(caminhoAntes, caminhoDepois) if tipo == "alterado")
+    assert alterado.campos == {"amount_cents": (-500, -700), "paid": (True, False)}
+
+
+def test_snapshot_com_outra_ordem_de_chaves_nao_e_alteracao(tmp_path):
+    registro = novoLancamento(1).to_dict()
+    (tmp_path / "antes.jsonl").write_text(json.dumps(registro) + "\n", encoding="utf-8")
+    (tmp_path / "depois.jsonl").write_text(json.dumps(dict(reversed(registro.items()))), encoding="utf-8")
+
+    assert list(comparaSnapshots(str(tmp_path / "antes.jsonl"), str(tmp_path / "depois.jsonl"))) == []
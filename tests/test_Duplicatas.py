@@ -0,0 +1,42 @@
+import pytest
+
+from Organizze_Wrapper.Duplicatas import IndiceDuplicatas, normalizaDescricao
+
+from tests.conftest import novoLancamento
+
+
+def payload(data="2024-01-10", descricao="Pão de Açúcar", valor=-1000, conta=1):
+    return {"description": descricao, "date": data, "amount_cents": valor, "account_id": conta}
+
+
+def test_normaliza_descricao():
+    assert normalizaDescricao("Pão  de Açúcar - 123") == "PAO DE ACUCAR 123"
+    assert normalizaDescricao(None) == ""
+
+
+def test_contem_compara_pela_impressao_normalizada():
+    indice = IndiceDuplicatas([novoLancamento(1, "PAO DE ACUCAR", "2024-01-10", -1000)])
+
+    assert indice.contem(payload())
+    assert not indice.contem(payload(valor=-1001))
+    assert not indice.contem(payload(conta=2))
+    assert not indice.contem(payload(data="2024-01-11"))
+
+
+def test_tolerancia_de_dias():
+    indice = IndiceDuplicatas([novoLancamento(1, "Pão de Açúcar", "2024-01-10", -1000)], toleranciaDias=2)
+
+    assert indice.contem(payload(data="2024-01-12"))
+    assert not indice.contem(payload(data="2024-01-13"))
+    with pytest.raises(ValueError):
+        IndiceDuplicatas(toleranciaDias=-1)
+
+
+def test_cada_existente_absorve_um_unico_item():
+    indice = IndiceDuplicatas([novoLancamento(1, "Pão de Açúcar", "2024-01-10", -1000)])
+
+    novos, duplicados = indice.filtraNovos([payload(), payload(), payload(data="2024-01-11")])
+
+    assert duplicados == [payload()]
+    assert novos == [payload(), payload(data="2024-01-11")]
+    assert len(indice) == 3
@@ -0,0 +1,64 @@
+import pandas as pd
+
+from Organizze_Wrapper.Enriquecimento import COLUNAS_ENRIQUECIDAS, TabelasReferencia
+
+from tests.conftest import novoLancamento
+
+CONTAS = [{"id": 1, "name": "Corrente", "description": None, "type": "checking", "default": True, "archived": False,
+           "created_at": "2023-01-01", "updated_at": "2023-01-01"},
+          {"id": 2, "name": "Poupança", "description": None, "type": "savings", "default": False, "archived": False,
+           "created_at": "2023-01-01", "updated_at": "2023-01-01"}]
+CARTOES = [{"id": 7, "name": "Visa", "description": None, "card_network": "visa", "closing_day": 10, "due_day": 17,
+            "limit_cents": 100000, "type": "credit_card", "archived": False, "default": False,
+            "created_at": "2023-01-01", "updated_at": "2023-01-01"}]
+CATEGORIAS = [{"id": 10, "name": "Alimentação", "color": "fff", "parent_id": None},
+              {"id": 11, "name": "Mercado", "color": "fff", "parent_id": 10},
+              {"id": 12, "name": "Hortifruti", "color": "fff", "parent_id": 11},
+              {"id": 20, "name": "Ciclo A", "color": "fff", "parent_id": 21},
+              {"id": 21, "name": "Ciclo B", "color": "fff", "parent_id": 20}]
+
+
+def referencias(sessao, transporte):
+    transporte.responde("GET", "/accounts", CONTAS)
+    transporte.responde("GET", "/credit_cards", CARTOES)
+    transporte.responde("GET", "/categories", CATEGORIAS)
+    return TabelasReferencia.carrega(sessao)
+
+
+def lancamentos():
+    return [novoLancamento(1, account_id=1, category_id=12),
+            novoLancamento(2, account_id=None, credit_card_id=7, category_id=10),
+            novoLancamento(3, account_id=1, oposite_account_id=2, category_id=99),
+            novoLancamento(4, account_id=5, category_id=20)]
+
+
+def test_carrega_com_tres_chamadas_e_resolve_a_categoria_raiz(sessao, transporte):
+    tabelas = referencias(sessao, transporte)
+
+    assert len(transporte.requisicoes) == 3
+    assert tabelas.raizes[12] == 10 and tabelas.raizes[10] == 10
+    assert tabelas.raizes[20] in (20, 21)
+
+
+def test_enriquece_por_linha(sessao, transporte):
+    registros = referencias(sessao, transporte).enriquece(lancamentos())
+
+    assert [(r["account_name"], r["credit_card_name"], r["oposite_account_name"], r["category_name"],
+             r["parent_category_id"], r["parent_category_name"]) for r in registros[:3]] == [
+        ("Corrente", None, None, "Hortifruti", 10, "Alimentação"),
+        (None, "Visa", None, "Alimentação", 10, "Alimentação"),
+        ("Corrente", None, "Poupança", None, None, None)]
+    assert registros[3]["account_name"] is None
+    assert len(transporte.requisicoes) == 3
+
+
+def test_tabela_igual_a_versao_por_linha(sessao, transporte):
+    tabelas = referencias(sessao, transporte)
+
+    tabela = tabelas.enriqueceTabela(lancamentos())
+    esperado = pd.DataFrame(tabelas.enriquece(lancamentos()))
+
+    for coluna in COLUNAS_ENRIQUECIDAS:
+        assert tabela[coluna].astype(object).where(tabela[coluna].notna(), None).tolist() == \
+               esperado[coluna].astype(object).where(esperado[coluna].notna(), None).tolist()
+    assert str(tabela["parent_category_id"].dtype) == "Int64"
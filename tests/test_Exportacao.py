@@ -0,0 +1,74 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.dataset  # noqa: E402
+
+from Organizze_Wrapper.Exportacao import exportaFaturasCartao, exportaLancamentos  # noqa: E402
+
+from tests.conftest import jsonLancamento  # noqa: E402
+
+JANELAS = {("2024-01-01", "2024-01-30"): [jsonLancamento(1, date="2024-01-10"), jsonLancamento(2, date="2024-01-30")],
+           ("2024-01-31", "2024-02-29"): [jsonLancamento(3, date="2024-01-31"), jsonLancamento(4, date="2024-02-05",
+                                                                                               account_id=2)]}
+
+
+def registraJanelas(transporte, janelas=JANELAS):
+    for (inicio, fim), itens in janelas.items():
+        transporte.responde("GET", f"/transactions?start_date={inicio}&end_date={fim}", itens)
+
+
+def ids(destino):
+    return sorted(pa.dataset.dataset(destino, partitioning="hive").to_table().column("id").to_pylist())
+
+
+@pytest.mark.parametrize("modo", ["anexar", "substituir"])
+def test_exporta_particionado_e_reexportar_nao_duplica(sessao, transporte, tmp_path, modo):
+    registraJanelas(transporte)
+
+    assert exportaLancamentos(sessao, "2024-01-01", "2024-02-29", str(tmp_path), modo=modo) == 4
+    assert exportaLancamentos(sessao, "2024-01-01", "2024-02-29", str(tmp_path), modo=modo) == 4
+
+    assert ids(tmp_path) == [1, 2, 3, 4]
+    assert (tmp_path / "ano=2024" / "mes=2" / "account_id=2").is_dir()
+
+
+def test_substituir_nao_apaga_o_que_janela_anterior_gravou_no_mesmo_mes(sessao, transporte, tmp_path):
+    # As duas janelas gravam na partição de janeiro da conta 1
+    registraJanelas(transporte)
+
+    exportaLancamentos(sessao, "2024-01-01", "2024-02-29", str(tmp_path), modo="substituir")
+
+    assert len(list((tmp_path / "ano=2024" / "mes=1" / "account_id=1").iterdir())) == 2
+    assert ids(tmp_path) == [1, 2, 3, 4]
+
+
+def test_substituir_remove_dados_antigos_das_particoes_tocadas(sessao, transporte, tmp_path):
+    registraJanelas(transporte)
+    exportaLancamentos(sessao, "2024-01-01", "2024-02-29", str(tmp_path))
+
+    transporte._respostas.clear()
+    registraJanelas(transporte, {("2024-01-01", "2024-01-30"): [jsonLancamento(1, date="2024-01-10")],
+                                 ("2024-01-31", "2024-02-29"): []})
+    exportaLancamentos(sessao, "2024-01-01", "2024-02-29", str(tmp_path), modo="substituir")
+
+    # A partição de janeiro da conta 1 foi regravada; a de fevereiro da conta 2 não foi tocada
+    assert ids(tmp_path) == [1, 4]
+
+
+def test_modo_e_formato_invalidos(sessao, transporte, tmp_path):
+    registraJanelas(transporte)
+
+    with pytest.raises(ValueError):
+        exportaLancamentos(sessao, "2024-01-01", "2024-02-29", str(tmp_path), modo="sobrescrever")
+    with pytest.raises(ValueError):
+        exportaLancamentos(sessao, "2024-01-01", "2024-02-29", str(tmp_path), formato="csv")
+
+
+def test_exporta_faturas_em_arrow(sessao, transporte, tmp_path):
+    transporte.responde("GET", "/credit_cards/7/invoices", [
+        {"id": 70, "date": "2024-03-10", "starting_date": "2024-02-01", "closing_date": "2024-03-01",
+         "amount_cents": -5000, "payment_amount_cents": 0, "balance_cents": -5000, "previous_balance_cents": 0,
+         "credit_card_id": 7}])
+
+    assert exportaFaturasCartao(sessao, str(tmp_path), idsCartao=[7], formato="arrow") == 1
+    assert [p.name for p in (tmp_path / "ano=2024" / "mes=3" / "credit_card_id=7").iterdir()] == ["faturas-7-0.arrow"]
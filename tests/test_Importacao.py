@@ -0,0 +1,137 @@
+import pytest
+from requests import HTTPError
+
+from Organizze_Wrapper import Importacao
+from Organizze_Wrapper.Importacao import ImportadorExtrato, MapeamentoColunas, importaExtrato, leCSV, leOFX
+from Organizze_Wrapper.Outbox import OutboxLancamentos
+
+from tests.conftest import jsonLancamento
+
+CONTA = {"id": 7, "name": "Conta Corrente", "description": None, "type": "checking", "default": True,
+         "archived": False, "created_at": "2024-01-01", "updated_at": "2024-01-01"}
+CARTAO = {"id": 9, "name": "Nubank", "description": None, "card_network": "mastercard", "closing_day": 3,
+          "due_day": 10, "limit_cents": 100000, "type": "credit_card", "archived": False, "default": False,
+          "created_at": "2024-01-01", "updated_at": "2024-01-01"}
+
+OFX = """OFXHEADER:100
+DATA:OFXSGML
+CHARSET:1252
+
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS>
+<BANKACCTFROM><BANKID>001<ACCTID>12345-6</BANKACCTFROM>
+<BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240110120000[-3:BRT]<TRNAMT>-12,50<FITID>A1<NAME>Padaria São João
+<STMTTRN><TRNTYPE>XFER<DTPOSTED>20240111<TRNAMT>-100.00<FITID>A2<MEMO>Transferência
+<BANKACCTTO><BANKID>237<ACCTID>99999-0</BANKACCTTO>
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240112<TRNAMT>50.00<FITID>A3<NAME>Pix recebido
+</BANKTRANLIST>
+</STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+def linha(descricao, valor="-10,00", data="10/01/2024"):
+    return {"data": data, "valor": valor, "descricao": descricao}
+
+
+def posts(transporte):
+    return [params for metodo, _, params in transporte.requisicoes if metodo == "POST"]
+
+
+def test_leOFX_mantem_a_conta_do_extrato(tmp_path):
+    caminho = tmp_path / "extrato.ofx"
+    caminho.write_bytes(OFX.encode("cp1252"))
+
+    transacoes = list(leOFX(str(caminho)))
+
+    assert [(t["id"], t["data"], t["valor"], t["conta"]) for t in transacoes] == [
+        ("A1", "2024-01-10", "-12.50", "12345-6"),
+        ("A2", "2024-01-11", "-100.00", "12345-6"),
+        ("A3", "2024-01-12", "50.00", "12345-6")]
+    assert transacoes[0]["descricao"] == "Padaria São João"
+    assert transacoes[1]["descricao"] == "Transferência"
+
+
+def test_leCSV_detecta_o_separador(tmp_path):
+    caminho = tmp_path / "extrato.csv"
+    caminho.write_text("data;valor;descricao\n10/01/2024;-1.234,56;Aluguel\n", encoding="utf-8-sig")
+
+    assert list(leCSV(str(caminho))) == [linha("Aluguel", "-1.234,56")]
+
+
+def test_importa_e_totais_somam_as_linhas_lidas(sessao, transporte, monkeypatch):
+    transporte.responde("POST", "/transactions", {})
+    enviaOriginal = Importacao.addLancamento
+
+    def addLancamento(sessao, payload):
+        if payload["description"] == "Recusado":
+            raise HTTPError("Erro HTTP: 422")
+        if payload["description"] == "Quebra":
+            raise RuntimeError("conexão perdida")
+        return enviaOriginal(sessao, payload)
+
+    monkeypatch.setattr(Importacao, "addLancamento", addLancamento)
+    linhas = [linha("Mercado"), linha("Sem valor", "abc"), linha("Recusado"), linha("Quebra"), linha("Farmácia")]
+
+    relatorio = ImportadorExtrato(sessao, conta=7, duplicatas=False).importa(linhas)
+
+    assert (relatorio.lidas, relatorio.enviadas, relatorio.invalidas, relatorio.falhas) == (5, 2, 1, 2)
+    assert relatorio.lidas == (relatorio.enviadas + relatorio.enfileiradas + relatorio.duplicadas
+                               + relatorio.invalidas + relatorio.falhas)
+    assert sorted((e.linha, e.tipo) for e in relatorio.erros) == [(2, "invalida"), (3, "falha"), (4, "falha")]
+    assert sorted(p["description"] for p in posts(transporte)) == ["Farmácia", "Mercado"]
+    assert all(p["account_id"] == 7 and p["amount_cents"] == -1000 for p in posts(transporte))
+
+
+def test_importa_ignora_duplicatas_existentes_e_do_proprio_extrato(sessao, transporte):
+    transporte.responde("GET", "/transactions?start_date=2024-01-01&end_date=2024-01-30",
+                        [jsonLancamento(1, "Mercado", "2024-01-10", -1000, account_id=7)])
+    transporte.responde("GET", "/transactions", [])
+    transporte.responde("POST", "/transactions", {})
+
+    relatorio = ImportadorExtrato(sessao, conta=7).importa([linha("Mercado"), linha("Mercado"), linha("Padaria")])
+
+    assert (relatorio.enviadas, relatorio.duplicadas) == (2, 1)
+    assert sorted(p["description"] for p in posts(transporte)) == ["Mercado", "Padaria"]
+
+
+def test_conta_ou_cartao(sessao, transporte):
+    transporte.responde("GET", "/accounts", [CONTA])
+    transporte.responde("GET", "/credit_cards", [CARTAO])
+
+    with pytest.raises(ValueError):
+        ImportadorExtrato(sessao, conta=7, cartao=9)
+    with pytest.raises(ValueError):
+        ImportadorExtrato(sessao, conta="Inexistente")
+
+    assert ImportadorExtrato(sessao, cartao="nubank").mapeia(linha("Loja"))["credit_card_id"] == 9
+
+    porColuna = ImportadorExtrato(sessao, MapeamentoColunas(conta="conta"), apelidos={"12345-6": "Conta Corrente"})
+    assert porColuna.mapeia({**linha("Loja"), "conta": "12345-6"})["account_id"] == 7
+    with pytest.raises(ValueError):
+        porColuna.mapeia(linha("Loja"))
+
+
+def test_chaves_do_outbox_nao_dependem_da_posicao(sessao, tmp_path):
+    caminho = str(tmp_path / "outbox.sqlite")
+    linhas = [linha("Mercado"), linha("Mercado"), linha("Padaria")]
+
+    with OutboxLancamentos(sessao, caminho) as outbox:
+        primeiro = ImportadorExtrato(sessao, conta=7, duplicatas=False, outbox=outbox).importa(linhas)
+        deslocado = ImportadorExtrato(sessao, conta=7, duplicatas=False, outbox=outbox).importa([linha("Novo")] + linhas)
+
+        assert (primeiro.enfileiradas, deslocado.enfileiradas) == (3, 4)
+        assert outbox.pendentes() == 4
+
+
+def test_importaExtrato_ofx_em_simulacao(sessao, transporte, tmp_path):
+    caminho = tmp_path / "extrato.ofx"
+    caminho.write_bytes(OFX.encode("cp1252"))
+    transporte.responde("GET", "/accounts", [CONTA])
+    transporte.responde("GET", "/credit_cards", [])
+
+    relatorio = importaExtrato(sessao, str(caminho), simulacao=True, duplicatas=False,
+                               apelidos={"12345-6": "Conta Corrente"})
+
+    assert (relatorio.lidas, relatorio.enviadas) == (3, 3)
+    assert posts(transporte) == []
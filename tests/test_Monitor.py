@@ -0,0 +1,135 @@
+import asyncio
+import threading
+from datetime import date
+
+import pytest
+
+from Organizze_Wrapper import Monitor
+from Organizze_Wrapper.Monitor import ADICIONADO, ALTERADO, REMOVIDO, MonitorAlteracoes
+
+from tests.conftest import jsonLancamento
+
+
+class Hoje(date):
+    """ `date` com `today()` controlado pelo teste """
+
+    atual = date(2024, 1, 20)
+
+    @classmethod
+    def today(cls):
+        return cls.atual
+
+
+@pytest.fixture
+def hoje(monkeypatch):
+    monkeypatch.setattr(Monitor, "date", Hoje)
+    Hoje.atual = date(2024, 1, 20)
+    return Hoje
+
+
+def meta(categoria, data, valor=10000):
+    return {"amount_in_cents": valor, "category_id": categoria, "date": data, "activity_type": 0, "total": 0,
+            "predicted_total": 0, "percentage": "0.0"}
+
+
+def test_eventos_de_lancamentos(sessao, transporte, hoje):
+    antigo = jsonLancamento(1, date="2024-01-15")
+    transporte.responde("GET", "/transactions", [antigo, jsonLancamento(2, date="2024-01-16")])
+    transporte.responde("GET", "/transactions", [{**antigo, "amount_cents": -2000, "updated_at": "2024-01-20T10:00:00-03:00"},
+                                                 jsonLancamento(3, date="2024-01-19")])
+    monitor = MonitorAlteracoes(sessao, diasRecentes=10, recursos=("lancamentos",))
+    recebidos = []
+    monitor.inscreve(recebidos.append)
+
+    assert monitor.verifica() == []
+    eventos = monitor.verifica()
+
+    assert sorted((e.tipo, e.chave) for e in eventos) == [(ADICIONADO, 3), (ALTERADO, 1), (REMOVIDO, 2)]
+    assert next(e for e in eventos if e.tipo == ALTERADO).campos["amount_cents"] == (-1000, -2000)
+    assert recebidos == eventos
+
+
+def test_janela_que_avanca_nao_gera_eventos(sessao, transporte, hoje):
+    transporte.responde("GET", "/transactions", [jsonLancamento(1, date="2024-01-10")])
+    transporte.responde("GET", "/transactions", [jsonLancamento(2, date="2024-01-25")])
+    monitor = MonitorAlteracoes(sessao, diasRecentes=10, recursos=("lancamentos",))
+
+    monitor.verifica()
+    hoje.atual = date(2024, 1, 25)
+
+    assert monitor.verifica() == []
+
+
+def test_metas_na_virada_do_mes(sessao, transporte, hoje):
+    hoje.atual = date(2024, 1, 31)
+    transporte.responde("GET", "/budgets/2024/1", [meta(5, "2024-01-01")])
+    transporte.responde("GET", "/budgets/2024/2", [meta(5, "2024-02-01", 20000)])
+    transporte.responde("GET", "/budgets/2024/2", [meta(5, "2024-02-01", 25000)])
+    monitor = MonitorAlteracoes(sessao, recursos=("metas",))
+
+    monitor.verifica()
+    hoje.atual = date(2024, 2, 1)
+    assert monitor.verifica() == []
+
+    eventos = monitor.verifica()
+    assert [(e.tipo, e.chave) for e in eventos] == [(ALTERADO, (5, "2024-02-01"))]
+
+
+def test_intervalo_adaptativo_e_recuo_em_falhas(sessao, transporte, hoje):
+    monitor = MonitorAlteracoes(sessao, recursos=("metas",), intervaloMinimo=1, intervaloMaximo=4, fatorRecuo=2)
+
+    for esperado in (2, 4, 4):
+        assert monitor.verifica() == []
+        assert monitor.intervalos == {"metas": esperado}
+
+    transporte.responde("GET", "/budgets/2024/1", [meta(5, "2024-01-01")])
+    transporte.responde("GET", "/budgets/2024/1", [meta(5, "2024-01-01", 1)])
+    monitor.verifica()
+    assert monitor.verifica() and monitor.intervalos == {"metas": 1}
+
+
+def test_inscricoes_por_recurso_e_fila(sessao, transporte, hoje):
+    transporte.responde("GET", "/budgets/2024/1", [])
+    transporte.responde("GET", "/budgets/2024/1", [meta(5, "2024-01-01")])
+    monitor = MonitorAlteracoes(sessao, recursos=("metas",))
+    soFaturas, todos = [], []
+    monitor.inscreve(soFaturas.append, recursos=("faturas",))
+    monitor.inscreve(lambda evento: 1 / 0)
+    monitor.inscreve(todos.append)
+
+    async def consome():
+        fila = monitor.fila()
+        monitor.verifica()
+        monitor.verifica()
+        evento = await asyncio.wait_for(fila.get(), timeout=1)
+        monitor.cancela(fila)
+        return evento
+
+    evento = asyncio.run(consome())
+    assert (evento.tipo, evento.chave) == (ADICIONADO, (5, "2024-01-01"))
+    assert soFaturas == [] and todos == [evento]
+
+
+def test_nao_inicia_enquanto_a_thread_anterior_vive(sessao, transporte, hoje):
+    transporte.responde("GET", "/budgets/2024/1", [])
+    monitor = MonitorAlteracoes(sessao, recursos=("metas",))
+    consultando, libera = threading.Event(), threading.Event()
+    consulta = monitor._fontes[0].consulta
+
+    def bloqueia():
+        consultando.set()
+        libera.wait(5)
+        return consulta()
+
+    monitor._fontes[0].consulta = bloqueia
+    monitor.inicia()
+    assert consultando.wait(5)
+
+    assert monitor.para(timeout=0.05) is False
+    with pytest.raises(RuntimeError):
+        monitor.inicia()
+
+    libera.set()
+    assert monitor.para(timeout=5) is True
+    monitor.inicia()
+    assert monitor.para(timeout=5) is True
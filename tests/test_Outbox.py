@@ -0,0 +1,176 @@
+import sqlite3
+
+import pytest
+from requests import HTTPError
+
+from Organizze_Wrapper.Outbox import CONCLUIDA, FALHOU, INCERTA, OutboxLancamentos
+
+from tests.conftest import jsonLancamento
+
+COMPRA = {"description": "Mercado", "date": "2024-01-10", "amount_cents": -1000, "account_id": 1}
+JANELA = "/transactions?start_date=2024-01-10&end_date=2024-01-10"
+
+
+@pytest.fixture
+def outbox(sessao, tmp_path):
+    outbox = OutboxLancamentos(sessao, str(tmp_path / "outbox.sqlite"), concorrencia=2, esperaBase=0.01)
+    yield outbox
+    outbox.para()
+
+
+def enviadas(transporte):
+    return [(metodo, caminho.split("?")[0]) for metodo, caminho, _ in transporte.requisicoes if metodo != "GET"]
+
+
+def simulaQueda(caminho, chave):
+    """ Deixa a operação como estava no diário quando o processo caiu no meio do envio """
+
+    banco = sqlite3.connect(caminho)
+    banco.execute("UPDATE operacoes SET estado = 'enviando' WHERE chave = ?", (chave,))
+    banco.commit()
+    banco.close()
+
+
+def test_envia_e_conclui(outbox, transporte):
+    transporte.responde("POST", "/transactions", {})
+
+    chave = outbox.addLancamento(COMPRA, chave="extrato-1")
+    assert outbox.addLancamento(COMPRA, chave="extrato-1") == chave
+    outbox.inicia()
+
+    assert outbox.aguarda(timeout=5)
+    assert outbox.estado(chave) == CONCLUIDA
+    assert enviadas(transporte) == [("POST", "/transactions")]
+
+
+def test_payload_invalido_nao_e_gravado(outbox):
+    with pytest.raises(ValueError):
+        outbox.addLancamento({**COMPRA, "amount_cents": "10"})
+    assert outbox.pendentes() == 0
+
+
+def test_aguarda_sem_descarga_falha_logo(outbox):
+    outbox.delLancamento(5)
+
+    with pytest.raises(RuntimeError):
+        outbox.aguarda(timeout=5)
+
+
+def test_alteracoes_do_mesmo_lancamento_saem_em_ordem(outbox, transporte):
+    transporte.responde("PUT", "/transactions/5", {}, status=503)
+    transporte.responde("PUT", "/transactions/5", {})
+    transporte.responde("DELETE", "/transactions/5", {})
+
+    put = outbox.updLancamento(5, {"description": "Novo"})
+    delete = outbox.delLancamento(5)
+    outbox.inicia()
+
+    assert outbox.aguarda(timeout=5)
+    assert (outbox.estado(put), outbox.estado(delete)) == (CONCLUIDA, CONCLUIDA)
+    assert enviadas(transporte) == [("PUT", "/transactions/5"), ("PUT", "/transactions/5"), ("DELETE", "/transactions/5")]
+
+
+def test_recusa_da_api_falha_e_pode_ser_reenviada(outbox, transporte):
+    transporte.responde("POST", "/transactions", {"errors": "x"}, status=422)
+    transporte.responde("POST", "/transactions", {})
+    transporte.responde("DELETE", "/transactions/9", {}, status=404)
+
+    chave = outbox.addLancamento(COMPRA)
+    exclusao = outbox.delLancamento(9)
+    outbox.inicia()
+    assert outbox.aguarda(timeout=5)
+
+    assert outbox.estado(exclusao) == CONCLUIDA
+    assert [f["chave"] for f in outbox.falhas()] == [chave]
+
+    outbox.reenvia(chave)
+    assert outbox.aguarda(timeout=5)
+    assert outbox.estado(chave) == CONCLUIDA
+
+
+def test_erro_inesperado_reagenda_sem_matar_a_descarga(outbox, transporte, monkeypatch):
+    transporte.responde("DELETE", "/transactions/5", {})
+    envia = outbox._envia
+    erros = iter([RuntimeError("resposta inválida")])
+
+    def enviaComErro(*args):
+        erro = next(erros, None)
+        if erro:
+            raise erro
+        envia(*args)
+    monkeypatch.setattr(outbox, "_envia", enviaComErro)
+
+    chave = outbox.delLancamento(5)
+    outbox.inicia()
+
+    assert outbox.aguarda(timeout=5)
+    assert outbox.estado(chave) == CONCLUIDA
+
+
+def test_esgota_tentativas(sessao, transporte, tmp_path):
+    transporte.responde("DELETE", "/transactions/5", {}, status=500)
+    outbox = OutboxLancamentos(sessao, str(tmp_path / "outbox.sqlite"), maxTentativas=2, esperaBase=0.01)
+
+    chave = outbox.delLancamento(5)
+    with outbox:
+        assert outbox.aguarda(timeout=5)
+
+    assert outbox.estado(chave) == FALHOU
+    assert outbox.falhas()[0]["tentativas"] == 2
+
+
+def test_criacao_interrompida_sem_lancamento_igual_e_reenviada(sessao, transporte, tmp_path):
+    caminho = str(tmp_path / "outbox.sqlite")
+    chave = OutboxLancamentos(sessao, caminho).addLancamento(COMPRA)
+    simulaQueda(caminho, chave)
+    transporte.responde("GET", JANELA, [jsonLancamento(1, "Mercado", "2024-01-10", -5000)])
+    transporte.responde("POST", "/transactions", {})
+
+    with OutboxLancamentos(sessao, caminho) as outbox:
+        assert outbox.aguarda(timeout=5)
+
+    assert outbox.estado(chave) == CONCLUIDA
+    assert enviadas(transporte) == [("POST", "/transactions")]
+
+
+def test_criacao_interrompida_com_lancamento_igual_fica_incerta(sessao, transporte, tmp_path):
+    caminho = str(tmp_path / "outbox.sqlite")
+    chave = OutboxLancamentos(sessao, caminho).addLancamento(COMPRA)
+    simulaQueda(caminho, chave)
+    transporte.responde("GET", JANELA, [jsonLancamento(1, "Mercado", "2024-01-10", -1000)])
+    transporte.responde("POST", "/transactions", {})
+
+    with OutboxLancamentos(sessao, caminho) as outbox:
+        assert outbox.aguarda(timeout=5)
+        assert outbox.estado(chave) == INCERTA
+        assert enviadas(transporte) == []
+        assert "[1]" in outbox.incertas()[0]["erro"]
+
+        # Era uma segunda compra idêntica: o usuário manda enviar mesmo assim
+        outbox.reenvia(chave)
+        assert outbox.aguarda(timeout=5)
+
+    assert outbox.estado(chave) == CONCLUIDA
+    assert enviadas(transporte) == [("POST", "/transactions")]
+
+
+def test_criacao_sem_resposta_e_conferida_antes_de_reenviar(outbox, transporte, monkeypatch):
+    transporte.responde("GET", JANELA, [jsonLancamento(1, "Mercado", "2024-01-10", -1000)])
+    envia = outbox._envia
+    quedas = iter([HTTPError("Ocorreu um erro durante a requisição: timeout")])
+
+    def enviaSemResposta(*args):
+        erro = next(quedas, None)
+        if erro:
+            raise erro
+        envia(*args)
+    monkeypatch.setattr(outbox, "_envia", enviaSemResposta)
+
+    chave = outbox.addLancamento(COMPRA)
+    outbox.inicia()
+    assert outbox.aguarda(timeout=5)
+
+    assert outbox.estado(chave) == INCERTA
+    outbox.descarta(chave)
+    assert outbox.estado(chave) == CONCLUIDA
+    assert enviadas(transporte) == []
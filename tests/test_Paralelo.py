@@ -0,0 +1,54 @@
+from Organizze_Wrapper.Lancamentos import getLancamentos
+from Organizze_Wrapper.Paralelo import CAMPOS_LANCAMENTO, _decodificaLancamentos, getLancamentosParalelo
+
+from tests.conftest import jsonLancamento
+
+JANELAS = {("2024-01-01", "2024-01-30"): [jsonLancamento(1, "Café ☕", "2024-01-05", tags=[{"name": "a"}]),
+                                          jsonLancamento(2, date="2024-01-20")],
+           ("2024-01-31", "2024-02-29"): [],
+           ("2024-03-01", "2024-03-15"): [jsonLancamento(3, date="2024-03-02", notes=None)]}
+
+
+def registraJanelas(transporte):
+    for (inicio, fim), itens in JANELAS.items():
+        transporte.responde("GET", f"/transactions?start_date={inicio}&end_date={fim}", itens)
+
+
+def test_worker_devolve_colunas():
+    colunas = _decodificaLancamentos(b'[{"id": 1, "description": "x", "date": "2024-01-01", "paid": true, '
+                                     b'"amount_cents": 5, "total_installments": 1, "installment": 1, '
+                                     b'"recurring": false, "account_id": 1, "category_id": 2, "tags": [], '
+                                     b'"notes": "", "attachments_count": 0, "credit_card_id": null, '
+                                     b'"credit_card_invoice_id": null, "paid_credit_card_id": null, '
+                                     b'"paid_credit_card_invoice_id": null, "oposite_transaction_id": null, '
+                                     b'"oposite_account_id": null, "created_at": "", "updated_at": ""}]')
+
+    assert list(colunas) == CAMPOS_LANCAMENTO
+    assert colunas["id"] == [1] and colunas["credit_card_id"] == [None]
+
+
+def test_paralelo_igual_ao_sequencial(sessao, transporte):
+    registraJanelas(transporte)
+
+    paralelo = getLancamentosParalelo(sessao, "2024-01-01", "2024-03-15", processos=2, conexoes=2)
+
+    assert paralelo == getLancamentos(sessao, "2024-01-01", "2024-03-15")
+    assert [l.id for l in paralelo] == [1, 2, 3]
+    assert paralelo[0].tags == [{"name": "a"}]
+
+
+def test_paralelo_colunar(sessao, transporte):
+    registraJanelas(transporte)
+
+    tabela = getLancamentosParalelo(sessao, "2024-01-01", "2024-03-15", processos=1, colunar=True)
+
+    assert list(tabela.columns) == CAMPOS_LANCAMENTO
+    assert tabela["id"].tolist() == [1, 2, 3]
+    assert tabela["description"].iloc[0] == "Café ☕"
+
+
+def test_paralelo_sem_lancamentos(sessao, transporte):
+    transporte.responde("GET", "/transactions", [])
+
+    assert getLancamentosParalelo(sessao, "2024-01-01", "2024-01-10", processos=1) == []
+    assert getLancamentosParalelo(sessao, "2024-01-01", "2024-01-10", processos=1, colunar=True).empty
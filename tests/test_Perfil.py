@@ -0,0 +1,122 @@
+import threading
+import tracemalloc
+
+from Organizze_Wrapper.API import API
+from Organizze_Wrapper.Categorias import getCategoria, getCategorias
+from Organizze_Wrapper.Lancamentos import filtraLancamentos
+from Organizze_Wrapper.Perfil import fase, perfilAtivo
+from Organizze_Wrapper.Transportes import TransporteMemoria
+
+from tests.conftest import novoLancamento
+
+CATEGORIA = {"id": 5, "name": "Mercado", "color": "fff", "parent_id": None}
+
+
+def outraSessao():
+    transporte = TransporteMemoria()
+    transporte.responde("GET", "/categories", [CATEGORIA])
+    return API(email="outro@exemplo.com", token="-", autor="testes", transporte=transporte)
+
+
+def test_perfil_mede_fases_por_endpoint(sessao, transporte):
+    transporte.responde("GET", "/categories/5", CATEGORIA)
+    transporte.responde("GET", "/categories/6", {**CATEGORIA, "id": 6})
+
+    with sessao.profile(memoria=False) as perfil:
+        getCategoria(sessao, 5)
+        getCategoria(sessao, 6)
+        filtraLancamentos([novoLancamento()], tituloBuscado="mercado")
+
+    assert {chave: m.chamadas for chave, m in perfil.medicoes.items()} == {("fetch", "/categories/{id}"): 2,
+                                                                           ("decode", "/categories/{id}"): 2,
+                                                                           ("build", "/categories/{id}"): 2,
+                                                                           ("filter", "filtraLancamentos"): 1}
+    assert set(perfil.porFase()) == {"fetch", "decode", "build", "filter"}
+    assert sessao._perfil is None
+
+
+def test_perfil_ignora_outras_sessoes_e_chamadas_fora_do_contexto(sessao, transporte):
+    transporte.responde("GET", "/categories", [CATEGORIA])
+    outra = outraSessao()
+
+    with sessao.profile(memoria=False) as perfil:
+        getCategorias(outra)
+    getCategorias(sessao)
+
+    assert perfil.medicoes == {}
+
+
+def test_perfil_da_sessao_vale_em_outras_threads(sessao, transporte):
+    transporte.responde("GET", "/categories", [CATEGORIA])
+
+    with sessao.profile(memoria=False) as perfil:
+        threads = [threading.Thread(target=getCategorias, args=(sessao,)) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert perfil.medicoes[("fetch", "/categories")].chamadas == 3
+
+
+def test_perfis_de_sessoes_diferentes_sao_isolados(sessao, transporte):
+    transporte.responde("GET", "/categories", [CATEGORIA])
+    outra = outraSessao()
+
+    with sessao.profile(memoria=False) as perfil, outra.profile(memoria=False) as perfilOutra:
+        getCategorias(sessao)
+        getCategorias(sessao)
+        getCategorias(outra)
+
+    assert perfil.medicoes[("fetch", "/categories")].chamadas == 2
+    assert perfilOutra.medicoes[("fetch", "/categories")].chamadas == 1
+
+
+def test_perfil_aninhado_restaura_o_anterior(sessao, transporte):
+    transporte.responde("GET", "/categories", [CATEGORIA])
+
+    with sessao.profile(memoria=False) as externo:
+        with sessao.profile(memoria=False) as interno:
+            getCategorias(sessao)
+        getCategorias(sessao)
+
+    assert interno.medicoes[("fetch", "/categories")].chamadas == 1
+    assert externo.medicoes[("fetch", "/categories")].chamadas == 1
+
+
+def test_fases_aninhadas_medem_o_pico_sem_zerar_o_do_tracemalloc():
+    tracemalloc.start()
+    try:
+        with perfilAtivo() as perfil:
+            with fase("filter", "externa"):
+                with fase("filter", "interna"):
+                    bloco = bytearray(1024 * 1024)
+                    del bloco
+
+        assert perfil.medicoes[("filter", "externa")].pico >= 1024 * 1024
+        assert perfil.medicoes[("filter", "interna")].pico >= 1024 * 1024
+
+        bloco = bytearray(4 * 1024 * 1024)
+        del bloco
+        picoAntes = tracemalloc.get_traced_memory()[1]
+        with perfilAtivo():
+            with fase("filter", "pequena"):
+                pass
+
+        assert tracemalloc.get_traced_memory()[1] >= picoAntes
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_relatorio_e_flamegraph(sessao, transporte, tmp_path):
+    transporte.responde("GET", "/categories", [CATEGORIA])
+    with sessao.profile(memoria=False) as perfil:
+        getCategorias(sessao)
+
+    assert "/categories" in perfil.relatorio()
+
+    caminho = tmp_path / "perfil.folded"
+    perfil.exportaFlamegraph(str(caminho))
+    linhas = caminho.read_text(encoding="utf-8").splitlines()
+    assert sorted(l.split(" ")[0] for l in linhas) == ["/categories;build", "/categories;decode", "/categories;fetch"]
@@ -0,0 +1,86 @@
+from Organizze_Wrapper.Projecoes import agrupaSeries, fluxoCaixaProjetado, projetaLancamentos
+
+from tests.conftest import novoLancamento
+
+
+def parcela(id, data, parcela, total, **campos):
+    return novoLancamento(id, "Loja", data, -3000, installment=parcela, total_installments=total, **campos)
+
+
+def fixo(id, data, descricao="Academia", **campos):
+    return novoLancamento(id, descricao, data, -9900, recurring=True, **campos)
+
+
+def test_parcelamento_projeta_parcelas_restantes_mensalmente():
+    lancamentos = [parcela(1, "2024-01-10", 1, 4), parcela(2, "2024-02-10", 2, 4)]
+
+    projetados = projetaLancamentos(lancamentos, "2025-12-31")
+
+    assert [(l.date, l.installment) for l in projetados] == [("2024-03-10", 3), ("2024-04-10", 4)]
+    assert all(l.id is None and not l.paid for l in projetados)
+
+
+def test_parcelamento_mantem_fim_do_mes():
+    lancamentos = [parcela(1, "2024-01-31", 1, 3)]
+
+    assert [l.date for l in projetaLancamentos(lancamentos, "2024-12-31")] == ["2024-02-29", "2024-03-31"]
+
+
+def test_parcelamentos_homonimos_em_meses_diferentes_sao_series_mensais_separadas():
+    lancamentos = [parcela(1, "2024-01-10", 1, 3), parcela(2, "2024-02-10", 2, 3),
+                   parcela(3, "2024-06-10", 1, 3), parcela(4, "2024-07-10", 2, 3)]
+
+    series = agrupaSeries(lancamentos)
+
+    assert sorted([l.id for l in s.lancamentos] for s in series) == [[1, 2], [3, 4]]
+    assert {s.periodicidade for s in series} == {"monthly"}
+    assert [l.date for l in projetaLancamentos(lancamentos, "2025-12-31")] == ["2024-03-10", "2024-08-10"]
+
+
+def test_parcelamentos_homonimos_no_mesmo_mes_nao_viram_semanais():
+    lancamentos = [parcela(n * 10 + i, f"2024-{i:02d}-05", i, 10) for n in (1, 2) for i in (1, 2, 3)]
+
+    series = agrupaSeries(lancamentos)
+    projetados = projetaLancamentos(lancamentos, "2030-12-31")
+
+    assert len(series) == 2
+    assert {s.periodicidade for s in series} == {"monthly"}
+    assert len(projetados) == 14
+    assert projetados[-1].date == "2024-10-05"
+
+
+def test_parcelamento_com_parcela_faltando_deduz_passo_por_parcela():
+    lancamentos = [parcela(1, "2024-01-10", 1, 5), parcela(3, "2024-03-10", 3, 5)]
+
+    series = agrupaSeries(lancamentos)
+
+    assert len(series) == 1 and series[0].periodicidade == "monthly"
+
+
+def test_fixos_com_periodicidades_diferentes_sao_separados():
+    semanal = [fixo(n, f"2024-01-{d:02d}") for n, d in enumerate((1, 8, 15, 22), start=1)]
+    mensal = [fixo(10 + n, f"2024-{m:02d}-20") for n, m in enumerate((1, 2, 3), start=1)]
+
+    series = {s.periodicidade: [l.id for l in s.lancamentos] for s in agrupaSeries(semanal + mensal)}
+
+    assert series == {"weekly": [1, 2, 3, 4], "monthly": [11, 12, 13]}
+
+
+def test_fixo_mensal_tolera_meses_de_tamanhos_diferentes():
+    lancamentos = [fixo(n, d, "Aluguel") for n, d in enumerate(("2024-01-31", "2024-03-02", "2024-03-31"), start=1)]
+
+    series = agrupaSeries(lancamentos)
+
+    assert len(series) == 1 and series[0].periodicidade == "monthly"
+
+
+def test_avulsos_sao_ignorados_e_fluxo_soma_por_mes():
+    lancamentos = [novoLancamento(1, "Padaria", "2024-01-03", -500),
+                   parcela(2, "2024-01-10", 1, 3)]
+
+    assert len(agrupaSeries(lancamentos)) == 1
+
+    fluxo = fluxoCaixaProjetado(lancamentos, "2024-12-31")
+    assert list(fluxo.index) == ["2024-02", "2024-03"]
+    assert fluxo["despesas"].tolist() == [-3000, -3000]
+    assert fluxo["acumulado"].tolist() == [-3000, -6000]
@@ -0,0 +1,60 @@
+from Organizze_Wrapper.Sugestoes import SugestorCategorias
+
+from tests.conftest import novoLancamento
+
+MERCADO, TRANSPORTE, RESTAURANTE = 10, 20, 30
+
+
+def historico():
+    return [novoLancamento(1, "Supermercado São José", category_id=MERCADO, account_id=1),
+            novoLancamento(2, "PAG*SUPERMERCADO SAO JOSE 123", category_id=MERCADO, account_id=1),
+            novoLancamento(3, "Uber trip", category_id=TRANSPORTE, account_id=1),
+            novoLancamento(4, "UBER *TRIP HELP.UBER.COM", category_id=TRANSPORTE, account_id=2),
+            novoLancamento(5, "Uber Eats pedido", category_id=RESTAURANTE, account_id=2),
+            novoLancamento(6, "Uber Eats pedido", category_id=RESTAURANTE, account_id=2)]
+
+
+def test_sugere_pela_descricao_ignorando_acentos_e_caixa():
+    sugestor = SugestorCategorias(historico())
+
+    sugestoes = sugestor.sugere("pag*supermercado sao jose")
+
+    assert sugestoes[0][0] == MERCADO
+    assert sugestoes[0][1] > 0.9
+    assert len(sugestor) == 6
+
+
+def test_confiancas_somam_um_e_respeitam_o_limite():
+    sugestor = SugestorCategorias(historico())
+
+    sugestoes = sugestor.sugere("uber", limite=3)
+
+    assert {c for c, _ in sugestoes} == {TRANSPORTE, RESTAURANTE}
+    assert abs(sum(v for _, v in sugestoes) - 1) < 1e-9
+    assert [v for _, v in sugestoes] == sorted((v for _, v in sugestoes), reverse=True)
+    assert len(sugestor.sugere("uber", limite=1)) == 1
+
+
+def test_conta_favorece_categorias_ja_usadas_nela():
+    sugestor = SugestorCategorias(historico(), pesoConta=5)
+
+    semConta = dict(sugestor.sugere("uber"))
+    naConta1 = dict(sugestor.sugere("uber", conta=1))
+
+    assert naConta1[TRANSPORTE] > semConta[TRANSPORTE]
+
+
+def test_sem_termos_em_comum_nao_sugere():
+    assert SugestorCategorias(historico()).sugere("xyzw") == []
+    assert SugestorCategorias().sugere("mercado") == []
+
+
+def test_adiciona_incrementalmente_e_ignora_sem_categoria():
+    sugestor = SugestorCategorias()
+    sugestor.adiciona(novoLancamento(1, "Farmácia Popular", category_id=None))
+    assert len(sugestor) == 0 and sugestor.sugere("farmacia") == []
+
+    sugestor.adiciona({"description": "Farmácia Popular", "category_id": 40, "credit_card_id": 7})
+
+    assert sugestor.sugere("FARMACIA POPULAR 01")[0][0] == 40
+    assert len(sugestor) == 1
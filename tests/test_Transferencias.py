@@ -0,0 +1,47 @@
+from Organizze_Wrapper.Transferencias import IndiceTransferencias
+
+from tests.conftest import jsonLancamento, novoLancamento
+
+
+def pernas(idSaida, idEntrada, valor=5000):
+    saida = novoLancamento(idSaida, "Transferência", amount_cents=-valor, account_id=1, oposite_transaction_id=idEntrada,
+                           oposite_account_id=2)
+    entrada = novoLancamento(idEntrada, "Transferência", amount_cents=valor, account_id=2, oposite_transaction_id=idSaida,
+                             oposite_account_id=1)
+    return saida, entrada
+
+
+def test_pareia_pernas_em_qualquer_ordem():
+    saida, entrada = pernas(1, 2)
+    avulso = novoLancamento(3, "Mercado")
+
+    indice = IndiceTransferencias([entrada, avulso, saida])
+
+    assert len(indice.pares) == 1
+    assert indice.par(1).saida is saida and indice.par(2).entrada is entrada
+    assert indice.par(1).valor_cents == 5000
+    assert not indice.ehTransferencia(avulso) and indice.orfaos == []
+
+
+def test_exclui_e_colapsa_transferencias():
+    saida, entrada = pernas(1, 2)
+    orfa, _ = pernas(4, 5)
+    avulso = novoLancamento(3, "Mercado")
+    indice = IndiceTransferencias([saida, avulso, entrada, orfa])
+
+    assert indice.excluiTransferencias([saida, avulso, entrada, orfa]) == [avulso]
+    colapsada = indice.colapsaTransferencias([saida, avulso, entrada, orfa])
+    assert colapsada == [indice.par(1), avulso, orfa]
+
+
+def test_busca_so_as_pernas_faltantes(sessao, transporte):
+    saida, _ = pernas(1, 2)
+    transporte.responde("GET", "/transactions/2", jsonLancamento(2, "Transferência", amount_cents=5000, account_id=2,
+                                                                  oposite_transaction_id=1))
+
+    indice = IndiceTransferencias([saida])
+    completadas = indice.buscaPernasFaltantes(sessao)
+
+    assert [(t.saida.id, t.entrada.id) for t in completadas] == [(1, 2)]
+    assert indice.orfaos == []
+    assert [r[1] for r in transporte.requisicoes] == ["/transactions/2"]
@@ -0,0 +1,139 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from requests import HTTPError
+
+import Organizze_Wrapper.API as moduloAPI
+from Organizze_Wrapper.API import API
+from Organizze_Wrapper.Cassetes import GravadorCassete
+from Organizze_Wrapper.Categorias import getCategorias
+from Organizze_Wrapper.Transportes import Transporte, TransporteHTTP2, TransporteMemoria
+
+CORPO = b'[{"id": 1}, {"id": 2}]'
+
+
+class Manipulador(BaseHTTPRequestHandler):
+    """ "/ok" responde o array completo; "/corta" fecha a conexão no meio do corpo; "/trava" para de enviá-lo """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(CORPO)))
+        self.end_headers()
+        if "/corta" in self.path:
+            self.wfile.write(CORPO[:5])
+            self.wfile.flush()
+            self.close_connection = True
+        elif "/trava" in self.path:
+            self.wfile.write(CORPO[:5])
+            self.wfile.flush()
+            time.sleep(1)
+        else:
+            self.wfile.write(CORPO)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor(monkeypatch):
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Manipulador)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{servidor.server_address[1]}/rest/v2"
+    monkeypatch.setattr(moduloAPI, "API_URL", url)
+    yield url
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def test_transporte_incompleto_falha_ao_instanciar():
+    class SoRequisita(Transporte):
+        def requisita(self, metodo, url, params=None, stream=False):
+            pass
+
+    with pytest.raises(TypeError):
+        SoRequisita()
+
+
+def test_memoria_responde_em_ordem_e_repete_a_ultima():
+    transporte = TransporteMemoria()
+    transporte.responde("GET", "/categories?pagina=1", [1])
+    transporte.responde("GET", "/categories", [2])
+    transporte.responde("GET", "/categories", [3])
+    transporte.responde("GET", "/anexo", b"\x00\x01")
+    url = "https://api.organizze.com.br/rest/v2"
+
+    assert transporte.requisita("GET", f"{url}/categories", params={"pagina": 1}).json() == [1]
+    assert [transporte.requisita("GET", f"{url}/categories").json() for _ in range(3)] == [[2], [3], [3]]
+    assert transporte.requisita("GET", f"{url}/categories?outra=1").json() == [3]
+    assert transporte.requisita("GET", f"{url}/anexo").content == b"\x00\x01"
+    assert transporte.requisicoes[0] == ("GET", "/categories?pagina=1", {"pagina": 1})
+    with pytest.raises(requests.exceptions.ConnectionError):
+        transporte.requisita("POST", f"{url}/categories")
+
+
+def test_memoria_de_cassete(tmp_path):
+    caminho = str(tmp_path / "trafego.cassete")
+    gravador = GravadorCassete(caminho)
+    for corpo in (b'[{"id": 1, "name": "Mercado", "color": "fff", "parent_id": null}]', b'[]'):
+        response = requests.Response()
+        response.request = requests.Request("GET", moduloAPI.API_URL + "/categories").prepare()
+        response.status_code, response.reason, response._content = 200, "OK", corpo
+        gravador.registra(response)
+    gravador.fecha()
+
+    transporte = TransporteMemoria.deCassete(caminho)
+    conn = API(email="teste@exemplo.com", token="-", transporte=transporte)
+
+    assert [c.id for c in getCategorias(conn)] == [1]
+    assert getCategorias(conn) == []
+    assert transporte.requisicoes[0][1] == "/categories"
+
+
+def test_http2_sem_configuracao():
+    pytest.importorskip("httpx")
+
+    with pytest.raises(RuntimeError):
+        TransporteHTTP2().requisita("GET", "http://127.0.0.1:1/")
+
+
+def test_http2_reabre_o_cliente_apos_fechar(servidor):
+    pytest.importorskip("httpx")
+    conn = API(email="teste@exemplo.com", token="-", transporte=TransporteHTTP2())
+
+    assert conn._get("/ok") == [{"id": 1}, {"id": 2}]
+    conn.fecha()
+    assert conn._get("/ok") == [{"id": 1}, {"id": 2}]
+    assert list(conn._getStream("/ok")) == [{"id": 1}, {"id": 2}]
+    conn.fecha()
+
+
+def test_http2_conexao_cortada_durante_o_streaming(servidor):
+    pytest.importorskip("httpx")
+    transporte = TransporteHTTP2()
+    transporte.configura("teste@exemplo.com", "-", {})
+
+    resposta = transporte.requisita("GET", f"{servidor}/corta", stream=True)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        b"".join(resposta._blocos(4))
+
+    conn = API(email="teste@exemplo.com", token="-", transporte=transporte)
+    with pytest.raises(HTTPError):
+        list(conn._getStream("/corta"))
+    transporte.fecha()
+
+
+def test_http2_tempo_esgotado_durante_o_streaming(servidor):
+    pytest.importorskip("httpx")
+    conn = API(email="teste@exemplo.com", token="-", transporte=TransporteHTTP2(timeout=0.2))
+
+    with pytest.raises(HTTPError) as erro:
+        list(conn._getStream("/trava"))
+    assert isinstance(erro.value.__context__, requests.exceptions.Timeout)
+    conn.fecha()
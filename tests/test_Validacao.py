@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+from Organizze_Wrapper.Lancamentos import addLancamento, updLancamento
+from Organizze_Wrapper.Validacao import errosPayload, limpaPayload, validaLote, validaPayload
+
+from tests.conftest import novoLancamento
+
+COMPRA = {"description": "Mercado", "date": "2024-01-10", "amount_cents": -1000, "account_id": 1}
+
+
+def test_payload_valido_e_erros_de_tipo():
+    assert errosPayload("lancamento", COMPRA) == []
+    assert errosPayload("lancamento", {**COMPRA, "amount_cents": "100"}) == ["'amount_cents' deve ser int, recebido str"]
+    assert errosPayload("lancamento", {**COMPRA, "amount_cents": True}) == ["'amount_cents' deve ser int, recebido bool"]
+    assert errosPayload("lancamento", {**COMPRA, "date": "10/01/2024"}) == \
+           ["'date' deve estar no formato YYYY-MM-DD, recebido '10/01/2024'"]
+
+
+def test_obrigatorios_conta_e_campos_desconhecidos():
+    erros = errosPayload("lancamento", {"description": "x", "amount_cents": 1, "valor": 2})
+
+    assert set(erros) == {"campo desconhecido 'valor'", "campo obrigatório 'date' ausente",
+                          "informe 'account_id' ou 'credit_card_id'"}
+    assert errosPayload("lancamento_atualizacao", {"description": "x"}) == []
+
+
+def test_subcampos_e_faixas():
+    parcelado = {**COMPRA, "installments_attributes": {"periodicity": "monthly", "total": 1}}
+
+    assert errosPayload("lancamento", parcelado) == ["installments_attributes.'total' deve ser no mínimo 2, recebido 1"]
+    assert errosPayload("cartao_atualizacao", {"due_day": 32}) == ["'due_day' deve ser no máximo 31, recebido 32"]
+    with pytest.raises(ValueError):
+        validaPayload("conta", {"name": "x", "type": "corrente"})
+    with pytest.raises(ValueError):
+        errosPayload("inexistente", {})
+
+
+def test_to_dict_de_um_lancamento_e_aceito_e_os_campos_do_servidor_sao_removidos():
+    registro = novoLancamento(7, oposite_transaction_id=8, attachments_count=2).to_dict()
+
+    assert errosPayload("lancamento_atualizacao", registro) == []
+    assert errosPayload("lancamento", registro) == []
+    assert validaLote("lancamento_atualizacao", pd.DataFrame([registro])) == {}
+
+    limpo = limpaPayload("lancamento_atualizacao", registro)
+    assert set(registro) - set(limpo) == {"id", "total_installments", "installment", "recurring", "attachments_count",
+                                          "oposite_transaction_id", "created_at", "updated_at"}
+
+
+def test_updLancamento_com_o_to_dict_do_lancamento(sessao, transporte):
+    transporte.responde("PUT", "/transactions/7", {})
+    transporte.responde("POST", "/transactions", {})
+    lancamento = novoLancamento(7, description="Mercado Central")
+
+    updLancamento(sessao, 7, lancamento.to_dict())
+    addLancamento(sessao, lancamento.to_dict())
+
+    put, post = [params for _, _, params in transporte.requisicoes if params]
+    assert put["description"] == "Mercado Central"
+    assert "id" not in put and "created_at" not in put and "id" not in post
+
+
+def test_lote_em_lista_igual_ao_validador():
+    itens = [COMPRA, {**COMPRA, "amount_cents": "100"}, {**COMPRA, "account_id": None}]
+
+    assert validaLote("lancamento", itens) == {1: ["'amount_cents' deve ser int, recebido str"],
+                                               2: ["informe 'account_id' ou 'credit_card_id'"]}
+
+
+def test_lote_dataframe_recusa_textos_e_booleanos_como_o_validador():
+    tabela = pd.DataFrame([COMPRA, {**COMPRA, "amount_cents": "100"}, {**COMPRA, "amount_cents": True},
+                           {**COMPRA, "amount_cents": 10.5}, {**COMPRA, "account_id": None, "credit_card_id": 3}])
+
+    invalidos = validaLote("lancamento", tabela)
+
+    assert sorted(invalidos) == [1, 2, 3]
+    for i in (1, 2):
+        assert errosPayload("lancamento", tabela.loc[i].to_dict())
+        assert invalidos[i] == ["'amount_cents' deve ser int"]
+
+
+def test_lote_dataframe_faixas_opcoes_e_datas():
+    tabela = pd.DataFrame([{"name": "Visa", "card_network": "visa", "due_day": 40, "closing_day": 5, "limit_cents": -1},
+                           {"name": "Master", "card_network": "master", "due_day": 10, "closing_day": 5, "limit_cents": 0}])
+    contas = pd.DataFrame([{"name": "a", "type": "corrente"}, {"name": "b", "type": "savings"}])
+    datas = pd.DataFrame([COMPRA, {**COMPRA, "date": "2024-02-30"}])
+
+    assert validaLote("cartao", tabela) == {0: ["'due_day' deve ser no máximo 31", "'limit_cents' deve ser no mínimo 0"]}
+    assert list(validaLote("conta", contas)) == [0]
+    assert validaLote("lancamento", datas) == {1: ["'date' deve estar no formato YYYY-MM-DD"]}
@@ -0,0 +1,64 @@
+import json
+import pickle
+
+import pytest
+
+from Organizze_Wrapper.FaturasCartao import FaturaCartao, FaturaCartaoVisao, getFaturasCartao
+from Organizze_Wrapper.Lancamentos import Lancamento, LancamentoVisao, getLancamentos
+
+from tests.conftest import jsonLancamento
+
+FATURA = {"id": 3, "date": "2024-02-10", "starting_date": "2024-01-04", "closing_date": "2024-02-03",
+          "amount_cents": 12000, "payment_amount_cents": 0, "balance_cents": 12000, "previous_balance_cents": 0,
+          "credit_card_id": 9}
+
+
+def test_visao_le_os_campos_da_resposta_e_equivale_ao_modelo():
+    bruto = jsonLancamento(1, "Mercado")
+    visao, modelo = LancamentoVisao(bruto), Lancamento(**bruto)
+
+    assert (visao.id, visao.description, visao.amount_cents) == (1, "Mercado", -1000)
+    assert visao == modelo and visao == LancamentoVisao(dict(bruto))
+    assert visao != LancamentoVisao(jsonLancamento(2))
+    assert visao.to_dict() == modelo.to_dict()
+    assert json.dumps(visao, default=Lancamento.json) == json.dumps(modelo, default=Lancamento.json)
+    assert not isinstance(visao, Lancamento)
+
+
+def test_campo_ausente_e_AttributeError():
+    bruto = jsonLancamento(1)
+    del bruto["notes"]
+    visao = LancamentoVisao(bruto)
+
+    with pytest.raises(AttributeError):
+        visao.notes
+    assert getattr(visao, "notes", "padrão") == "padrão"
+    assert not hasattr(visao, "notes")
+
+
+def test_visao_e_somente_leitura_e_materializa_uma_vez():
+    visao = LancamentoVisao(jsonLancamento(1))
+
+    with pytest.raises(AttributeError):
+        visao.description = "Outro"
+
+    lancamento = visao.materializa()
+    assert isinstance(lancamento, Lancamento) and lancamento == visao
+    assert visao.materializa() is lancamento
+
+
+def test_visao_sobrevive_ao_pickle():
+    visao = pickle.loads(pickle.dumps(FaturaCartaoVisao(FATURA)))
+
+    assert visao.balance_cents == 12000
+    assert visao.materializa() == FaturaCartao(**FATURA)
+
+
+def test_getters_com_visoes(sessao, transporte):
+    transporte.responde("GET", "/transactions", [jsonLancamento(1), jsonLancamento(2)])
+    transporte.responde("GET", "/credit_cards/9/invoices", [FATURA])
+
+    visoes = getLancamentos(sessao, "2024-01-01", "2024-01-10", visoes=True)
+    assert all(type(v) is LancamentoVisao for v in visoes)
+    assert visoes == getLancamentos(sessao, "2024-01-01", "2024-01-10")
+    assert [type(f) for f in getFaturasCartao(sessao, 9, visoes=True)] == [FaturaCartaoVisao]